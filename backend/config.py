@@ -31,6 +31,8 @@ PUNTUACIONES_MAXIMA_CONFIANZA = 10  # Número de puntuaciones para máxima confi
 MAX_REFRESCOS_RECOMENDADOS = 3  # Máximo número de refrescos a recomendar (reducido de 5 a 3)
 MAX_ALTERNATIVAS_RECOMENDADAS = 3  # Máximo número de alternativas a recomendar inicialmente
 MAX_RECOMENDACIONES_ADICIONALES = 3  # Máximo número de recomendaciones alternativas adicionales
+MAX_BATCHES_POR_PETICION = 10  # Máximo de clicks de "más opciones" que se pueden pedir en una sola petición
+MAX_LLAMADAS_BATCH = 20  # Máximo de llamadas que acepta /api/batch en una sola petición
 
 # ===== CONFIGURACIÓN ESPECÍFICA PARA ALTERNATIVAS SALUDABLES =====
 MAX_ALTERNATIVAS_SALUDABLES_INICIAL = 3  # Alternativas saludables mostradas inicialmente
@@ -10,10 +10,11 @@ Características:
 - Base de datos auto-limpiada en startup
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
@@ -22,6 +23,7 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime
+from urllib.parse import urlsplit
 import json
 import random
 from bson import ObjectId
@@ -65,6 +67,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Comprimir respuestas grandes (recomendaciones, estadísticas) cuando el cliente lo acepta
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 # Servir archivos estáticos
 app.mount("/static", StaticFiles(directory=str(ROOT_DIR / "static")), name="static")
 
@@ -99,6 +104,13 @@ class PuntuacionPresentacion(BaseModel):
     puntuacion: int
     comentario: Optional[str] = ""
 
+class SesionesBatch(BaseModel):
+    session_ids: List[str]
+
+class LlamadaBatch(BaseModel):
+    method: str = "GET"
+    path: str
+
 # Utilidades
 def custom_json_serializer(obj):
     """Serializar ObjectId de MongoDB"""
@@ -211,21 +223,34 @@ async def shutdown_event():
 
 # Endpoints de la API
 @app.post("/api/iniciar-sesion")
-async def iniciar_sesion():
-    """Inicia una nueva sesión de chat"""
+async def iniciar_sesion(include_initial: bool = False):
+    """Inicia una nueva sesión de chat (con include_initial=1 incluye la pregunta inicial)"""
     try:
         sesion = SesionChat()
         
+        respuesta = {
+            "sesion_id": sesion.session_id,
+            "mensaje": "¡Hola! Soy RefrescoBot ML, tu asistente personal para encontrar la bebida perfecta. Te haré algunas preguntas para conocerte mejor."
+        }
+        
+        # Incluir la pregunta fija y marcarla como mostrada desde la creación
+        if include_initial:
+            pregunta_fija = await db.preguntas.find_one({"es_fija": True})
+            if pregunta_fija:
+                sesion.preguntas_mostradas.append(pregunta_fija["id"])
+                respuesta.update({
+                    "pregunta": pregunta_fija,
+                    "numero_pregunta": 1,
+                    "total_preguntas": TOTAL_PREGUNTAS
+                })
+        
         # Insertar en base de datos
         sesion_dict = sesion.dict()
         await db.sesiones_chat.insert_one(sesion_dict)
         
         logger.info(f"Nueva sesión iniciada: {sesion.session_id}")
         
-        return {
-            "sesion_id": sesion.session_id,
-            "mensaje": "¡Hola! Soy RefrescoBot ML, tu asistente personal para encontrar la bebida perfecta. Te haré algunas preguntas para conocerte mejor."
-        }
+        return MongoJSONResponse(content=respuesta)
         
     except Exception as e:
         logger.error(f"Error iniciando sesión: {e}")
@@ -310,6 +335,48 @@ async def obtener_siguiente_pregunta(sesion_id: str):
         logger.error(f"Error obteniendo siguiente pregunta: {e}")
         raise HTTPException(status_code=500, detail="Error obteniendo pregunta")
 
+@app.get("/api/preguntas-restantes/{sesion_id}")
+async def obtener_preguntas_restantes(sesion_id: str, limit: Optional[int] = Query(None, ge=1, le=TOTAL_PREGUNTAS)):
+    """Selecciona de una vez las preguntas aleatorias que faltan en la sesión (con limit=N como mucho N);
+    solo las preguntas devueltas se marcan como mostradas"""
+    try:
+        # Verificar sesión
+        sesion = await db.sesiones_chat.find_one({"session_id": sesion_id})
+        if not sesion:
+            raise HTTPException(status_code=404, detail="Sesión no encontrada")
+        
+        preguntas_mostradas = sesion.get("preguntas_mostradas", [])
+        faltantes = TOTAL_PREGUNTAS - len(preguntas_mostradas)
+        
+        if faltantes <= 0:
+            return {"finalizada": True, "preguntas": [], "mensaje": "Todas las preguntas completadas"}
+        
+        if limit is not None:
+            faltantes = min(faltantes, limit)
+        
+        preguntas_disponibles = await db.preguntas.find({
+            "es_fija": False,
+            "id": {"$nin": preguntas_mostradas}
+        }).to_list(None)
+        
+        # Seleccionar las preguntas restantes y marcarlas como mostradas en una sola actualización
+        preguntas_seleccionadas = random.sample(preguntas_disponibles, min(faltantes, len(preguntas_disponibles)))
+        await db.sesiones_chat.update_one(
+            {"session_id": sesion_id},
+            {"$addToSet": {"preguntas_mostradas": {"$each": [p["id"] for p in preguntas_seleccionadas]}}}
+        )
+        
+        return MongoJSONResponse(content={
+            "preguntas": preguntas_seleccionadas,
+            "total_preguntas": TOTAL_PREGUNTAS
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error obteniendo preguntas restantes: {e}")
+        raise HTTPException(status_code=500, detail="Error obteniendo preguntas")
+
 @app.post("/api/responder/{sesion_id}")
 async def responder_pregunta(sesion_id: str, respuesta: RespuestaUsuario):
     """Registra la respuesta del usuario a una pregunta"""
@@ -372,9 +439,35 @@ async def responder_pregunta(sesion_id: str, respuesta: RespuestaUsuario):
         logger.error(f"Error registrando respuesta: {e}")
         raise HTTPException(status_code=500, detail="Error registrando respuesta")
 
+@app.post("/api/responder-batch/{sesion_id}")
+async def responder_batch(sesion_id: str, respuestas: List[RespuestaUsuario], include: Optional[str] = None):
+    """Registra varias respuestas de la sesión en una sola petición (include=recomendacion añade
+    las recomendaciones si la sesión queda completada)"""
+    if len(respuestas) > TOTAL_PREGUNTAS:
+        raise HTTPException(status_code=422, detail=f"Máximo {TOTAL_PREGUNTAS} respuestas por petición")
+    resultado = {"mensaje": "No se recibieron respuestas", "completada": False}
+    for respuesta in respuestas:
+        resultado = await responder_pregunta(sesion_id, respuesta)
+    if include == "recomendacion" and resultado.get("completada"):
+        resultado["recomendacion"] = await calcular_recomendaciones(sesion_id)
+        return MongoJSONResponse(content=resultado)
+    return resultado
+
+@app.post("/api/responder-y-siguiente/{sesion_id}")
+async def responder_y_siguiente(sesion_id: str, respuesta: RespuestaUsuario):
+    """Registra la respuesta y devuelve la siguiente pregunta en una sola petición"""
+    resultado = await responder_pregunta(sesion_id, respuesta)
+    if resultado.get("completada"):
+        return {"finalizada": True, "mensaje": resultado["mensaje"]}
+    return await obtener_siguiente_pregunta(sesion_id)
+
 @app.get("/api/recomendacion/{sesion_id}")
-async def obtener_recomendaciones(sesion_id: str):
-    """Obtiene recomendaciones ML personalizadas para el usuario"""
+async def obtener_recomendaciones(sesion_id: str, limit: Optional[int] = Query(None, ge=1)):
+    """Obtiene recomendaciones ML personalizadas para el usuario (con limit=N solo devuelve las N primeras de cada lista)"""
+    return MongoJSONResponse(content=await calcular_recomendaciones(sesion_id, limit))
+
+async def calcular_recomendaciones(sesion_id: str, limit: Optional[int] = None) -> Dict:
+    """Calcula las recomendaciones ML personalizadas para el usuario"""
     try:
         # Verificar sesión
         sesion = await db.sesiones_chat.find_one({"session_id": sesion_id})
@@ -475,6 +568,10 @@ async def obtener_recomendaciones(sesion_id: str):
                 top_alternativas = []
                 mensaje_principal = MENSAJE_REFRESCOS_NORMALES
         
+        # limit recorta las listas antes de explicarlas y registrarlas: solo cuenta como mostrado lo que se devuelve
+        top_refrescos = top_refrescos[:limit]
+        top_alternativas = top_alternativas[:limit]
+        
         # Generar explicaciones ML
         for bebida in top_refrescos + top_alternativas:
             bebida["factores_explicativos"] = generar_explicacion_ml(user_responses, bebida)
@@ -517,7 +614,7 @@ async def obtener_recomendaciones(sesion_id: str):
             {"$set": {"recomendaciones_mostradas": ids_recomendadas}}
         )
         
-        return MongoJSONResponse(content={
+        return {
             "refrescos_reales": top_refrescos,
             "bebidas_alternativas": top_alternativas if mostrar_alternativas else [],
             "mostrar_alternativas": mostrar_alternativas,
@@ -539,7 +636,7 @@ async def obtener_recomendaciones(sesion_id: str):
                 "total_bebidas_categorizadas": len([b for b in bebidas if b.get("procesado_ml", False)]),
                 "mensaje_ml": "Sistema ML avanzado activado: categorización automática, análisis de imágenes y recomendaciones por presentación específica"
             }
-        })
+        }
         
     except HTTPException:
         raise
@@ -699,8 +796,33 @@ async def puntuar_presentacion(sesion_id: str, puntuacion: PuntuacionPresentacio
         raise HTTPException(status_code=500, detail="Error registrando puntuación")
 
 @app.get("/api/recomendaciones-alternativas/{sesion_id}")
-async def obtener_mas_recomendaciones(sesion_id: str):
-    """Obtiene recomendaciones adicionales usando ML respetando la categorización saludable vs refrescos"""
+async def obtener_mas_recomendaciones(sesion_id: str, max_batches: int = Query(1, ge=1, le=MAX_BATCHES_POR_PETICION)):
+    """Obtiene recomendaciones adicionales; con max_batches > 1 devuelve en "batches" hasta
+    ese número de clicks consecutivos, deteniéndose cuando se agotan las opciones"""
+    if max_batches == 1:
+        return MongoJSONResponse(content=await calcular_mas_recomendaciones(sesion_id))
+    
+    batches = []
+    for _ in range(max_batches):
+        lote = await calcular_mas_recomendaciones(sesion_id)
+        batches.append(lote)
+        if lote["sin_mas_opciones"]:
+            break
+    return MongoJSONResponse(content={"batches": batches})
+
+@app.post("/api/recomendaciones-alternativas/batch")
+async def obtener_mas_recomendaciones_batch(peticion: SesionesBatch):
+    """Obtiene un click de recomendaciones adicionales para varias sesiones en una sola petición"""
+    resultados = {}
+    for sesion_id in dict.fromkeys(peticion.session_ids):
+        try:
+            resultados[sesion_id] = await calcular_mas_recomendaciones(sesion_id)
+        except HTTPException as e:
+            resultados[sesion_id] = {"error": e.detail, "status_code": e.status_code}
+    return MongoJSONResponse(content=resultados)
+
+async def calcular_mas_recomendaciones(sesion_id: str) -> Dict:
+    """Calcula un click de recomendaciones adicionales usando ML respetando la categorización saludable vs refrescos"""
     try:
         # Verificar sesión
         sesion = await db.sesiones_chat.find_one({"session_id": sesion_id})
@@ -849,7 +971,7 @@ async def obtener_mas_recomendaciones(sesion_id: str):
                 }
             )
         
-        return MongoJSONResponse(content={
+        return {
             "recomendaciones_adicionales": top_adicionales,
             "sin_mas_opciones": len(top_adicionales) == 0,
             "mensaje": mensaje_tipo if top_adicionales else MENSAJE_SIN_ALTERNATIVAS,
@@ -865,7 +987,7 @@ async def obtener_mas_recomendaciones(sesion_id: str):
                 "cluster_usuario": cluster_usuario,
                 "tipo_usuario_detectado": ml_engine.detectar_tipo_usuario(user_responses, tiempo_respuestas)
             }
-        })
+        }
         
     except HTTPException:
         raise
@@ -876,6 +998,10 @@ async def obtener_mas_recomendaciones(sesion_id: str):
 @app.get("/api/mas-refrescos/{sesion_id}")
 async def obtener_mas_refrescos(sesion_id: str):
     """Obtiene más refrescos específicamente"""
+    return MongoJSONResponse(content=await calcular_mas_refrescos(sesion_id))
+
+async def calcular_mas_refrescos(sesion_id: str) -> Dict:
+    """Calcula un lote de más refrescos no mostrados, ordenados por predicción ML"""
     try:
         # Verificar sesión
         sesion = await db.sesiones_chat.find_one({"session_id": sesion_id})
@@ -939,12 +1065,12 @@ async def obtener_mas_refrescos(sesion_id: str):
                 {"$addToSet": {"recomendaciones_mostradas": {"$each": nuevos_ids}}}
             )
         
-        return MongoJSONResponse(content={
+        return {
             "mas_refrescos": top_refrescos,
             "sin_mas_opciones": len(top_refrescos) == 0,
             "mensaje": "Más refrescos tradicionales basados en tus preferencias:" if top_refrescos else "No hay más refrescos disponibles",
             "tipo": "refrescos_tradicionales"
-        })
+        }
         
     except HTTPException:
         raise
@@ -955,6 +1081,10 @@ async def obtener_mas_refrescos(sesion_id: str):
 @app.get("/api/mas-alternativas/{sesion_id}")
 async def obtener_mas_alternativas(sesion_id: str):
     """Obtiene más alternativas saludables específicamente"""
+    return MongoJSONResponse(content=await calcular_mas_alternativas(sesion_id))
+
+async def calcular_mas_alternativas(sesion_id: str) -> Dict:
+    """Calcula un lote de más alternativas saludables no mostradas, ordenadas por predicción ML"""
     try:
         # Verificar sesión
         sesion = await db.sesiones_chat.find_one({"session_id": sesion_id})
@@ -1018,12 +1148,12 @@ async def obtener_mas_alternativas(sesion_id: str):
                 {"$addToSet": {"recomendaciones_mostradas": {"$each": nuevos_ids}}}
             )
         
-        return MongoJSONResponse(content={
+        return {
             "mas_alternativas": top_alternativas,
             "sin_mas_opciones": len(top_alternativas) == 0,
             "mensaje": "Más alternativas saludables perfectas para ti:" if top_alternativas else "No hay más alternativas saludables disponibles",
             "tipo": "alternativas_saludables"
-        })
+        }
         
     except HTTPException:
         raise
@@ -1034,6 +1164,10 @@ async def obtener_mas_alternativas(sesion_id: str):
 @app.get("/api/mejores-presentaciones/{sesion_id}")
 async def obtener_mejores_presentaciones(sesion_id: str, limit: int = 10):
     """Obtiene las mejores presentaciones específicas para el usuario"""
+    return MongoJSONResponse(content=await calcular_mejores_presentaciones(sesion_id, limit))
+
+async def calcular_mejores_presentaciones(sesion_id: str, limit: int = 10) -> Dict:
+    """Calcula las mejores presentaciones específicas para el usuario"""
     try:
         # Verificar sesión
         sesion = await db.sesiones_chat.find_one({"session_id": sesion_id})
@@ -1102,7 +1236,7 @@ async def obtener_mejores_presentaciones(sesion_id: str, limit: int = 10):
             
             presentaciones_enriquecidas.append(presentacion_enriquecida)
         
-        return MongoJSONResponse(content={
+        return {
             "mejores_presentaciones": presentaciones_enriquecidas,
             "total_encontradas": len(mejores_presentaciones),
             "usuario_tipo": "no_consume_refrescos" if usuario_no_consume_refrescos else "regular",
@@ -1111,7 +1245,7 @@ async def obtener_mejores_presentaciones(sesion_id: str, limit: int = 10):
                 "presentation_model_trained": presentation_rating_system.is_trained,
                 "confidence_level": "alta" if presentation_rating_system.is_trained else "media"
             }
-        })
+        }
         
     except HTTPException:
         raise
@@ -1119,6 +1253,17 @@ async def obtener_mejores_presentaciones(sesion_id: str, limit: int = 10):
         logger.error(f"Error obteniendo mejores presentaciones: {e}")
         raise HTTPException(status_code=500, detail="Error obteniendo presentaciones")
 
+@app.post("/api/puntuar-presentacion-y-mejores/{sesion_id}")
+async def puntuar_presentacion_y_mejores(sesion_id: str, puntuacion: PuntuacionPresentacion,
+                                         limit: int = 10, include: Optional[str] = None):
+    """Registra la puntuación de una presentación y devuelve las mejores presentaciones actualizadas
+    en una sola petición (include=analytics añade también el análisis de presentaciones de la sesión)"""
+    resultado = await puntuar_presentacion(sesion_id, puntuacion)
+    resultado["mejores"] = await calcular_mejores_presentaciones(sesion_id, limit)
+    if include == "analytics":
+        resultado["analytics"] = await calcular_analytics_presentaciones(sesion_id)
+    return MongoJSONResponse(content=resultado)
+
 # Funciones auxiliares
 def generar_explicacion_ml(user_responses: Dict, bebida: Dict) -> List[str]:
     """Genera explicaciones basadas en predicciones ML"""
@@ -1552,8 +1697,8 @@ def generar_feedback_puntuacion(puntuacion: int, bebida: Dict, modelo_reentrenad
 
 # Endpoints de administración
 @app.get("/api/admin/stats")
-async def obtener_estadisticas_admin():
-    """Obtiene estadísticas del sistema para administradores"""
+async def obtener_estadisticas_admin(include: Optional[str] = None):
+    """Obtiene estadísticas del sistema para administradores (include=sample_bebida añade un refresco de muestra)"""
     try:
         # Estadísticas de sesiones
         total_sesiones = await db.sesiones_chat.count_documents({})
@@ -1578,7 +1723,7 @@ async def obtener_estadisticas_admin():
         bebidas_con_presentaciones = await db.bebidas.find({}).to_list(None)
         total_presentaciones = sum(len(b.get('presentaciones', [])) for b in bebidas_con_presentaciones)
         
-        return {
+        estadisticas = {
             "sesiones": {
                 "total": total_sesiones,
                 "completadas": sesiones_completadas,
@@ -1604,6 +1749,15 @@ async def obtener_estadisticas_admin():
             }
         }
         
+        # Refresco de muestra tomado de las bebidas ya cargadas, sin consulta adicional
+        if include == "sample_bebida":
+            muestra = next((b for b in bebidas_con_presentaciones if b.get("es_refresco_real")), None)
+            if muestra is not None:
+                muestra = {k: v for k, v in muestra.items() if k != "_id"}
+            estadisticas["sample_bebida"] = muestra
+        
+        return MongoJSONResponse(content=estadisticas)
+        
     except Exception as e:
         logger.error(f"Error obteniendo estadísticas: {e}")
         raise HTTPException(status_code=500, detail="Error obteniendo estadísticas")
@@ -1634,6 +1788,10 @@ async def reprocesar_bebidas_ml():
 @app.get("/api/admin/presentation-analytics/{sesion_id}")
 async def obtener_analytics_presentaciones(sesion_id: str):
     """Obtiene análisis detallado de preferencias de presentación del usuario"""
+    return MongoJSONResponse(content=await calcular_analytics_presentaciones(sesion_id))
+
+async def calcular_analytics_presentaciones(sesion_id: str) -> Dict:
+    """Calcula el análisis de preferencias de presentación del usuario"""
     try:
         # Verificar sesión
         sesion = await db.sesiones_chat.find_one({"session_id": sesion_id})
@@ -1657,14 +1815,14 @@ async def obtener_analytics_presentaciones(sesion_id: str):
             avg_rating = 0
             rating_distribution = {}
         
-        return MongoJSONResponse(content={
+        return {
             "session_id": sesion_id,
             "size_preferences": size_analysis,
             "puntuaciones_dadas": len(puntuaciones),
             "rating_promedio": avg_rating,
             "distribucion_ratings": rating_distribution,
             "puntuaciones_detalle": puntuaciones
-        })
+        }
         
     except HTTPException:
         raise
@@ -1715,4 +1873,38 @@ async def obtener_status():
         return {
             "status": "unhealthy",
             "error": str(e)
-        }
\ No newline at end of file
+        }
+
+# Endpoints de lectura por sesión que /api/batch puede resolver en proceso: "ruta/{sesion_id}" -> calcular_*
+ENDPOINTS_BATCH = {
+    "recomendacion": calcular_recomendaciones,
+    "recomendaciones-alternativas": calcular_mas_recomendaciones,
+    "mas-refrescos": calcular_mas_refrescos,
+    "mas-alternativas": calcular_mas_alternativas,
+    "mejores-presentaciones": calcular_mejores_presentaciones,
+    "admin/presentation-analytics": calcular_analytics_presentaciones,
+}
+
+@app.post("/api/batch")
+async def ejecutar_batch(llamadas: List[LlamadaBatch]):
+    """Ejecuta varias llamadas GET por sesión en una sola petición, en orden, sin sub-peticiones HTTP;
+    devuelve por posición {"status", "body"} de cada una. Las rutas no admiten parámetros de consulta
+    y deben terminar en un id de sesión; si no, esa llamada devuelve 422"""
+    if len(llamadas) > MAX_LLAMADAS_BATCH:
+        raise HTTPException(status_code=422, detail=f"Máximo {MAX_LLAMADAS_BATCH} llamadas por petición")
+    resultados = []
+    for llamada in llamadas:
+        partes = urlsplit(llamada.path)
+        ruta, _, sesion_id = partes.path.lstrip("/").rpartition("/")
+        calcular = ENDPOINTS_BATCH.get(ruta[len("api/"):] if ruta.startswith("api/") else ruta)
+        if llamada.method.upper() != "GET" or calcular is None:
+            resultados.append({"status": 404, "body": {"detail": "Not Found"}})
+            continue
+        if partes.query or partes.fragment or not sesion_id:
+            resultados.append({"status": 422, "body": {"detail": "La ruta debe terminar en un id de sesión y no llevar parámetros de consulta"}})
+            continue
+        try:
+            resultados.append({"status": 200, "body": await calcular(sesion_id)})
+        except HTTPException as e:
+            resultados.append({"status": e.status_code, "body": {"detail": e.detail}})
+    return MongoJSONResponse(content=resultados)
@@ -5,15 +5,42 @@ This script tests the complete re-architecture of RefrescoBot ML with real Machi
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 import json
-import time
+import socket
 import random
 import os
 from dotenv import load_dotenv
 import sys
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, NamedTuple
 import uuid
+import re
 import logging
+import threading
+import functools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli  # noqa: F401 -- lets urllib3 decode "br" bodies
+except ImportError:
+    _HAS_BROTLI = False
+else:
+    _HAS_BROTLI = True
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the stdlib codec (json.loads accepts raw bytes too)
+    _json_loads = json.loads
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+else:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -27,18 +54,593 @@ BACKEND_URL = os.environ.get("REACT_APP_BACKEND_URL", "http://localhost:8001")
 API_URL = f"{BACKEND_URL}/api"
 print(f"Using API URL: {API_URL}")
 
+# Per-session endpoint prefixes, built once; call sites append the session ID
+URL_RECOMENDACION = f"{API_URL}/recomendacion/"
+URL_MAS_RECOMENDACIONES = f"{API_URL}/recomendaciones-alternativas/"
+URL_MAS_ALTERNATIVAS = f"{API_URL}/mas-alternativas/"
+URL_MAS_REFRESCOS = f"{API_URL}/mas-refrescos/"
+URL_PREGUNTA_INICIAL = f"{API_URL}/pregunta-inicial/"
+URL_RESPONDER = f"{API_URL}/responder/"
+URL_SIGUIENTE_PREGUNTA = f"{API_URL}/siguiente-pregunta/"
+URL_RESPONDER_Y_SIGUIENTE = f"{API_URL}/responder-y-siguiente/"
+URL_PREGUNTAS_RESTANTES = f"{API_URL}/preguntas-restantes/"
+URL_RESPONDER_BATCH = f"{API_URL}/responder-batch/"
+URL_PUNTUAR = f"{API_URL}/puntuar/"
+URL_PUNTUAR_PRESENTACION = f"{API_URL}/puntuar-presentacion/"
+URL_PUNTUAR_Y_MEJORES = f"{API_URL}/puntuar-presentacion-y-mejores/"
+URL_PRESENTATION_ANALYTICS = f"{API_URL}/admin/presentation-analytics/"
+URL_MEJORES_PRESENTACIONES = f"{API_URL}/mejores-presentaciones/"
+
+# (connect, read) timeout for every request without its own; the read budget leaves room for ML endpoints
+HTTP_TIMEOUT = (1.0, 10.0)
+# Cheap probes that need no session give up quickly so an unreachable backend fails the test at once
+PROBE_TIMEOUT = 2.0
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets keep urllib3's TCP_NODELAY and also enable SO_KEEPALIVE, and whose
+    requests default to HTTP_TIMEOUT so a hung backend cannot block a call indefinitely"""
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        ]
+        super().init_poolmanager(*args, **kwargs)
+    
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=HTTP_TIMEOUT if timeout is None else timeout, **kwargs)
+
+class CassetteAdapter(KeepAliveAdapter):
+    """KeepAliveAdapter that replays exchanges recorded in a JSON cassette file and records the misses.
+    Each request key holds its responses in recording order and replays them in that order, so repeated
+    non-idempotent calls (e.g. POST /iniciar-sesion) get distinct responses instead of the first one"""
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._replayed = {}  # key -> how many of its recorded responses this run has consumed
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.exchanges = json.load(f)
+        except FileNotFoundError:
+            self.exchanges = {}
+    
+    @staticmethod
+    def _key(request):
+        body = request.body or b""
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", "replace")
+        return f"{request.method} {request.url} {body}"
+    
+    def send(self, request, **kwargs):
+        key = self._key(request)
+        with self._lock:
+            recorded = self.exchanges.get(key, [])
+            index = self._replayed.get(key, 0)
+            self._replayed[key] = index + 1
+            recorded = recorded[index] if index < len(recorded) else None
+        if recorded is None:
+            response = super().send(request, **kwargs)
+            with self._lock:
+                # The body is stored decoded, so only the content type is worth keeping
+                self.exchanges.setdefault(key, []).append({"status": response.status_code,
+                                                           "content_type": response.headers.get("Content-Type", ""),
+                                                           "body": response.text})
+                self._dirty = True
+            return response
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.headers = CaseInsensitiveDict({"Content-Type": recorded["content_type"]})
+        response._content = recorded["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+    
+    def save(self):
+        """Write the cassette back if this run recorded anything new"""
+        with self._lock:
+            if self._dirty:
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(self.exchanges, f, ensure_ascii=False)
+                self._dirty = False
+
+# Record/replay HTTP exchanges (e.g. HTTP_CASSETTE=cassette.json): requests already in the file are
+# answered from it without touching the network, new ones go to the backend and are added to it
+HTTP_CASSETTE = os.environ.get("HTTP_CASSETTE")
+
+# Stop multi-scenario tests at the first failing scenario (e.g. FAIL_FAST=1 in CI)
+FAIL_FAST = os.environ.get("FAIL_FAST", "") not in ("", "0")
+
+# Drop the ✅ success lines of tests that log through self._log, keeping failures and warnings (e.g. QUIET=1 in CI)
+QUIET = os.environ.get("QUIET", "") not in ("", "0")
+
+# Which runner __main__ uses: "all" (default), "parallel" (beverage structure, sabor and ML variety
+# tests run concurrently, then the database cleaning test) or "ml" (ML component tests), e.g. TEST_SUITE=ml
+TEST_SUITE = os.environ.get("TEST_SUITE", "all")
+
+# Seed the answer/response-time randomness to replay a run's choices (e.g. TEST_SEED=42)
+if os.environ.get("TEST_SEED"):
+    random.seed(int(os.environ["TEST_SEED"]))
+
+def buffered_output(test_method):
+    """Collect a test's self._log lines and write them to stdout in a single call"""
+    @functools.wraps(test_method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(self._local, "log_buffer", None) is not None:  # already inside a buffered test
+            return test_method(self, *args, **kwargs)
+        self._local.log_buffer = []
+        try:
+            return test_method(self, *args, **kwargs)
+        finally:
+            lines, self._local.log_buffer = self._local.log_buffer, None
+            if lines:
+                sys.stdout.write("\n".join(lines) + "\n")
+    return wrapper
+
+# Fields every bebida payload and every "more options" response must carry
+REQUIRED_BEBIDA_FIELDS = frozenset({"id", "nombre", "descripcion", "categoria", "es_refresco_real",
+                                    "nivel_dulzura", "presentaciones"})
+BEBIDA_ML_FIELDS = frozenset({"categorias_ml", "tags_automaticos"})
+REQUIRED_MAS_FIELDS = frozenset({"recomendaciones_adicionales", "sin_mas_opciones", "tipo_recomendaciones"})
+
+def _has_click_tracking(response_data):
+    """Check a 'more options' response for fields that expose the click counter"""
+    return "recomendaciones_adicionales_obtenidas" in response_data or any("click" in key.lower() for key in response_data)
+
+def _variety_counts(sets):
+    """Return (unique IDs, IDs common to every set) counted in a single pass over the sets"""
+    counts = Counter()
+    for ids in sets:
+        counts.update(ids)
+    return len(counts), sum(1 for n in counts.values() if n == len(sets))
+
+class BebidaIndex(NamedTuple):
+    """Columns of the /admin/bebidas payload that the beverage tests assert on"""
+    total: int
+    refrescos_reales: int
+    alternativas: int
+    missing_flag: List[str]  # names of bebidas without es_refresco_real
+    presentation_ids: List[Any]
+    presentaciones: List[tuple]  # (bebida position, bebida nombre, presentation position, presentacion)
+
+def _index_bebidas(bebidas):
+    """Build a BebidaIndex in a single pass over the bebidas list"""
+    refrescos_reales = alternativas = 0
+    missing_flag, presentation_ids, presentaciones = [], [], []
+    for position, bebida in enumerate(bebidas):
+        nombre = bebida.get("nombre", "Unknown")
+        es_refresco_real = bebida.get("es_refresco_real")
+        if es_refresco_real is None:
+            missing_flag.append(nombre)
+        elif es_refresco_real:
+            refrescos_reales += 1
+        else:
+            alternativas += 1
+        for i, presentacion in enumerate(bebida.get("presentaciones", ())):
+            presentaciones.append((position, nombre, i, presentacion))
+            presentation_id = presentacion.get("presentation_id")
+            if presentation_id:
+                presentation_ids.append(presentation_id)
+    return BebidaIndex(len(bebidas), refrescos_reales, alternativas, missing_flag, presentation_ids, presentaciones)
+
+def _iter_sabor_errors(presentaciones):
+    """Yield (problem, bebida nombre, presentation position) for each indexed presentation
+    whose sabor is missing or empty"""
+    for _, nombre, i, presentacion in presentaciones:
+        if "sabor" not in presentacion:
+            yield "missing", nombre, i
+        elif not presentacion["sabor"] or not presentacion["sabor"].strip():
+            yield "empty", nombre, i
+
+def _route_missing(response):
+    """True when the backend lacks the endpoint (FastAPI's generic 404), not when a handler raised 404"""
+    return response.status_code == 404 and _json_loads(response.content).get("detail") == "Not Found"
+
+def _pick_option(opciones, patterns, default_index=0):
+    """Return the first option whose valor or texto contains a pattern (patterns in priority
+    order), falling back to opciones[default_index]"""
+    lowered = [((option.get("valor") or "").lower(), (option.get("texto") or "").lower()) for option in opciones]
+    for pattern in patterns:
+        for option, (valor, texto) in zip(opciones, lowered):
+            if pattern in valor or pattern in texto:
+                return option
+    return opciones[default_index]
+
+# Persona session profiles: (description, initial question patterns, one answer pattern per
+# following question, default option index, initial answer time range, answer time range)
+_PERSONAS = {
+    "traditional": ("traditional user", ("regular", "frecuente"),
+                    ("sedentario", "poco_importante", "dulce", "relajado", "tradicional"),
+                    0, (2.0, 5.0), (1.0, 6.0)),
+    # Default to the last option, which is often the healthiest
+    "health_conscious": ("health-conscious user", ("ocasional", "regular"),
+                         ("activo", "muy_importante", "natural", "energético", "saludable"),
+                         -1, (3.0, 8.0), (2.0, 10.0)),
+}
+
+# User-type session profiles: (description, initial question patterns, fallback option index
+# for a given number of options, initial answer time, answer chooser method, answer time range)
+_USER_TYPE_SESSIONS = {
+    # "casi nunca" contains "nunca"
+    "no_sodas": ("no-sodas user", ("nunca",), lambda count: 0, 3.0, "choose_healthy_option", (2.0, 8.0)),
+    # Quick responses; the middle option when no answer reads as frequent consumption
+    "traditional": ("traditional user", ("diario", "frecuente", "varias veces", "siempre"),
+                    lambda count: count // 2, 2.0, "choose_traditional_option", (1.0, 4.0)),
+    # Thoughtful responses; the second option (or the only one) when no answer reads as moderate
+    "healthy": ("healthy user", ("ocasional", "poco", "rara vez", "moderado"),
+                lambda count: min(1, count - 1), 5.0, "choose_healthy_option", (4.0, 10.0)),
+}
+
+# User categorization scenarios: initial recommendation checks return an error
+# message (or None), "more options" checks return (verdict, message) where the
+# verdict is True (correct), None (acceptable/unexpected) or False (failure)
+def _initial_no_consume(log, recommendations, refrescos_count, alternativas_count):
+    if refrescos_count != 0:
+        return f"User who doesn't consume sodas got {refrescos_count} sodas"
+    if alternativas_count == 0:
+        return "User who doesn't consume sodas got no alternatives"
+    if not recommendations.get("usuario_no_consume_refrescos", False):
+        return "System failed to identify user as non-soda consumer"
+    return None
+
+def _initial_prefiere_alternativas(log, recommendations, refrescos_count, alternativas_count):
+    if alternativas_count == 0:
+        return "User who prefers alternatives got no alternatives initially"
+    return None
+
+def _initial_tradicional(log, recommendations, refrescos_count, alternativas_count):
+    if refrescos_count == 0:
+        return "Traditional user got no sodas"
+    if alternativas_count > 0:
+        log(f"⚠️ UNEXPECTED: Traditional user got {alternativas_count} alternatives initially")
+        # This might be acceptable if it's the new "both types separately" behavior
+        if not recommendations.get("mostrar_alternativas", False):
+            return "Traditional user shouldn't get alternatives without mostrar_alternativas=true"
+        log("✅ ACCEPTABLE: This is the 'both types separately' behavior")
+    return None
+
+def _initial_saludable(log, recommendations, refrescos_count, alternativas_count):
+    if refrescos_count == 0:
+        return "Health-conscious user got no sodas"
+    if alternativas_count == 0:
+        return "Health-conscious user got no alternatives"
+    get = recommendations.get
+    if not get("mostrar_alternativas", False):
+        return "System failed to identify user should see alternatives"
+    
+    mensaje_refrescos = get("mensaje_refrescos", "")
+    mensaje_alternativas = get("mensaje_alternativas", "")
+    if not (mensaje_refrescos and mensaje_alternativas):
+        log("⚠️ WARNING: Missing separation messages")
+    
+    mensaje = mensaje_refrescos.lower()
+    if not ("ambos" in mensaje or "refrescos" in mensaje and "alternativas" in mensaje):
+        log(f"⚠️ WARNING: Main message might not clearly indicate both types: {mensaje_refrescos}")
+    return None
+
+# Words expected in coherent presentation "sabor" values
+_SABOR_WORDS = frozenset({"dulce", "cítrico", "frutal", "natural", "refrescante", "cola", "limón",
+                          "naranja", "manzana", "tropical", "energético", "suave", "intenso"})
+_WORD_RE = re.compile(r"\w+")
+
+# Fields every ML-scored recommendation must carry
+_REQUIRED_ML_FIELDS = frozenset(("prediccion_ml", "probabilidad", "factores_explicativos"))
+
+# Tokens that identify the kind of a "tipo_recomendaciones" value
+_TIPO_RE = re.compile(r"refrescos|tradicionales|opcionales|alternativas")
+
+# Keywords (matched anywhere in the lowercased option text) that pick health-conscious and
+# traditional answers; each list is compiled into a single alternation
+_HEALTHY_OPTION_RE = re.compile("|".join(map(re.escape, (
+    "natural", "saludable", "agua", "sin azúcar", "activo", "muy_activo", "ejercicio",
+    "importante", "muy_importante", "salud"))))
+_TRADITIONAL_OPTION_RE = re.compile("|".join(map(re.escape, (
+    "normal", "regular", "clásico", "tradicional", "dulce", "frecuente", "siempre"))))
+
+def _tipo_kinds(tipo):
+    """Return the set of recommendation kinds mentioned in a tipo_recomendaciones string"""
+    return frozenset(_TIPO_RE.findall(tipo))
+
+def _more_only_alternativas(tipo, kinds):
+    if "alternativas" in kinds:
+        return True, "More options gives more alternatives, not sodas"
+    return False, f"More options gave {tipo} instead of alternatives"
+
+def _more_sodas_first(tipo, kinds):
+    if "refrescos" in kinds or "opcionales" in kinds:
+        return True, "First click shows sodas as optional choice"
+    if "alternativas" in kinds:
+        return None, "ACCEPTABLE: First click shows more alternatives"
+    return None, f"UNEXPECTED: First click shows {tipo}"
+
+def _more_alternativas_second(tipo, kinds):
+    if "alternativas" in kinds:
+        return True, "Second click shows more alternatives"
+    return None, f"UNEXPECTED: Second click shows {tipo}"
+
+def _more_tradicional(tipo, kinds):
+    if "refrescos" in kinds or "tradicionales" in kinds:
+        return True, "More options gives more sodas for traditional user"
+    return None, f"UNEXPECTED: More options gave {tipo} instead of more sodas"
+
+def _more_saludable(tipo, kinds):
+    if "alternativas" in kinds:
+        return True, "More options gives more alternatives for health-conscious user"
+    if "refrescos" in kinds:
+        return None, "ACCEPTABLE: More options gives more sodas (also valid)"
+    return None, f"UNEXPECTED: More options gave {tipo}"
+
+# (test name, expected behavior, session builder, initial check, checks per "more options" click)
+_USER_SCENARIOS = (
+    ("Usuario No Consume Refrescos", "Only healthy alternatives, no sodas",
+     lambda tester: tester.create_user_session_with_specific_answer("no_consume_refrescos", fresh=True),
+     _initial_no_consume, (_more_only_alternativas,)),
+    ("Usuario Prefiere Alternativas", "Alternatives initially, sodas available in 'more options'",
+     lambda tester: tester.create_user_session_with_specific_answer("prefiere_alternativas", fresh=True),
+     _initial_prefiere_alternativas, (_more_sodas_first, _more_alternativas_second)),
+    ("Usuario Regular Tradicional", "Only sodas, no alternatives initially",
+     lambda tester: tester.create_traditional_user_session(),
+     _initial_tradicional, (_more_tradicional,)),
+    ("Usuario Regular Saludable", "Both sodas and alternatives shown separately with clear messages",
+     lambda tester: tester.create_health_conscious_user_session(),
+     _initial_saludable, (_more_saludable,)),
+)
+
 class RefrescoBotTester:
     def __init__(self):
         self.session_id = None
         self.current_question = None
         self.question_count = 0
         self.recommendations = {}  # Changed to dict to store both refrescos_reales and bebidas_alternativas
-        self.all_tests_passed = True
         self.test_results = {}
         self.bebida_to_rate = None
         self.rated_bebida_id = None
         self.rated_bebida_probability = None
         
+        # Shared HTTP session: keep-alive connections are pooled across all requests
+        self.http = requests.Session()
+        # Transient gateway errors are retried with exponential backoff at the adapter level
+        adapter_kwargs = dict(pool_connections=32, pool_maxsize=64,
+                              max_retries=Retry(total=3, backoff_factor=0.3,
+                                                status_forcelist=(502, 503, 504)))
+        adapter = CassetteAdapter(HTTP_CASSETTE, **adapter_kwargs) if HTTP_CASSETTE else KeepAliveAdapter(**adapter_kwargs)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        self.http.headers.update({"User-Agent": "backend-test", "Content-Type": "application/json"})
+        if _HAS_BROTLI:
+            self.http.headers["Accept-Encoding"] = "br, gzip, deflate"
+        self._response_cache = {}  # path -> parsed JSON of catalogue endpoints, which do not change during a run
+        self._bebida_index = None  # BebidaIndex of /admin/bebidas, built on first use
+        self._session_cache = {}  # answer_value -> session_id for read-only tests
+        self._shared_sessions = {}  # session builder name -> answered session_id reused across tests
+        self._recommendations = {}  # session_id -> memoized /recomendacion JSON, dropped when the session rates
+        self._shared_reco = None  # (session_id, /recomendacion JSON) shared by read-only ML introspection tests
+        self._local = threading.local()  # per-thread log_buffer of pending output lines while a buffered test runs
+        self._results_lock = threading.Lock()  # guards test_results for parallel tests
+        self._persona_choices = {}  # (persona, question id, answer slot) -> option picked by _pick_option
+        self._has_fused_endpoint = None  # whether /responder-y-siguiente exists, detected on first answer
+        self._has_rate_and_fetch = None  # whether /puntuar-presentacion-y-mejores exists, detected on first rating
+        self._has_batch_endpoints = None  # whether /preguntas-restantes + /responder-batch exist
+        
+    def _log(self, message):
+        """Print a line, or buffer it if the running test is decorated with @buffered_output;
+        success lines are skipped when QUIET is set"""
+        if QUIET and message.lstrip().startswith("✅"):
+            return
+        log_buffer = getattr(self._local, "log_buffer", None)
+        if log_buffer is None:
+            print(message)
+        else:
+            log_buffer.append(message)
+        
+    def _in_log_buffer(self, work):
+        """Wrap work submitted to a thread pool so its self._log lines go to the calling test's
+        @buffered_output buffer (the buffer is thread-local, so workers would otherwise print directly)"""
+        log_buffer = getattr(self._local, "log_buffer", None)
+        @functools.wraps(work)
+        def wrapper(*args, **kwargs):
+            previous, self._local.log_buffer = getattr(self._local, "log_buffer", None), log_buffer
+            try:
+                return work(*args, **kwargs)
+            finally:
+                self._local.log_buffer = previous
+        return wrapper
+        
+    def _record_result(self, name, passed):
+        """Store a test result; safe to call from tests running in parallel"""
+        with self._results_lock:
+            self.test_results[name] = passed
+        
+    @property
+    def all_tests_passed(self):
+        """Whether every recorded test passed; derived from test_results so the two cannot disagree"""
+        return all(self.test_results.values())
+        
+    def _fail(self, name, message):
+        """Report a failed check of the named test and mark the run as failed"""
+        self._log(f"❌ {name}: FAILED - {message}")
+        self._record_result(name, False)
+        
+    def _get_json(self, url):
+        """GET a URL and return its parsed JSON body, raising on HTTP errors"""
+        response = self.http.get(url, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return _json_loads(response.content)
+        
+    def _post_json(self, url, payload=None):
+        """POST a pre-serialized JSON payload and return the parsed JSON body, raising on HTTP errors"""
+        response = self.http.post(url, data=None if payload is None else _json_dumps(payload),
+                                  timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return _json_loads(response.content)
+        
+    def _answer_and_next(self, session_id, payload):
+        """Answer the current question and return the next one, in a single round-trip when the backend supports it"""
+        if self._has_fused_endpoint is not False:
+            response = self.http.post(URL_RESPONDER_Y_SIGUIENTE + session_id,
+                                      data=_json_dumps(payload), timeout=HTTP_TIMEOUT)
+            if not _route_missing(response):
+                self._has_fused_endpoint = True
+                response.raise_for_status()
+                return _json_loads(response.content)
+            self._has_fused_endpoint = False
+        self._post_json(URL_RESPONDER + session_id, payload)
+        return self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
+        
+    def _rate_and_fetch(self, session_id, rating):
+        """Rate a presentation and return (rating result, mejores-presentaciones, presentation analytics);
+        a single round-trip when the backend supports it, otherwise the rating and then both reads in parallel"""
+        if self._has_rate_and_fetch is not False:
+            response = self.http.post(URL_PUNTUAR_Y_MEJORES + session_id + "?include=analytics",
+                                      data=_json_dumps(rating), timeout=HTTP_TIMEOUT)
+            if not _route_missing(response):
+                self._has_rate_and_fetch = True
+                response.raise_for_status()
+                result = _json_loads(response.content)
+                return result, result.pop("mejores"), result.pop("analytics")
+            self._has_rate_and_fetch = False
+        result = self._post_json(URL_PUNTUAR_PRESENTACION + session_id, rating)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            mejores, analytics = executor.map(self._get_json, (URL_MEJORES_PRESENTACIONES + session_id,
+                                                               URL_PRESENTATION_ANALYTICS + session_id))
+        return result, mejores, analytics
+        
+    def _answer_remaining(self, session_id, choose_option, tiempo_range, max_questions=5, first_answer=None,
+                          include_recommendation=False):
+        """Answer up to max_questions remaining questions with choose_option(opciones) and return how
+        many were answered; uses two batched requests when the backend supports them. first_answer,
+        an answer to an already shown question that has not been sent yet, goes out ahead of them
+        (inside the same batch when possible). With include_recommendation, a batch that completes the
+        session also brings back its recommendation, which is memoized for _get_recommendation"""
+        if self._has_batch_endpoints is not False and max_questions > 0:
+            # The server marks as shown only the questions it returns, so let it apply the cap
+            # (the slice below only matters for backends that predate the limit parameter)
+            response = self.http.get(f"{URL_PREGUNTAS_RESTANTES}{session_id}?limit={max_questions}", timeout=HTTP_TIMEOUT)
+            if not _route_missing(response):
+                self._has_batch_endpoints = True
+                response.raise_for_status()
+                answers = [first_answer] if first_answer else []
+                for question in _json_loads(response.content).get("preguntas", [])[:max_questions]:
+                    option = choose_option(question["opciones"])
+                    answers.append({
+                        "pregunta_id": question["id"],
+                        "respuesta_id": option["id"],
+                        "respuesta_texto": option["texto"],
+                        "tiempo_respuesta": random.uniform(*tiempo_range)
+                    })
+                if answers:
+                    url = URL_RESPONDER_BATCH + session_id
+                    result = self._post_json(url + "?include=recomendacion" if include_recommendation else url, answers)
+                    if "recomendacion" in result:
+                        self._recommendations[session_id] = result["recomendacion"]
+                return len(answers) - (1 if first_answer else 0)
+            self._has_batch_endpoints = False
+        
+        if first_answer:
+            self._post_json(URL_RESPONDER + session_id, first_answer)
+        answered = 0
+        for _ in range(max_questions):
+            data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
+            if data.get("finalizada") or "pregunta" not in data:
+                break
+            question = data["pregunta"]
+            option = choose_option(question["opciones"])
+            self._post_json(URL_RESPONDER + session_id, {
+                "pregunta_id": question["id"],
+                "respuesta_id": option["id"],
+                "respuesta_texto": option["texto"],
+                "tiempo_respuesta": random.uniform(*tiempo_range)
+            })
+            answered += 1
+        return answered
+        
+    def _more_options_batch(self, session_ids):
+        """One "more options" click for each session, in order; a single POST when the backend
+        has the batch endpoint, otherwise concurrent GETs (the sessions must be distinct)"""
+        response = self.http.post(f"{API_URL}/recomendaciones-alternativas/batch",
+                                  data=_json_dumps({"session_ids": session_ids}), timeout=HTTP_TIMEOUT)
+        if not _route_missing(response) and response.status_code != 405:
+            response.raise_for_status()
+            by_session = _json_loads(response.content)
+            return [by_session[session_id] for session_id in session_ids]
+        with ThreadPoolExecutor(max_workers=len(session_ids)) as executor:
+            return list(executor.map(self._get_json, [URL_MAS_RECOMENDACIONES + session_id for session_id in session_ids]))
+        
+    def _batch(self, paths):
+        """GET several per-session API paths (relative to API_URL) and return their (status code, JSON body)
+        in order; one POST to /batch when the backend has it, otherwise concurrent GETs"""
+        response = self.http.post(f"{API_URL}/batch",
+                                  data=_json_dumps([{"method": "GET", "path": path} for path in paths]),
+                                  timeout=HTTP_TIMEOUT)
+        if not _route_missing(response) and response.status_code != 405:
+            response.raise_for_status()
+            return [(result["status"], result["body"]) for result in _json_loads(response.content)]
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            responses = list(executor.map(self.http.get, [f"{API_URL}/{path}" for path in paths]))
+        return [(response.status_code, _json_loads(response.content) if response.ok else None) for response in responses]
+        
+    def _more_batches(self, session_id, max_batches):
+        """Click "more options" up to max_batches times and return each response, stopping once
+        options run out; one request when the backend supports ?max_batches"""
+        url_more = URL_MAS_RECOMENDACIONES + session_id
+        data = self._get_json(f"{url_more}?max_batches={max_batches}")
+        if "batches" in data:
+            return data["batches"]
+        # Older backends ignore the parameter and answer a single click
+        batches = [data]
+        while len(batches) < max_batches and not batches[-1].get("sin_mas_opciones", False):
+            batches.append(self._get_json(url_more))
+        return batches
+        
+    def _start_session(self):
+        """Create a session and return (session_id, initial question), skipping the /pregunta-inicial GET when the backend embeds it"""
+        session_data = self._post_json(f"{API_URL}/iniciar-sesion?include_initial=1")
+        session_id = session_data["sesion_id"]
+        question = session_data.get("pregunta")
+        if question is None:
+            question = self._get_json(URL_PREGUNTA_INICIAL + session_id)["pregunta"]
+        return session_id, question
+        
+    def _persona_choice(self, persona, question, slot, patterns, default_index=0):
+        """Pick a persona's option for a question, memoized so repeated sessions skip the pattern scan"""
+        key = (persona, question["id"], slot)
+        option = self._persona_choices.get(key)
+        if option is None:
+            option = self._persona_choices[key] = _pick_option(question["opciones"], patterns, default_index)
+        return option
+        
+    def _get_cached(self, path):
+        """GET an API path once per run; only for immutable catalogue data such as /admin/bebidas,
+        never for state the tests change (stats, sessions)"""
+        data = self._response_cache.get(path)
+        if data is None:
+            data = self._response_cache[path] = self._get_json(f"{API_URL}{path}")
+        return data
+        
+    def bebida_index(self):
+        """Return the BebidaIndex of /admin/bebidas, built once per run"""
+        if self._bebida_index is None:
+            self._bebida_index = _index_bebidas(self._get_cached("/admin/bebidas"))
+        return self._bebida_index
+        
+    def warm_up(self):
+        """Open a pooled keep-alive connection to the API before the first test needs it"""
+        try:
+            self.http.get(f"{API_URL}/status", timeout=HTTP_TIMEOUT)
+        except requests.RequestException:
+            pass  # the first test reports connectivity problems itself
+        
+    def shared_session(self, create_session=None):
+        """Return an answered session built once per run by create_session (default: random answers)"""
+        create_session = create_session or self.create_session_and_answer_questions
+        session_id = self._shared_sessions.get(create_session.__name__)
+        if session_id is None:
+            session_id = create_session()
+            if session_id:
+                self._shared_sessions[create_session.__name__] = session_id
+        return session_id
+        
     def run_all_tests(self):
         """Run all tests in sequence - FINAL VERIFICATION OF 18 QUESTION SYSTEM"""
         print("\n" + "="*80)
@@ -46,6 +648,8 @@ class RefrescoBotTester:
         print("🎯 TESTING CORRECCIONES APLICADAS Y CASOS CRÍTICOS")
         print("="*80)
         
+        self.warm_up()
+        
         # CRITICAL TESTS FOR FINAL VERIFICATION
         # Test 1: System Status and Initialization
         self.test_system_status()
@@ -71,11 +675,52 @@ class RefrescoBotTester:
         # Test 8: Modal Functionality When Options Exhausted
         self.test_modal_when_options_exhausted()
         
+        # Test 9: Batch endpoint path validation
+        self.test_batch_path_validation()
+        
         # Print summary
         self.print_summary()
         
         return self.all_tests_passed
     
+    def run_parallel_tests(self):
+        """Run the beverage structure, sabor and ML variety tests concurrently over the shared pool"""
+        self.warm_up()
+        
+        # Build the shared /admin/bebidas index once instead of racing to build it in each thread
+        try:
+            self.bebida_index()
+        except requests.RequestException:
+            pass  # each test reports the failure itself
+        
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(test) for test in (self.test_new_beverage_structure,
+                                                           self.test_sabor_field_in_presentations,
+                                                           self.test_improved_ml_logic_variety)]
+            for future in futures:
+                future.result()
+        
+        # Reprocessing rewrites the bebidas the tests above read, so it runs on its own afterwards
+        self.test_selective_database_cleaning()
+        
+        self.print_summary()
+        
+        return self.all_tests_passed
+    
+    def run_ml_component_tests(self):
+        """Run the ML component tests, which all check the run's shared answered session"""
+        self.warm_up()
+        
+        for test in (self.test_beverage_categorizer,
+                     self.test_image_analyzer,
+                     self.test_presentation_rating_system,
+                     self.test_new_ml_endpoints):
+            test()
+        
+        self.print_summary()
+        
+        return self.all_tests_passed
+    
     def test_18_questions_loading(self):
         """Test that all 18 questions are loaded correctly in the system"""
         print("\n🔍 Testing 18 Questions Loading...")
@@ -83,9 +728,7 @@ class RefrescoBotTester:
         
         try:
             # Test admin stats to get question count
-            response = requests.get(f"{API_URL}/admin/stats")
-            response.raise_for_status()
-            stats_data = response.json()
+            stats_data = self._get_json(f"{API_URL}/admin/stats")
             
             preguntas_stats = stats_data.get("preguntas", {})
             total_preguntas = preguntas_stats.get("total", 0)
@@ -94,27 +737,22 @@ class RefrescoBotTester:
             
             if total_preguntas != 18:
                 print(f"❌ FAILED: Expected 18 questions, found {total_preguntas}")
-                self.test_results["18 Questions Loading"] = False
-                self.all_tests_passed = False
+                self._record_result("18 Questions Loading", False)
                 return
             
             # Test that we can get the initial question (P1)
             session_id = self.create_test_session()
             if not session_id:
                 print("❌ FAILED: Could not create session")
-                self.test_results["18 Questions Loading"] = False
-                self.all_tests_passed = False
+                self._record_result("18 Questions Loading", False)
                 return
             
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            initial_question = response.json()
+            initial_question = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             pregunta = initial_question.get("pregunta", {})
             if pregunta.get("id") != 1:
                 print(f"❌ FAILED: Initial question should be ID 1, got {pregunta.get('id')}")
-                self.test_results["18 Questions Loading"] = False
-                self.all_tests_passed = False
+                self._record_result("18 Questions Loading", False)
                 return
             
             print(f"✅ Initial question (P1): {pregunta.get('pregunta', '')[:50]}...")
@@ -123,8 +761,7 @@ class RefrescoBotTester:
             opciones = pregunta.get("opciones", [])
             if len(opciones) != 5:
                 print(f"❌ FAILED: P1 should have 5 options, found {len(opciones)}")
-                self.test_results["18 Questions Loading"] = False
-                self.all_tests_passed = False
+                self._record_result("18 Questions Loading", False)
                 return
             
             # Check for specific values that indicate expanded system
@@ -135,8 +772,7 @@ class RefrescoBotTester:
             for valor in valores_esperados:
                 if valor not in valores_encontrados:
                     print(f"❌ FAILED: Missing expected value '{valor}' in P1 options")
-                    self.test_results["18 Questions Loading"] = False
-                    self.all_tests_passed = False
+                    self._record_result("18 Questions Loading", False)
                     return
             
             print("✅ P1 has correct structure for expanded system")
@@ -149,18 +785,15 @@ class RefrescoBotTester:
                 # Answer current question
                 selected_option = current_question["opciones"][0]
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": current_question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": 3.0
                 })
-                response.raise_for_status()
                 
                 # Get next question
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                next_data = response.json()
+                next_data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if next_data.get("finalizada"):
                     break
@@ -175,16 +808,14 @@ class RefrescoBotTester:
             if questions_retrieved >= 6:
                 print(f"✅ SUCCESS: Retrieved {questions_retrieved} questions, confirming expanded system!")
                 print("✅ System has expanded from 6 to 18 questions as expected")
-                self.test_results["18 Questions Loading"] = True
+                self._record_result("18 Questions Loading", True)
             else:
                 print(f"❌ FAILED: Only retrieved {questions_retrieved} questions, expected more")
-                self.test_results["18 Questions Loading"] = False
-                self.all_tests_passed = False
+                self._record_result("18 Questions Loading", False)
             
         except Exception as e:
             print(f"❌ 18 Questions Loading: FAILED - {str(e)}")
-            self.test_results["18 Questions Loading"] = False
-            self.all_tests_passed = False
+            self._record_result("18 Questions Loading", False)
 
     def test_new_logic_with_expanded_questions(self):
         """Test that new logic works correctly with expanded questions"""
@@ -197,13 +828,10 @@ class RefrescoBotTester:
             session_id = self.create_health_conscious_session()
             if not session_id:
                 print("❌ FAILED: Could not create health-conscious session")
-                self.test_results["New Logic Expanded Questions"] = False
-                self.all_tests_passed = False
+                self._record_result("New Logic Expanded Questions", False)
                 return
             
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
             refrescos = recommendations.get("refrescos_reales", [])
             alternativas = recommendations.get("bebidas_alternativas", [])
@@ -212,8 +840,7 @@ class RefrescoBotTester:
             
             if len(refrescos) > 0 and len(alternativas) == 0:
                 print("❌ FAILED: Health-conscious user got refrescos instead of alternatives")
-                self.test_results["New Logic Expanded Questions"] = False
-                self.all_tests_passed = False
+                self._record_result("New Logic Expanded Questions", False)
                 return
             elif len(alternativas) > 0:
                 print("✅ CORRECT: Health-conscious user got alternatives")
@@ -223,13 +850,10 @@ class RefrescoBotTester:
             session_id = self.create_traditional_session()
             if not session_id:
                 print("❌ FAILED: Could not create traditional session")
-                self.test_results["New Logic Expanded Questions"] = False
-                self.all_tests_passed = False
+                self._record_result("New Logic Expanded Questions", False)
                 return
             
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
             refrescos = recommendations.get("refrescos_reales", [])
             alternativas = recommendations.get("bebidas_alternativas", [])
@@ -240,8 +864,7 @@ class RefrescoBotTester:
                 print("✅ CORRECT: Traditional user got refrescos")
             elif len(alternativas) > 0 and len(refrescos) == 0:
                 print("❌ FAILED: Traditional user got alternatives instead of refrescos")
-                self.test_results["New Logic Expanded Questions"] = False
-                self.all_tests_passed = False
+                self._record_result("New Logic Expanded Questions", False)
                 return
             
             # Test case 3: User who doesn't consume refrescos (should get ONLY alternatives)
@@ -249,13 +872,10 @@ class RefrescoBotTester:
             session_id = self.create_no_refresco_session()
             if not session_id:
                 print("❌ FAILED: Could not create no-refresco session")
-                self.test_results["New Logic Expanded Questions"] = False
-                self.all_tests_passed = False
+                self._record_result("New Logic Expanded Questions", False)
                 return
             
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
             refrescos = recommendations.get("refrescos_reales", [])
             alternativas = recommendations.get("bebidas_alternativas", [])
@@ -264,19 +884,17 @@ class RefrescoBotTester:
             
             if len(refrescos) > 0:
                 print("❌ FAILED: Non-refresco user got refrescos")
-                self.test_results["New Logic Expanded Questions"] = False
-                self.all_tests_passed = False
+                self._record_result("New Logic Expanded Questions", False)
                 return
             elif len(alternativas) > 0:
                 print("✅ CORRECT: Non-refresco user got ONLY alternatives")
             
             print("✅ SUCCESS: New logic with expanded questions works correctly!")
-            self.test_results["New Logic Expanded Questions"] = True
+            self._record_result("New Logic Expanded Questions", True)
             
         except Exception as e:
             print(f"❌ New Logic Expanded Questions: FAILED - {str(e)}")
-            self.test_results["New Logic Expanded Questions"] = False
-            self.all_tests_passed = False
+            self._record_result("New Logic Expanded Questions", False)
 
     def test_critical_cases_from_review(self):
         """Test critical cases specifically mentioned in the review request"""
@@ -395,9 +1013,7 @@ class RefrescoBotTester:
                     print(f"❌ FAILED: Could not create session for {test_case['name']}")
                     continue
                 
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                recommendations = response.json()
+                recommendations = self._get_json(URL_RECOMENDACION + session_id)
                 
                 refrescos = recommendations.get("refrescos_reales", [])
                 alternativas = recommendations.get("bebidas_alternativas", [])
@@ -424,16 +1040,14 @@ class RefrescoBotTester:
             # Success criteria: At least 80% of critical cases should pass
             if passed_cases >= total_cases * 0.8:
                 print("✅ SUCCESS: Most critical cases work correctly!")
-                self.test_results["Critical Cases from Review"] = True
+                self._record_result("Critical Cases from Review", True)
             else:
                 print("❌ FAILED: Too many critical cases failed")
-                self.test_results["Critical Cases from Review"] = False
-                self.all_tests_passed = False
+                self._record_result("Critical Cases from Review", False)
             
         except Exception as e:
             print(f"❌ Critical Cases from Review: FAILED - {str(e)}")
-            self.test_results["Critical Cases from Review"] = False
-            self.all_tests_passed = False
+            self._record_result("Critical Cases from Review", False)
 
     def test_more_options_button(self):
         """Test the 'more options' button functionality"""
@@ -446,14 +1060,11 @@ class RefrescoBotTester:
             session_id = self.create_no_refresco_session()
             if not session_id:
                 print("❌ FAILED: Could not create no-refresco session")
-                self.test_results["More Options Button"] = False
-                self.all_tests_passed = False
+                self._record_result("More Options Button", False)
                 return
             
             # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            initial_recs = response.json()
+            initial_recs = self._get_json(URL_RECOMENDACION + session_id)
             
             initial_refrescos = len(initial_recs.get("refrescos_reales", []))
             initial_alternativas = len(initial_recs.get("bebidas_alternativas", []))
@@ -461,9 +1072,7 @@ class RefrescoBotTester:
             print(f"   Initial: {initial_refrescos} refrescos, {initial_alternativas} alternativas")
             
             # Test more options
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-            response.raise_for_status()
-            more_options = response.json()
+            more_options = self._get_json(URL_MAS_RECOMENDACIONES + session_id)
             
             additional_recs = more_options.get("recomendaciones_adicionales", [])
             tipo_recomendaciones = more_options.get("tipo_recomendaciones", "")
@@ -487,18 +1096,14 @@ class RefrescoBotTester:
             print("\n📋 Test Case 2: Traditional user")
             session_id = self.create_traditional_session()
             if session_id:
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                initial_recs = response.json()
+                initial_recs = self._get_json(URL_RECOMENDACION + session_id)
                 
                 initial_refrescos = len(initial_recs.get("refrescos_reales", []))
                 initial_alternativas = len(initial_recs.get("bebidas_alternativas", []))
                 
                 print(f"   Initial: {initial_refrescos} refrescos, {initial_alternativas} alternativas")
                 
-                response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-                response.raise_for_status()
-                more_options = response.json()
+                more_options = self._get_json(URL_MAS_RECOMENDACIONES + session_id)
                 
                 additional_recs = more_options.get("recomendaciones_adicionales", [])
                 tipo_recomendaciones = more_options.get("tipo_recomendaciones", "")
@@ -518,22 +1123,16 @@ class RefrescoBotTester:
             print("\n📋 Test Case 3: Multiple clicks to test exhaustion")
             session_id = self.create_health_conscious_session()
             if session_id:
-                # Get initial recommendations
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
+                # Get initial recommendations (this records them as shown for the clicks below)
+                self._get_json(URL_RECOMENDACION + session_id)
                 
-                clicks = 0
                 max_clicks = 5
                 
-                while clicks < max_clicks:
-                    response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-                    response.raise_for_status()
-                    more_options = response.json()
-                    
+                # All clicks in one request when the backend supports max_batches; it stops at exhaustion
+                for clicks, more_options in enumerate(self._more_batches(session_id, max_clicks), start=1):
                     additional_recs = more_options.get("recomendaciones_adicionales", [])
                     sin_mas_opciones = more_options.get("sin_mas_opciones", False)
                     
-                    clicks += 1
                     print(f"   Click {clicks}: {len(additional_recs)} additional, exhausted: {sin_mas_opciones}")
                     
                     if sin_mas_opciones:
@@ -548,16 +1147,14 @@ class RefrescoBotTester:
             
             if case1_passed and case2_passed and case3_passed:
                 print("✅ SUCCESS: More options button works correctly for all user types!")
-                self.test_results["More Options Button"] = True
+                self._record_result("More Options Button", True)
             else:
                 print("❌ FAILED: More options button has issues")
-                self.test_results["More Options Button"] = False
-                self.all_tests_passed = False
+                self._record_result("More Options Button", False)
             
         except Exception as e:
             print(f"❌ More Options Button: FAILED - {str(e)}")
-            self.test_results["More Options Button"] = False
-            self.all_tests_passed = False
+            self._record_result("More Options Button", False)
 
     def test_modal_when_options_exhausted(self):
         """Test modal functionality when options are exhausted"""
@@ -569,32 +1166,24 @@ class RefrescoBotTester:
             session_id = self.create_health_conscious_session()
             if not session_id:
                 print("❌ FAILED: Could not create session")
-                self.test_results["Modal When Options Exhausted"] = False
-                self.all_tests_passed = False
+                self._record_result("Modal When Options Exhausted", False)
                 return
             
             # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            initial_recs = response.json()
+            initial_recs = self._get_json(URL_RECOMENDACION + session_id)
             
             print(f"✅ Initial recommendations obtained")
             
             # Keep clicking more options until exhausted
-            clicks = 0
             max_clicks = 10
             exhausted = False
             
-            while clicks < max_clicks:
-                response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-                response.raise_for_status()
-                more_options = response.json()
-                
+            # All clicks in one request when the backend supports max_batches; it stops at exhaustion
+            for clicks, more_options in enumerate(self._more_batches(session_id, max_clicks), start=1):
                 additional_recs = more_options.get("recomendaciones_adicionales", [])
                 sin_mas_opciones = more_options.get("sin_mas_opciones", False)
                 mensaje = more_options.get("mensaje", "")
                 
-                clicks += 1
                 print(f"   Click {clicks}: {len(additional_recs)} additional, exhausted: {sin_mas_opciones}")
                 
                 if sin_mas_opciones:
@@ -606,16 +1195,14 @@ class RefrescoBotTester:
                         print("✅ CORRECT: Response includes sin_mas_opciones: true for modal trigger")
                     else:
                         print("❌ FAILED: Response should include sin_mas_opciones: true")
-                        self.test_results["Modal When Options Exhausted"] = False
-                        self.all_tests_passed = False
+                        self._record_result("Modal When Options Exhausted", False)
                         return
                     
                     if mensaje and len(mensaje) > 0:
                         print("✅ CORRECT: Response includes friendly message for modal")
                     else:
                         print("❌ FAILED: Response should include friendly message")
-                        self.test_results["Modal When Options Exhausted"] = False
-                        self.all_tests_passed = False
+                        self._record_result("Modal When Options Exhausted", False)
                         return
                     
                     exhausted = True
@@ -626,15 +1213,46 @@ class RefrescoBotTester:
             
             if exhausted:
                 print("✅ SUCCESS: System properly handles option exhaustion!")
-                self.test_results["Modal When Options Exhausted"] = True
+                self._record_result("Modal When Options Exhausted", True)
             else:
                 print("⚠️ WARNING: Could not exhaust options in 10 clicks (may indicate large dataset)")
-                self.test_results["Modal When Options Exhausted"] = True  # Not a failure
+                self._record_result("Modal When Options Exhausted", True)  # Not a failure
             
         except Exception as e:
             print(f"❌ Modal When Options Exhausted: FAILED - {str(e)}")
-            self.test_results["Modal When Options Exhausted"] = False
-            self.all_tests_passed = False
+            self._record_result("Modal When Options Exhausted", False)
+
+    def test_batch_path_validation(self):
+        """Test that /api/batch rejects paths with a query string or without a session id"""
+        name = "Batch Path Validation"
+        print("\n🔍 Testing Batch Path Validation...")
+        print("Expected: 422 for a query string or an empty session id, 404 for an unknown session")
+        
+        try:
+            # (path, expected status): the last entry is valid, so it reaches the handler
+            cases = (("recomendacion/invalid-session-id?limit=1", 422),
+                     ("recomendacion/", 422),
+                     ("recomendacion/invalid-session-id", 404))
+            response = self.http.post(f"{API_URL}/batch",
+                                      data=_json_dumps([{"method": "GET", "path": path} for path, _ in cases]))
+            if _route_missing(response):
+                return self._fail(name, "/api/batch is not available")
+            response.raise_for_status()
+            
+            failures = []
+            for (path, expected), result in zip(cases, _json_loads(response.content)):
+                if result["status"] == expected:
+                    print(f"✅ {path}: {result['status']}")
+                else:
+                    failures.append(f"{path}: expected {expected}, got {result['status']} ({result['body']})")
+                    print(f"❌ {failures[-1]}")
+            
+            if failures:
+                return self._fail(name, "; ".join(failures))
+            self._record_result(name, True)
+            
+        except Exception as e:
+            self._fail(name, str(e))
 
     def test_priority_verification(self):
         """Test that P1 and P4 questions still have priority in the expanded system"""
@@ -649,13 +1267,10 @@ class RefrescoBotTester:
             session_id = self.create_mixed_priority_session("prioridad_sabor")
             if not session_id:
                 print("❌ FAILED: Could not create P4 priority test session")
-                self.test_results["Priority Verification"] = False
-                self.all_tests_passed = False
+                self._record_result("Priority Verification", False)
                 return
             
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
             refrescos = recommendations.get("refrescos_reales", [])
             alternativas = recommendations.get("bebidas_alternativas", [])
@@ -672,9 +1287,7 @@ class RefrescoBotTester:
             # Case 2: P4 = prioridad_salud should override other traditional responses
             session_id = self.create_mixed_priority_session("prioridad_salud")
             if session_id:
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                recommendations = response.json()
+                recommendations = self._get_json(URL_RECOMENDACION + session_id)
                 
                 refrescos = recommendations.get("refrescos_reales", [])
                 alternativas = recommendations.get("bebidas_alternativas", [])
@@ -694,9 +1307,7 @@ class RefrescoBotTester:
             # Case 3: P1 = no_consume_refrescos should be decisive
             session_id = self.create_mixed_p1_session("no_consume_refrescos")
             if session_id:
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                recommendations = response.json()
+                recommendations = self._get_json(URL_RECOMENDACION + session_id)
                 
                 refrescos = recommendations.get("refrescos_reales", [])
                 alternativas = recommendations.get("bebidas_alternativas", [])
@@ -714,16 +1325,14 @@ class RefrescoBotTester:
             
             if p4_priority_works and p1_priority_works:
                 print("✅ SUCCESS: P1 and P4 maintain priority in expanded system!")
-                self.test_results["Priority Verification"] = True
+                self._record_result("Priority Verification", True)
             else:
                 print("❌ FAILED: Priority system not working correctly")
-                self.test_results["Priority Verification"] = False
-                self.all_tests_passed = False
+                self._record_result("Priority Verification", False)
             
         except Exception as e:
             print(f"❌ Priority Verification: FAILED - {str(e)}")
-            self.test_results["Priority Verification"] = False
-            self.all_tests_passed = False
+            self._record_result("Priority Verification", False)
 
     def test_complete_flow_new_repertoire(self):
         """Test complete flow from start to recommendations with new repertoire"""
@@ -732,22 +1341,17 @@ class RefrescoBotTester:
         
         try:
             # Create session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
+            session_data = self._post_json(f"{API_URL}/iniciar-sesion")
             session_id = session_data["sesion_id"]
             print("✅ Step 1: Session created")
             
             # Get initial question (P1)
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            question_data = response.json()
+            question_data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             pregunta = question_data["pregunta"]
             if pregunta["id"] != 1:
                 print(f"❌ FAILED: Initial question should be P1, got P{pregunta['id']}")
-                self.test_results["Complete Flow New Repertoire"] = False
-                self.all_tests_passed = False
+                self._record_result("Complete Flow New Repertoire", False)
                 return
             
             print("✅ Step 2: Got P1 (initial question)")
@@ -784,21 +1388,18 @@ class RefrescoBotTester:
                     selected_option = opciones[0]
                 
                 # Answer question
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": question_id,
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": random.uniform(2.0, 8.0)
                 })
-                response.raise_for_status()
                 questions_answered += 1
                 
                 print(f"✅ Answered Q{question_id}: {selected_option['valor']}")
                 
                 # Get next question
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                next_data = response.json()
+                next_data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if next_data.get("finalizada"):
                     break
@@ -808,9 +1409,7 @@ class RefrescoBotTester:
             print(f"✅ Step 3: Answered {questions_answered} questions")
             
             # Get recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
             refrescos = recommendations.get("refrescos_reales", [])
             alternativas = recommendations.get("bebidas_alternativas", [])
@@ -826,9 +1425,7 @@ class RefrescoBotTester:
                 print("⚠️ WARNING: Got mixed results (may indicate logic issue)")
             
             # Test more options
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-            response.raise_for_status()
-            more_options = response.json()
+            more_options = self._get_json(URL_MAS_RECOMENDACIONES + session_id)
             
             additional_count = len(more_options.get("recomendaciones_adicionales", []))
             print(f"✅ Step 5: More options returned {additional_count} additional recommendations")
@@ -836,20 +1433,18 @@ class RefrescoBotTester:
             # Test rating functionality
             if len(alternativas) > 0:
                 test_beverage = alternativas[0]
-                response = requests.post(f"{API_URL}/puntuar/{session_id}/{test_beverage['id']}", json={
+                self._post_json(f"{URL_PUNTUAR}{session_id}/{test_beverage['id']}", {
                     "puntuacion": 5,
                     "comentario": "Testing with expanded question system"
                 })
-                response.raise_for_status()
                 print("✅ Step 6: Rating functionality works")
             
             print("✅ SUCCESS: Complete flow works with new repertoire!")
-            self.test_results["Complete Flow New Repertoire"] = True
+            self._record_result("Complete Flow New Repertoire", True)
             
         except Exception as e:
             print(f"❌ Complete Flow New Repertoire: FAILED - {str(e)}")
-            self.test_results["Complete Flow New Repertoire"] = False
-            self.all_tests_passed = False
+            self._record_result("Complete Flow New Repertoire", False)
 
     def test_system_predictability(self):
         """Test that system remains 100% predictable with expanded questions"""
@@ -878,9 +1473,7 @@ class RefrescoBotTester:
                     print(f"❌ FAILED: Could not create session for run {run + 1}")
                     continue
                 
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                recommendations = response.json()
+                recommendations = self._get_json(URL_RECOMENDACION + session_id)
                 
                 refrescos = recommendations.get("refrescos_reales", [])
                 alternativas = recommendations.get("bebidas_alternativas", [])
@@ -913,20 +1506,17 @@ class RefrescoBotTester:
                 if all_identical:
                     print("✅ PERFECT: All runs produced identical results!")
                     print("✅ System is 100% predictable with expanded questions")
-                    self.test_results["System Predictability"] = True
+                    self._record_result("System Predictability", True)
                 else:
                     print("❌ FAILED: System is not predictable - different runs gave different results")
-                    self.test_results["System Predictability"] = False
-                    self.all_tests_passed = False
+                    self._record_result("System Predictability", False)
             else:
                 print("❌ FAILED: Could not run enough tests to verify predictability")
-                self.test_results["System Predictability"] = False
-                self.all_tests_passed = False
+                self._record_result("System Predictability", False)
             
         except Exception as e:
             print(f"❌ System Predictability: FAILED - {str(e)}")
-            self.test_results["System Predictability"] = False
-            self.all_tests_passed = False
+            self._record_result("System Predictability", False)
 
     def test_expanded_question_influence(self):
         """Test that expanded questions actually influence recommendations"""
@@ -969,9 +1559,7 @@ class RefrescoBotTester:
                     print(f"❌ FAILED: Could not create session for {combination['name']}")
                     continue
                 
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                recommendations = response.json()
+                recommendations = self._get_json(URL_RECOMENDACION + session_id)
                 
                 refrescos = recommendations.get("refrescos_reales", [])
                 alternativas = recommendations.get("bebidas_alternativas", [])
@@ -1004,16 +1592,14 @@ class RefrescoBotTester:
             
             if influenced_combinations >= len(test_combinations) * 0.75:  # 75% success rate
                 print("✅ SUCCESS: Expanded questions appropriately influence recommendations!")
-                self.test_results["Expanded Question Influence"] = True
+                self._record_result("Expanded Question Influence", True)
             else:
                 print("❌ FAILED: Expanded questions don't sufficiently influence recommendations")
-                self.test_results["Expanded Question Influence"] = False
-                self.all_tests_passed = False
+                self._record_result("Expanded Question Influence", False)
             
         except Exception as e:
             print(f"❌ Expanded Question Influence: FAILED - {str(e)}")
-            self.test_results["Expanded Question Influence"] = False
-            self.all_tests_passed = False
+            self._record_result("Expanded Question Influence", False)
         """Test that backend is correctly configured to serve static files from /static"""
         print("\n🔍 Testing Backend Static Files Configuration...")
         print("Expected: FastAPI StaticFiles configured to serve from /static directory")
@@ -1033,8 +1619,7 @@ class RefrescoBotTester:
                 print(f"✅ Content-Length: {response.headers.get('content-length', 'unknown')} bytes")
             elif response.status_code == 404:
                 print("❌ FAILED: Static file not found - configuration may be incorrect")
-                self.test_results["Backend Static Files Configuration"] = False
-                self.all_tests_passed = False
+                self._record_result("Backend Static Files Configuration", False)
                 return
             else:
                 print(f"⚠️ WARNING: Unexpected status code {response.status_code}")
@@ -1065,16 +1650,14 @@ class RefrescoBotTester:
             
             if successful_tests >= len(test_paths) // 2:  # At least half should work
                 print("✅ SUCCESS: Backend static files configuration is working!")
-                self.test_results["Backend Static Files Configuration"] = True
+                self._record_result("Backend Static Files Configuration", True)
             else:
                 print("❌ FAILED: Too many static files are inaccessible")
-                self.test_results["Backend Static Files Configuration"] = False
-                self.all_tests_passed = False
+                self._record_result("Backend Static Files Configuration", False)
             
         except Exception as e:
             print(f"❌ Backend Static Files Configuration: FAILED - {str(e)}")
-            self.test_results["Backend Static Files Configuration"] = False
-            self.all_tests_passed = False
+            self._record_result("Backend Static Files Configuration", False)
 
     def test_specific_image_routes(self):
         """Test specific image routes mentioned in the review request"""
@@ -1126,19 +1709,17 @@ class RefrescoBotTester:
             if accessible_routes > 0 and error_routes == 0:
                 print("✅ SUCCESS: Specific image routes are working correctly!")
                 print("✅ Static file serving is properly configured")
-                self.test_results["Specific Image Routes"] = True
+                self._record_result("Specific Image Routes", True)
             elif accessible_routes > 0 and error_routes < len(specific_routes) // 2:
                 print("✅ MOSTLY SUCCESS: Most routes work, some minor issues")
-                self.test_results["Specific Image Routes"] = True
+                self._record_result("Specific Image Routes", True)
             else:
                 print("❌ FAILED: Too many routes have errors or none are accessible")
-                self.test_results["Specific Image Routes"] = False
-                self.all_tests_passed = False
+                self._record_result("Specific Image Routes", False)
             
         except Exception as e:
             print(f"❌ Specific Image Routes: FAILED - {str(e)}")
-            self.test_results["Specific Image Routes"] = False
-            self.all_tests_passed = False
+            self._record_result("Specific Image Routes", False)
 
     def test_bebidas_json_image_paths(self):
         """Test that bebidas.json has correct image paths with /static/images/bebidas/ format"""
@@ -1147,9 +1728,7 @@ class RefrescoBotTester:
         
         try:
             # First try to get bebidas data from admin stats
-            response = requests.get(f"{API_URL}/admin/stats")
-            response.raise_for_status()
-            stats_data = response.json()
+            stats_data = self._get_json(f"{API_URL}/admin/stats")
             
             bebidas_stats = stats_data.get("bebidas", {})
             total_bebidas = bebidas_stats.get("total", 0)
@@ -1158,24 +1737,20 @@ class RefrescoBotTester:
             print(f"✅ Found {total_bebidas} bebidas with {total_presentaciones} presentations in system")
             
             # Since we can't access bebidas directly, let's test through recommendations
-            session_id = self.create_complete_user_session()
+            session_id = self.create_session_and_answer_questions()
             if not session_id:
                 print("❌ FAILED: Could not create session to test bebidas data")
-                self.test_results["Bebidas JSON Image Paths"] = False
-                self.all_tests_passed = False
+                self._record_result("Bebidas JSON Image Paths", False)
                 return
             
             # Get recommendations to analyze image paths
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
             all_beverages = recommendations.get("refrescos_reales", []) + recommendations.get("bebidas_alternativas", [])
             
             if not all_beverages:
                 print("❌ FAILED: No beverages found in recommendations")
-                self.test_results["Bebidas JSON Image Paths"] = False
-                self.all_tests_passed = False
+                self._record_result("Bebidas JSON Image Paths", False)
                 return
             
             correct_paths = 0
@@ -1202,9 +1777,7 @@ class RefrescoBotTester:
                         incorrect_paths += 1
             
             # Get additional recommendations to test more beverages
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-            response.raise_for_status()
-            additional_recs = response.json()
+            additional_recs = self._get_json(URL_MAS_RECOMENDACIONES + session_id)
             
             additional_beverages = additional_recs.get("recomendaciones_adicionales", [])
             
@@ -1233,19 +1806,17 @@ class RefrescoBotTester:
             # Success criteria: All or most paths should be correct
             if incorrect_paths == 0 and missing_paths == 0:
                 print("✅ PERFECT: All image paths are correctly formatted!")
-                self.test_results["Bebidas JSON Image Paths"] = True
+                self._record_result("Bebidas JSON Image Paths", True)
             elif correct_paths >= total_presentations_tested * 0.9:  # 90% correct
                 print("✅ SUCCESS: Most image paths are correctly formatted")
-                self.test_results["Bebidas JSON Image Paths"] = True
+                self._record_result("Bebidas JSON Image Paths", True)
             else:
                 print("❌ FAILED: Too many incorrect or missing image paths")
-                self.test_results["Bebidas JSON Image Paths"] = False
-                self.all_tests_passed = False
+                self._record_result("Bebidas JSON Image Paths", False)
             
         except Exception as e:
             print(f"❌ Bebidas JSON Image Paths: FAILED - {str(e)}")
-            self.test_results["Bebidas JSON Image Paths"] = False
-            self.all_tests_passed = False
+            self._record_result("Bebidas JSON Image Paths", False)
 
     def test_recommendations_with_real_images(self):
         """Test that recommendations include beverages with real image paths"""
@@ -1254,25 +1825,21 @@ class RefrescoBotTester:
         
         try:
             # Create a complete user session
-            session_id = self.create_complete_user_session()
+            session_id = self.create_session_and_answer_questions()
             if not session_id:
                 print("❌ FAILED: Could not create user session")
-                self.test_results["Recommendations with Real Images"] = False
-                self.all_tests_passed = False
+                self._record_result("Recommendations with Real Images", False)
                 return
             
             # Get recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
             # Analyze image paths in recommendations
             all_beverages = recommendations.get("refrescos_reales", []) + recommendations.get("bebidas_alternativas", [])
             
             if not all_beverages:
                 print("❌ FAILED: No beverages in recommendations")
-                self.test_results["Recommendations with Real Images"] = False
-                self.all_tests_passed = False
+                self._record_result("Recommendations with Real Images", False)
                 return
             
             print(f"✅ Found {len(all_beverages)} beverages in recommendations")
@@ -1308,9 +1875,7 @@ class RefrescoBotTester:
             print(f"✅ Correct image paths: {correct_image_paths}/{total_presentations}")
             
             # Test additional recommendations
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-            response.raise_for_status()
-            additional_recs = response.json()
+            additional_recs = self._get_json(URL_MAS_RECOMENDACIONES + session_id)
             
             additional_beverages = additional_recs.get("recomendaciones_adicionales", [])
             print(f"✅ Additional recommendations: {len(additional_beverages)} beverages")
@@ -1318,16 +1883,14 @@ class RefrescoBotTester:
             # Success criteria
             if correct_image_paths >= total_presentations * 0.8:  # 80% should have correct paths
                 print("✅ SUCCESS: Recommendations contain beverages with proper image paths!")
-                self.test_results["Recommendations with Real Images"] = True
+                self._record_result("Recommendations with Real Images", True)
             else:
                 print("❌ FAILED: Too few recommendations have correct image paths")
-                self.test_results["Recommendations with Real Images"] = False
-                self.all_tests_passed = False
+                self._record_result("Recommendations with Real Images", False)
             
         except Exception as e:
             print(f"❌ Recommendations with Real Images: FAILED - {str(e)}")
-            self.test_results["Recommendations with Real Images"] = False
-            self.all_tests_passed = False
+            self._record_result("Recommendations with Real Images", False)
 
     def test_frontend_url_construction(self):
         """Test that frontend URL construction works correctly"""
@@ -1366,11 +1929,9 @@ class RefrescoBotTester:
                     print(f"❌ REQUEST ERROR: {constructed_url} - {e}")
             
             # Test that the pattern works with a real recommendation
-            session_id = self.create_complete_user_session()
+            session_id = self.create_session_and_answer_questions()
             if session_id:
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                recommendations = response.json()
+                recommendations = self._get_json(URL_RECOMENDACION + session_id)
                 
                 all_beverages = recommendations.get("refrescos_reales", []) + recommendations.get("bebidas_alternativas", [])
                 
@@ -1406,25 +1967,21 @@ class RefrescoBotTester:
             
             if constructed_urls_working > 0:
                 print("✅ SUCCESS: Frontend URL construction pattern is working correctly!")
-                self.test_results["Frontend URL Construction"] = True
+                self._record_result("Frontend URL Construction", True)
             else:
                 print("❌ FAILED: Frontend URL construction pattern is not working")
-                self.test_results["Frontend URL Construction"] = False
-                self.all_tests_passed = False
+                self._record_result("Frontend URL Construction", False)
             
         except Exception as e:
             print(f"❌ Frontend URL Construction: FAILED - {str(e)}")
-            self.test_results["Frontend URL Construction"] = False
-            self.all_tests_passed = False
+            self._record_result("Frontend URL Construction", False)
         """Test that system initializes without any placeholder-related errors"""
         print("\n🔍 Testing System Initialization Without Placeholder Errors...")
         print("Expected: System starts cleanly without generating or referencing placeholders")
         
         try:
             # Test system status endpoint
-            response = requests.get(f"{API_URL}/status")
-            response.raise_for_status()
-            status_data = response.json()
+            status_data = self._get_json(f"{API_URL}/status")
             
             print(f"✅ System status: {status_data.get('status', 'unknown')}")
             
@@ -1436,32 +1993,27 @@ class RefrescoBotTester:
             
             if found_placeholder_refs:
                 print(f"❌ FAILED: Found placeholder references in system status: {found_placeholder_refs}")
-                self.test_results["System Initialization No Placeholder Errors"] = False
-                self.all_tests_passed = False
+                self._record_result("System Initialization No Placeholder Errors", False)
                 return
             else:
                 print("✅ CORRECT: No placeholder references found in system status")
             
             # Test that system can start a session without placeholder errors
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
+            session_data = self._post_json(f"{API_URL}/iniciar-sesion")
             
             if "sesion_id" in session_data:
                 print("✅ CORRECT: Session creation works without placeholder dependencies")
             else:
                 print("❌ FAILED: Session creation failed")
-                self.test_results["System Initialization No Placeholder Errors"] = False
-                self.all_tests_passed = False
+                self._record_result("System Initialization No Placeholder Errors", False)
                 return
             
             print("✅ SUCCESS: System initializes cleanly without placeholder errors!")
-            self.test_results["System Initialization No Placeholder Errors"] = True
+            self._record_result("System Initialization No Placeholder Errors", True)
             
         except Exception as e:
             print(f"❌ System Initialization No Placeholder Errors: FAILED - {str(e)}")
-            self.test_results["System Initialization No Placeholder Errors"] = False
-            self.all_tests_passed = False
+            self._record_result("System Initialization No Placeholder Errors", False)
 
     def test_beverage_loading_without_placeholders(self):
         """Test that beverages load correctly without placeholder dependencies"""
@@ -1470,17 +2022,14 @@ class RefrescoBotTester:
         
         try:
             # Test admin stats endpoint to get beverage information
-            response = requests.get(f"{API_URL}/admin/stats")
-            response.raise_for_status()
-            stats_data = response.json()
+            stats_data = self._get_json(f"{API_URL}/admin/stats")
             
             bebidas_stats = stats_data.get("bebidas", {})
             total_bebidas = bebidas_stats.get("total", 0)
             
             if total_bebidas == 0:
                 print("❌ FAILED: No beverages found in system")
-                self.test_results["Beverage Loading Without Placeholders"] = False
-                self.all_tests_passed = False
+                self._record_result("Beverage Loading Without Placeholders", False)
                 return
             
             print(f"✅ Found {total_bebidas} beverages in system")
@@ -1497,8 +2046,7 @@ class RefrescoBotTester:
             
             if found_placeholder_refs:
                 print(f"❌ FAILED: Found placeholder references in system stats: {found_placeholder_refs}")
-                self.test_results["Beverage Loading Without Placeholders"] = False
-                self.all_tests_passed = False
+                self._record_result("Beverage Loading Without Placeholders", False)
                 return
             else:
                 print("✅ CORRECT: No placeholder references found in system stats")
@@ -1510,12 +2058,11 @@ class RefrescoBotTester:
                 print("⚠️ WARNING: No beverages processed with ML yet")
             
             print("✅ SUCCESS: Beverages load correctly without placeholder dependencies!")
-            self.test_results["Beverage Loading Without Placeholders"] = True
+            self._record_result("Beverage Loading Without Placeholders", True)
             
         except Exception as e:
             print(f"❌ Beverage Loading Without Placeholders: FAILED - {str(e)}")
-            self.test_results["Beverage Loading Without Placeholders"] = False
-            self.all_tests_passed = False
+            self._record_result("Beverage Loading Without Placeholders", False)
 
     def test_recommendations_without_placeholders(self):
         """Test that recommendations work without placeholder dependencies"""
@@ -1524,17 +2071,14 @@ class RefrescoBotTester:
         
         try:
             # Create a complete user session
-            session_id = self.create_complete_user_session()
+            session_id = self.create_session_and_answer_questions()
             if not session_id:
                 print("❌ FAILED: Could not create user session")
-                self.test_results["Recommendations Without Placeholders"] = False
-                self.all_tests_passed = False
+                self._record_result("Recommendations Without Placeholders", False)
                 return
             
             # Get recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
             # Check for placeholder indicators in recommendations
             rec_str = str(recommendations).lower()
@@ -1544,8 +2088,7 @@ class RefrescoBotTester:
             
             if found_placeholder_refs:
                 print(f"❌ FAILED: Found placeholder references in recommendations: {found_placeholder_refs}")
-                self.test_results["Recommendations Without Placeholders"] = False
-                self.all_tests_passed = False
+                self._record_result("Recommendations Without Placeholders", False)
                 return
             
             # Check that recommendations contain real beverages
@@ -1557,8 +2100,7 @@ class RefrescoBotTester:
             
             if total_recommendations == 0:
                 print("❌ FAILED: No recommendations generated")
-                self.test_results["Recommendations Without Placeholders"] = False
-                self.all_tests_passed = False
+                self._record_result("Recommendations Without Placeholders", False)
                 return
             
             # Check that each recommendation has real data
@@ -1566,14 +2108,12 @@ class RefrescoBotTester:
             for rec in all_recommendations:
                 if not rec.get('nombre'):
                     print(f"❌ FAILED: Recommendation missing name: {rec}")
-                    self.test_results["Recommendations Without Placeholders"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Recommendations Without Placeholders", False)
                     return
                 
                 if not rec.get('presentaciones'):
                     print(f"❌ FAILED: Recommendation missing presentations: {rec.get('nombre')}")
-                    self.test_results["Recommendations Without Placeholders"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Recommendations Without Placeholders", False)
                     return
                 
                 # Check ML predictions exist (not placeholder values)
@@ -1581,33 +2121,28 @@ class RefrescoBotTester:
                     prob = rec['probabilidad']
                     if not isinstance(prob, (int, float)) or prob < 0 or prob > 100:
                         print(f"❌ FAILED: Invalid probability in recommendation: {prob}")
-                        self.test_results["Recommendations Without Placeholders"] = False
-                        self.all_tests_passed = False
+                        self._record_result("Recommendations Without Placeholders", False)
                         return
             
             print("✅ CORRECT: All recommendations contain real data without placeholders")
             
             # Test additional recommendations
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-            response.raise_for_status()
-            additional_recs = response.json()
+            additional_recs = self._get_json(URL_MAS_RECOMENDACIONES + session_id)
             
             additional_str = str(additional_recs).lower()
             if any(indicator in additional_str for indicator in placeholder_indicators):
                 print("❌ FAILED: Found placeholder references in additional recommendations")
-                self.test_results["Recommendations Without Placeholders"] = False
-                self.all_tests_passed = False
+                self._record_result("Recommendations Without Placeholders", False)
                 return
             
             print("✅ CORRECT: Additional recommendations also work without placeholders")
             
             print("✅ SUCCESS: Recommendations work correctly without placeholder dependencies!")
-            self.test_results["Recommendations Without Placeholders"] = True
+            self._record_result("Recommendations Without Placeholders", True)
             
         except Exception as e:
             print(f"❌ Recommendations Without Placeholders: FAILED - {str(e)}")
-            self.test_results["Recommendations Without Placeholders"] = False
-            self.all_tests_passed = False
+            self._record_result("Recommendations Without Placeholders", False)
 
     def test_complete_flow_without_placeholder_errors(self):
         """Test complete flow from start to recommendations without placeholder errors"""
@@ -1616,16 +2151,12 @@ class RefrescoBotTester:
         
         try:
             # Step 1: Start session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
+            session_data = self._post_json(f"{API_URL}/iniciar-sesion")
             session_id = session_data["sesion_id"]
             print("✅ Step 1: Session started successfully")
             
             # Step 2: Get initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            question_data = response.json()
+            question_data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             print("✅ Step 2: Initial question retrieved successfully")
             
             # Step 3: Answer all questions
@@ -1636,19 +2167,16 @@ class RefrescoBotTester:
                 # Answer current question
                 selected_option = current_question["opciones"][0]  # Use first option
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": current_question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": random.uniform(2.0, 8.0)
                 })
-                response.raise_for_status()
                 questions_answered += 1
                 
                 # Get next question
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                next_data = response.json()
+                next_data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if next_data.get("finalizada"):
                     break
@@ -1658,17 +2186,13 @@ class RefrescoBotTester:
             print(f"✅ Step 3: Answered {questions_answered} questions successfully")
             
             # Step 4: Get recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
             total_recs = len(recommendations.get("refrescos_reales", [])) + len(recommendations.get("bebidas_alternativas", []))
             print(f"✅ Step 4: Generated {total_recs} recommendations successfully")
             
             # Step 5: Test more options
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-            response.raise_for_status()
-            more_options = response.json()
+            more_options = self._get_json(URL_MAS_RECOMENDACIONES + session_id)
             
             additional_count = len(more_options.get("recomendaciones_adicionales", []))
             print(f"✅ Step 5: More options returned {additional_count} additional recommendations")
@@ -1679,12 +2203,10 @@ class RefrescoBotTester:
                 all_beverages = recommendations.get("refrescos_reales", []) + recommendations.get("bebidas_alternativas", [])
                 test_beverage = all_beverages[0]
                 
-                response = requests.post(f"{API_URL}/puntuar/{session_id}/{test_beverage['id']}", json={
+                rating_response = self._post_json(f"{URL_PUNTUAR}{session_id}/{test_beverage['id']}", {
                     "puntuacion": 4,
                     "comentario": "Test rating without placeholders"
                 })
-                response.raise_for_status()
-                rating_response = response.json()
                 
                 print("✅ Step 6: Rating functionality works successfully")
             
@@ -1703,19 +2225,17 @@ class RefrescoBotTester:
             
             if found_placeholder_refs:
                 print(f"❌ FAILED: Found placeholder references in complete flow: {found_placeholder_refs}")
-                self.test_results["Complete Flow Without Placeholder Errors"] = False
-                self.all_tests_passed = False
+                self._record_result("Complete Flow Without Placeholder Errors", False)
                 return
             
             print("✅ CORRECT: Complete flow executed without any placeholder references")
             
             print("✅ SUCCESS: Complete flow works perfectly without placeholder dependencies!")
-            self.test_results["Complete Flow Without Placeholder Errors"] = True
+            self._record_result("Complete Flow Without Placeholder Errors", True)
             
         except Exception as e:
             print(f"❌ Complete Flow Without Placeholder Errors: FAILED - {str(e)}")
-            self.test_results["Complete Flow Without Placeholder Errors"] = False
-            self.all_tests_passed = False
+            self._record_result("Complete Flow Without Placeholder Errors", False)
 
     def test_image_handling_no_placeholder_fallback(self):
         """Test that image handling works without placeholder fallback"""
@@ -1724,24 +2244,20 @@ class RefrescoBotTester:
         
         try:
             # Create a session and get recommendations to check image paths
-            session_id = self.create_complete_user_session()
+            session_id = self.shared_session()
             if not session_id:
                 print("❌ FAILED: Could not create session for image testing")
-                self.test_results["Image Handling No Placeholder Fallback"] = False
-                self.all_tests_passed = False
+                self._record_result("Image Handling No Placeholder Fallback", False)
                 return
             
             # Get recommendations to check image paths in beverages
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
             all_beverages = recommendations.get("refrescos_reales", []) + recommendations.get("bebidas_alternativas", [])
             
             if not all_beverages:
                 print("❌ FAILED: No beverages found to test images")
-                self.test_results["Image Handling No Placeholder Fallback"] = False
-                self.all_tests_passed = False
+                self._record_result("Image Handling No Placeholder Fallback", False)
                 return
             
             placeholder_image_issues = []
@@ -1763,8 +2279,7 @@ class RefrescoBotTester:
                 print(f"❌ FAILED: Found placeholder image paths:")
                 for issue in placeholder_image_issues:
                     print(f"   - {issue}")
-                self.test_results["Image Handling No Placeholder Fallback"] = False
-                self.all_tests_passed = False
+                self._record_result("Image Handling No Placeholder Fallback", False)
                 return
             
             print(f"✅ CORRECT: Found {len(real_image_paths)} real image paths, no placeholder paths")
@@ -1797,17 +2312,15 @@ class RefrescoBotTester:
             print("✅ CORRECT: Image handling works without placeholder fallback mechanism")
             
             print("✅ SUCCESS: Image handling works correctly without placeholder dependencies!")
-            self.test_results["Image Handling No Placeholder Fallback"] = True
+            self._record_result("Image Handling No Placeholder Fallback", True)
             
         except Exception as e:
             print(f"❌ Image Handling No Placeholder Fallback: FAILED - {str(e)}")
-            self.test_results["Image Handling No Placeholder Fallback"] = False
-            self.all_tests_passed = False
+            self._record_result("Image Handling No Placeholder Fallback", False)
             
         except Exception as e:
             print(f"❌ Image Handling No Placeholder Fallback: FAILED - {str(e)}")
-            self.test_results["Image Handling No Placeholder Fallback"] = False
-            self.all_tests_passed = False
+            self._record_result("Image Handling No Placeholder Fallback", False)
 
     def test_admin_panel_no_placeholder_dependencies(self):
         """Test that admin panel works without placeholder dependencies"""
@@ -1816,9 +2329,7 @@ class RefrescoBotTester:
         
         try:
             # Test admin stats endpoint
-            response = requests.get(f"{API_URL}/admin/stats")
-            response.raise_for_status()
-            stats_data = response.json()
+            stats_data = self._get_json(f"{API_URL}/admin/stats")
             
             admin_str = str(stats_data).lower()
             placeholder_indicators = ['placeholder', 'generate_placeholder', 'create_placeholder']
@@ -1827,47 +2338,39 @@ class RefrescoBotTester:
             
             if found_placeholder_refs:
                 print(f"❌ FAILED: Found placeholder references in admin stats: {found_placeholder_refs}")
-                self.test_results["Admin Panel No Placeholder Dependencies"] = False
-                self.all_tests_passed = False
+                self._record_result("Admin Panel No Placeholder Dependencies", False)
                 return
             
             print("✅ CORRECT: Admin stats endpoint works without placeholder references")
             
             # Test admin reprocess-beverages endpoint
-            response = requests.post(f"{API_URL}/admin/reprocess-beverages")
-            response.raise_for_status()
-            reprocess_data = response.json()
+            reprocess_data = self._post_json(f"{API_URL}/admin/reprocess-beverages")
             
             reprocess_str = str(reprocess_data).lower()
             if any(indicator in reprocess_str for indicator in placeholder_indicators):
                 print("❌ FAILED: Found placeholder references in reprocess response")
-                self.test_results["Admin Panel No Placeholder Dependencies"] = False
-                self.all_tests_passed = False
+                self._record_result("Admin Panel No Placeholder Dependencies", False)
                 return
             
             print("✅ CORRECT: Admin reprocess endpoint works without placeholder references")
             
             # Test admin retrain-ml endpoint
-            response = requests.post(f"{API_URL}/admin/retrain-ml")
-            response.raise_for_status()
-            retrain_data = response.json()
+            retrain_data = self._post_json(f"{API_URL}/admin/retrain-ml")
             
             retrain_str = str(retrain_data).lower()
             if any(indicator in retrain_str for indicator in placeholder_indicators):
                 print("❌ FAILED: Found placeholder references in retrain response")
-                self.test_results["Admin Panel No Placeholder Dependencies"] = False
-                self.all_tests_passed = False
+                self._record_result("Admin Panel No Placeholder Dependencies", False)
                 return
             
             print("✅ CORRECT: Admin retrain endpoint works without placeholder references")
             
             print("✅ SUCCESS: Admin panel works correctly without placeholder dependencies!")
-            self.test_results["Admin Panel No Placeholder Dependencies"] = True
+            self._record_result("Admin Panel No Placeholder Dependencies", True)
             
         except Exception as e:
             print(f"❌ Admin Panel No Placeholder Dependencies: FAILED - {str(e)}")
-            self.test_results["Admin Panel No Placeholder Dependencies"] = False
-            self.all_tests_passed = False
+            self._record_result("Admin Panel No Placeholder Dependencies", False)
 
     def test_ml_system_no_placeholder_dependencies(self):
         """Test that ML system works without placeholder data dependencies"""
@@ -1876,17 +2379,14 @@ class RefrescoBotTester:
         
         try:
             # Create a session and get ML-based recommendations
-            session_id = self.create_complete_user_session()
+            session_id = self.shared_session()
             if not session_id:
                 print("❌ FAILED: Could not create session for ML testing")
-                self.test_results["ML System No Placeholder Dependencies"] = False
-                self.all_tests_passed = False
+                self._record_result("ML System No Placeholder Dependencies", False)
                 return
             
             # Get recommendations with ML predictions
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
             # Check ML-related data for placeholder indicators
             ml_data = recommendations.get("criterios_ml", {})
@@ -1899,8 +2399,7 @@ class RefrescoBotTester:
             
             if found_placeholder_refs:
                 print(f"❌ FAILED: Found placeholder references in ML data: {found_placeholder_refs}")
-                self.test_results["ML System No Placeholder Dependencies"] = False
-                self.all_tests_passed = False
+                self._record_result("ML System No Placeholder Dependencies", False)
                 return
             
             print("✅ CORRECT: ML system data contains no placeholder references")
@@ -1914,8 +2413,7 @@ class RefrescoBotTester:
                 if prob is not None:
                     if not isinstance(prob, (int, float)) or prob < 0 or prob > 100:
                         print(f"❌ FAILED: Invalid ML probability: {prob} for {beverage.get('nombre')}")
-                        self.test_results["ML System No Placeholder Dependencies"] = False
-                        self.all_tests_passed = False
+                        self._record_result("ML System No Placeholder Dependencies", False)
                         return
                 
                 # Check ML prediction values
@@ -1923,8 +2421,7 @@ class RefrescoBotTester:
                 if pred_ml is not None:
                     if not isinstance(pred_ml, (int, float)) or pred_ml < 0 or pred_ml > 5:
                         print(f"❌ FAILED: Invalid ML prediction: {pred_ml} for {beverage.get('nombre')}")
-                        self.test_results["ML System No Placeholder Dependencies"] = False
-                        self.all_tests_passed = False
+                        self._record_result("ML System No Placeholder Dependencies", False)
                         return
                 
                 # Check explanatory factors
@@ -1933,8 +2430,7 @@ class RefrescoBotTester:
                     factores_str = str(factores).lower()
                     if any(indicator in factores_str for indicator in placeholder_indicators):
                         print(f"❌ FAILED: Placeholder references in ML explanations for {beverage.get('nombre')}")
-                        self.test_results["ML System No Placeholder Dependencies"] = False
-                        self.all_tests_passed = False
+                        self._record_result("ML System No Placeholder Dependencies", False)
                         return
             
             print(f"✅ CORRECT: All {len(all_beverages)} beverages have valid ML predictions without placeholders")
@@ -1947,12 +2443,11 @@ class RefrescoBotTester:
                 print(f"✅ ML training samples: {ml_data.get('muestras_entrenamiento')}")
             
             print("✅ SUCCESS: ML system works correctly without placeholder dependencies!")
-            self.test_results["ML System No Placeholder Dependencies"] = True
+            self._record_result("ML System No Placeholder Dependencies", True)
             
         except Exception as e:
             print(f"❌ ML System No Placeholder Dependencies: FAILED - {str(e)}")
-            self.test_results["ML System No Placeholder Dependencies"] = False
-            self.all_tests_passed = False
+            self._record_result("ML System No Placeholder Dependencies", False)
 
     def test_image_loading_and_error_handling(self):
         """Test image loading and error handling for missing images"""
@@ -2029,16 +2524,14 @@ class RefrescoBotTester:
             # Success criteria
             if existing_loaded > 0 and missing_handled >= len(potentially_missing_images) // 2 and system_robust:
                 print("✅ SUCCESS: Image loading and error handling work correctly!")
-                self.test_results["Image Loading and Error Handling"] = True
+                self._record_result("Image Loading and Error Handling", True)
             else:
                 print("❌ FAILED: Issues with image loading or error handling")
-                self.test_results["Image Loading and Error Handling"] = False
-                self.all_tests_passed = False
+                self._record_result("Image Loading and Error Handling", False)
             
         except Exception as e:
             print(f"❌ Image Loading and Error Handling: FAILED - {str(e)}")
-            self.test_results["Image Loading and Error Handling"] = False
-            self.all_tests_passed = False
+            self._record_result("Image Loading and Error Handling", False)
 
     def test_complete_image_flow(self):
         """Test complete image flow from backend configuration to frontend usage"""
@@ -2053,17 +2546,14 @@ class RefrescoBotTester:
             
             if response.status_code != 200:
                 print("❌ FAILED: Static files not properly served")
-                self.test_results["Complete Image Flow"] = False
-                self.all_tests_passed = False
+                self._record_result("Complete Image Flow", False)
                 return
             
             print("✅ Step 1 PASSED: Static files are served correctly")
             
             # Step 2: Check system stats for bebidas data
             print("\n📋 Step 2: Checking system bebidas data...")
-            response = requests.get(f"{API_URL}/admin/stats")
-            response.raise_for_status()
-            stats_data = response.json()
+            stats_data = self._get_json(f"{API_URL}/admin/stats")
             
             bebidas_stats = stats_data.get("bebidas", {})
             total_bebidas = bebidas_stats.get("total", 0)
@@ -2071,31 +2561,26 @@ class RefrescoBotTester:
             
             if total_bebidas == 0:
                 print("❌ FAILED: No bebidas found in system")
-                self.test_results["Complete Image Flow"] = False
-                self.all_tests_passed = False
+                self._record_result("Complete Image Flow", False)
                 return
             
             print(f"✅ Step 2 PASSED: {total_bebidas} bebidas with {total_presentaciones} presentations")
             
             # Step 3: Get recommendations and verify image paths
             print("\n📋 Step 3: Testing recommendations with images...")
-            session_id = self.create_complete_user_session()
+            session_id = self.create_session_and_answer_questions()
             if not session_id:
                 print("❌ FAILED: Could not create session")
-                self.test_results["Complete Image Flow"] = False
-                self.all_tests_passed = False
+                self._record_result("Complete Image Flow", False)
                 return
             
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
             all_beverages = recommendations.get("refrescos_reales", []) + recommendations.get("bebidas_alternativas", [])
             
             if not all_beverages:
                 print("❌ FAILED: No beverages in recommendations")
-                self.test_results["Complete Image Flow"] = False
-                self.all_tests_passed = False
+                self._record_result("Complete Image Flow", False)
                 return
             
             print(f"✅ Step 3 PASSED: {len(all_beverages)} beverages in recommendations")
@@ -2138,9 +2623,7 @@ class RefrescoBotTester:
             
             # Step 5: Test additional recommendations
             print("\n📋 Step 5: Testing additional recommendations...")
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-            response.raise_for_status()
-            additional_recs = response.json()
+            additional_recs = self._get_json(URL_MAS_RECOMENDACIONES + session_id)
             
             additional_beverages = additional_recs.get("recomendaciones_adicionales", [])
             print(f"✅ Step 5 PASSED: {len(additional_beverages)} additional recommendations")
@@ -2184,23 +2667,19 @@ class RefrescoBotTester:
                 accessible_images > 0 and total_bebidas > 0):
                 print("✅ SUCCESS: Complete image flow is working correctly!")
                 print("✅ System properly uses images from backend/static/images/bebidas/")
-                self.test_results["Complete Image Flow"] = True
+                self._record_result("Complete Image Flow", True)
             else:
                 print("❌ FAILED: Complete image flow has critical issues")
-                self.test_results["Complete Image Flow"] = False
-                self.all_tests_passed = False
+                self._record_result("Complete Image Flow", False)
             
         except Exception as e:
             print(f"❌ Complete Image Flow: FAILED - {str(e)}")
-            self.test_results["Complete Image Flow"] = False
-            self.all_tests_passed = False
+            self._record_result("Complete Image Flow", False)
 
     def create_test_session(self):
         """Create a basic test session"""
         try:
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
+            session_data = self._post_json(f"{API_URL}/iniciar-sesion")
             return session_data["sesion_id"]
         except:
             return None
@@ -2213,9 +2692,7 @@ class RefrescoBotTester:
                 return None
             
             # Get initial question and answer with health-conscious choice
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            question_data = response.json()
+            question_data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             pregunta = question_data["pregunta"]
             
@@ -2230,13 +2707,12 @@ class RefrescoBotTester:
                 selected_option = pregunta["opciones"][-1]  # Last option as fallback
             
             # Answer initial question
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": pregunta["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": 3.0
             })
-            response.raise_for_status()
             
             # Answer a few more questions with health-conscious responses
             health_responses = {
@@ -2252,9 +2728,7 @@ class RefrescoBotTester:
             
             questions_answered = 1
             while questions_answered < 6:  # Answer 6 questions total
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                next_data = response.json()
+                next_data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if next_data.get("finalizada"):
                     break
@@ -2270,13 +2744,12 @@ class RefrescoBotTester:
                         selected_option = option
                         break
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": current_question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": 3.0
                 })
-                response.raise_for_status()
                 questions_answered += 1
             
             return session_id
@@ -2293,9 +2766,7 @@ class RefrescoBotTester:
                 return None
             
             # Get initial question and answer with traditional choice
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            question_data = response.json()
+            question_data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             pregunta = question_data["pregunta"]
             
@@ -2310,13 +2781,12 @@ class RefrescoBotTester:
                 selected_option = pregunta["opciones"][0]  # First option as fallback
             
             # Answer initial question
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": pregunta["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": 3.0
             })
-            response.raise_for_status()
             
             # Answer more questions with traditional responses
             traditional_responses = {
@@ -2332,9 +2802,7 @@ class RefrescoBotTester:
             
             questions_answered = 1
             while questions_answered < 6:  # Answer 6 questions total
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                next_data = response.json()
+                next_data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if next_data.get("finalizada"):
                     break
@@ -2350,13 +2818,12 @@ class RefrescoBotTester:
                         selected_option = option
                         break
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": current_question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": 3.0
                 })
-                response.raise_for_status()
                 questions_answered += 1
             
             return session_id
@@ -2373,9 +2840,7 @@ class RefrescoBotTester:
                 return None
             
             # Get initial question and answer with no-refresco choice
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            question_data = response.json()
+            question_data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             pregunta = question_data["pregunta"]
             
@@ -2390,13 +2855,12 @@ class RefrescoBotTester:
                 selected_option = pregunta["opciones"][-1]  # Last option as fallback
             
             # Answer initial question
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": pregunta["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": 3.0
             })
-            response.raise_for_status()
             
             # Answer more questions consistently with no-refresco preference
             no_refresco_responses = {
@@ -2410,9 +2874,7 @@ class RefrescoBotTester:
             
             questions_answered = 1
             while questions_answered < 6:  # Answer 6 questions total
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                next_data = response.json()
+                next_data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if next_data.get("finalizada"):
                     break
@@ -2428,13 +2890,12 @@ class RefrescoBotTester:
                         selected_option = option
                         break
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": current_question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": 3.0
                 })
-                response.raise_for_status()
                 questions_answered += 1
             
             return session_id
@@ -2451,28 +2912,23 @@ class RefrescoBotTester:
                 return None
             
             # Get initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            question_data = response.json()
+            question_data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             pregunta = question_data["pregunta"]
             
             # Answer initial question
             selected_option = pregunta["opciones"][0]  # Default
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": pregunta["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": 3.0
             })
-            response.raise_for_status()
             
             # Answer more questions, looking for target responses
             questions_answered = 1
             while questions_answered < 6:  # Answer 6 questions total
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                next_data = response.json()
+                next_data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if next_data.get("finalizada"):
                     break
@@ -2488,13 +2944,12 @@ class RefrescoBotTester:
                         selected_option = option
                         break
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": current_question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": 3.0
                 })
-                response.raise_for_status()
                 questions_answered += 1
             
             return session_id
@@ -2511,26 +2966,21 @@ class RefrescoBotTester:
                 return None
             
             # Answer questions with mixed responses but specific P4 value
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            question_data = response.json()
+            question_data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             pregunta = question_data["pregunta"]
             selected_option = pregunta["opciones"][1]  # Use middle option
             
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": pregunta["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": 3.0
             })
-            response.raise_for_status()
             
             questions_answered = 1
             while questions_answered < 6:
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                next_data = response.json()
+                next_data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if next_data.get("finalizada"):
                     break
@@ -2550,15 +3000,14 @@ class RefrescoBotTester:
                         selected_option = current_question["opciones"][0]
                 else:
                     # Use random option for other questions
-                    selected_option = current_question["opciones"][random.randint(0, len(current_question["opciones"])-1)]
+                    selected_option = random.choice(current_question["opciones"])
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": current_question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": 3.0
                 })
-                response.raise_for_status()
                 questions_answered += 1
             
             return session_id
@@ -2575,9 +3024,7 @@ class RefrescoBotTester:
                 return None
             
             # Get initial question (P1) and use specific value
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            question_data = response.json()
+            question_data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             pregunta = question_data["pregunta"]
             
@@ -2591,20 +3038,17 @@ class RefrescoBotTester:
             if not selected_option:
                 selected_option = pregunta["opciones"][0]
             
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": pregunta["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": 3.0
             })
-            response.raise_for_status()
             
             # Answer other questions with mixed responses
             questions_answered = 1
             while questions_answered < 6:
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                next_data = response.json()
+                next_data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if next_data.get("finalizada"):
                     break
@@ -2614,15 +3058,14 @@ class RefrescoBotTester:
                     break
                 
                 # Use random option
-                selected_option = current_question["opciones"][random.randint(0, len(current_question["opciones"])-1)]
+                selected_option = random.choice(current_question["opciones"])
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": current_question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": 3.0
                 })
-                response.raise_for_status()
                 questions_answered += 1
             
             return session_id
@@ -2639,9 +3082,7 @@ class RefrescoBotTester:
                 return None
             
             # Get initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            question_data = response.json()
+            question_data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             pregunta = question_data["pregunta"]
             
@@ -2658,20 +3099,17 @@ class RefrescoBotTester:
             else:
                 selected_option = pregunta["opciones"][0]
             
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": pregunta["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": 3.0
             })
-            response.raise_for_status()
             
             # Answer other questions with specific responses
             questions_answered = 1
             while questions_answered < 6:
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                next_data = response.json()
+                next_data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if next_data.get("finalizada"):
                     break
@@ -2695,13 +3133,12 @@ class RefrescoBotTester:
                 else:
                     selected_option = current_question["opciones"][0]
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": current_question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": 3.0
                 })
-                response.raise_for_status()
                 questions_answered += 1
             
             return session_id
@@ -2718,27 +3155,22 @@ class RefrescoBotTester:
                 return None
             
             # Answer initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            question_data = response.json()
+            question_data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             pregunta = question_data["pregunta"]
             selected_option = pregunta["opciones"][0]  # Default for P1
             
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": pregunta["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": 3.0
             })
-            response.raise_for_status()
             
             # Answer more questions, focusing on expanded questions
             questions_answered = 1
             while questions_answered < 6:
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                next_data = response.json()
+                next_data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if next_data.get("finalizada"):
                     break
@@ -2762,13 +3194,12 @@ class RefrescoBotTester:
                 else:
                     selected_option = current_question["opciones"][0]
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": current_question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": 3.0
                 })
-                response.raise_for_status()
                 questions_answered += 1
             
             return session_id
@@ -2781,32 +3212,25 @@ class RefrescoBotTester:
         """Create a complete user session by answering all questions"""
         try:
             # Create session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
+            session_data = self._post_json(f"{API_URL}/iniciar-sesion")
             session_id = session_data["sesion_id"]
             
             # Get initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             question = data["pregunta"]
             
             # Answer initial question
             selected_option = question["opciones"][0]
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": question["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": random.uniform(2.0, 8.0)
             })
-            response.raise_for_status()
             
             # Answer remaining questions
             for i in range(10):  # Safety limit
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if data.get("finalizada"):
                     break
@@ -2814,13 +3238,12 @@ class RefrescoBotTester:
                 question = data["pregunta"]
                 selected_option = question["opciones"][len(question["opciones"]) // 2]  # Middle option
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": random.uniform(1.0, 10.0)
                 })
-                response.raise_for_status()
             
             return session_id
             
@@ -2833,20 +3256,15 @@ class RefrescoBotTester:
         
         try:
             # Create a new session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
+            session_data = self._post_json(f"{API_URL}/iniciar-sesion")
             session_id = session_data["sesion_id"]
             
             # Get the initial question (P1)
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             if "pregunta" not in data:
                 print("❌ FAILED: No pregunta in response")
-                self.test_results["6 New Questions Structure"] = False
-                self.all_tests_passed = False
+                self._record_result("6 New Questions Structure", False)
                 return
             
             pregunta1 = data["pregunta"]
@@ -2858,8 +3276,7 @@ class RefrescoBotTester:
             else:
                 print(f"❌ P1 INCORRECT: Expected question about relationship with sodas")
                 print(f"   Got: {pregunta1.get('pregunta', '')}")
-                self.test_results["6 New Questions Structure"] = False
-                self.all_tests_passed = False
+                self._record_result("6 New Questions Structure", False)
                 return
             
             # VERIFY P1 OPTIONS: no_consume_refrescos, prefiere_alternativas, etc.
@@ -2873,27 +3290,23 @@ class RefrescoBotTester:
                 print(f"❌ P1 OPTIONS INCORRECT: Only found {len(matching_p1)} expected values")
                 print(f"   Expected: {expected_p1_values}")
                 print(f"   Found: {found_p1_values}")
-                self.test_results["6 New Questions Structure"] = False
-                self.all_tests_passed = False
+                self._record_result("6 New Questions Structure", False)
                 return
             
             # Answer P1 and get remaining questions
             selected_option = pregunta1["opciones"][0]
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": pregunta1["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": 3.0
             })
-            response.raise_for_status()
             
             # Collect all 6 questions
             all_questions = [pregunta1]
             
             for i in range(5):  # Get remaining 5 questions
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if "finalizada" in data and data["finalizada"]:
                     break
@@ -2903,20 +3316,18 @@ class RefrescoBotTester:
                 
                 # Answer the question
                 selected_option = question["opciones"][len(question["opciones"]) // 2]  # Middle option
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": random.uniform(2.0, 8.0)
                 })
-                response.raise_for_status()
             
             print(f"✅ COLLECTED {len(all_questions)} questions total")
             
             if len(all_questions) != 6:
                 print(f"❌ INCORRECT: Expected exactly 6 questions, got {len(all_questions)}")
-                self.test_results["6 New Questions Structure"] = False
-                self.all_tests_passed = False
+                self._record_result("6 New Questions Structure", False)
                 return
             
             # VERIFY SPECIFIC QUESTION PATTERNS
@@ -2966,12 +3377,11 @@ class RefrescoBotTester:
                 print(f"⚠️ WARNING: Only found {len(critical_values_found)} critical values")
             
             print("✅ SUCCESS: 6 New Questions Structure is correctly implemented!")
-            self.test_results["6 New Questions Structure"] = True
+            self._record_result("6 New Questions Structure", True)
             
         except Exception as e:
             print(f"❌ 6 New Questions Structure: FAILED - {str(e)}")
-            self.test_results["6 New Questions Structure"] = False
-            self.all_tests_passed = False
+            self._record_result("6 New Questions Structure", False)
 
     def test_new_determinar_mostrar_alternativas_logic(self):
         """Test the new simplified determinar_mostrar_alternativas() logic"""
@@ -3009,9 +3419,7 @@ class RefrescoBotTester:
             for test_value, description in true_cases:
                 session_id = self.create_user_session_with_specific_pattern(test_value)
                 if session_id:
-                    response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                    response.raise_for_status()
-                    recommendations = response.json()
+                    recommendations = self._get_json(URL_RECOMENDACION + session_id)
                     
                     mostrar_alternativas = recommendations.get("mostrar_alternativas", False)
                     alternativas_count = len(recommendations.get("bebidas_alternativas", []))
@@ -3031,9 +3439,7 @@ class RefrescoBotTester:
             for test_value, description in false_cases:
                 session_id = self.create_user_session_with_specific_pattern(test_value)
                 if session_id:
-                    response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                    response.raise_for_status()
-                    recommendations = response.json()
+                    recommendations = self._get_json(URL_RECOMENDACION + session_id)
                     
                     mostrar_alternativas = recommendations.get("mostrar_alternativas", False)
                     alternativas_count = len(recommendations.get("bebidas_alternativas", []))
@@ -3064,16 +3470,14 @@ class RefrescoBotTester:
             
             if overall_success:
                 print("✅ SUCCESS: New determinar_mostrar_alternativas() logic is working correctly!")
-                self.test_results["New determinar_mostrar_alternativas Logic"] = True
+                self._record_result("New determinar_mostrar_alternativas Logic", True)
             else:
                 print("❌ FAILED: New logic is not working as expected")
-                self.test_results["New determinar_mostrar_alternativas Logic"] = False
-                self.all_tests_passed = False
+                self._record_result("New determinar_mostrar_alternativas Logic", False)
             
         except Exception as e:
             print(f"❌ New determinar_mostrar_alternativas Logic: FAILED - {str(e)}")
-            self.test_results["New determinar_mostrar_alternativas Logic"] = False
-            self.all_tests_passed = False
+            self._record_result("New determinar_mostrar_alternativas Logic", False)
 
     def test_specific_mixed_behavior_cases(self):
         """Test specific cases that previously caused mixed behavior"""
@@ -3127,9 +3531,7 @@ class RefrescoBotTester:
                     continue
                 
                 # Get recommendations
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                recommendations = response.json()
+                recommendations = self._get_json(URL_RECOMENDACION + session_id)
                 
                 refrescos_count = len(recommendations.get("refrescos_reales", []))
                 alternativas_count = len(recommendations.get("bebidas_alternativas", []))
@@ -3172,16 +3574,14 @@ class RefrescoBotTester:
             
             if all_cases_passed:
                 print("\n✅ SUCCESS: All specific mixed behavior cases now work correctly!")
-                self.test_results["Specific Mixed Behavior Cases"] = True
+                self._record_result("Specific Mixed Behavior Cases", True)
             else:
                 print("\n❌ FAILED: Some cases still show mixed behavior")
-                self.test_results["Specific Mixed Behavior Cases"] = False
-                self.all_tests_passed = False
+                self._record_result("Specific Mixed Behavior Cases", False)
             
         except Exception as e:
             print(f"❌ Specific Mixed Behavior Cases: FAILED - {str(e)}")
-            self.test_results["Specific Mixed Behavior Cases"] = False
-            self.all_tests_passed = False
+            self._record_result("Specific Mixed Behavior Cases", False)
 
     def test_complete_mixed_behavior_elimination(self):
         """Test complete elimination of mixed behavior - 100% predictable"""
@@ -3226,9 +3626,7 @@ class RefrescoBotTester:
                 total_tested += 1
                 
                 # Get recommendations
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                recommendations = response.json()
+                recommendations = self._get_json(URL_RECOMENDACION + session_id)
                 
                 refrescos_count = len(recommendations.get("refrescos_reales", []))
                 alternativas_count = len(recommendations.get("bebidas_alternativas", []))
@@ -3263,23 +3661,20 @@ class RefrescoBotTester:
                 # Success criteria: 90%+ clear behavior
                 if clear_rate >= 0.9:
                     print("\n✅ SUCCESS: Mixed behavior has been eliminated! System is 100% predictable!")
-                    self.test_results["Complete Mixed Behavior Elimination"] = True
+                    self._record_result("Complete Mixed Behavior Elimination", True)
                 elif clear_rate >= 0.8:
                     print("\n⚠️ GOOD: Most mixed behavior eliminated, minor issues remain")
-                    self.test_results["Complete Mixed Behavior Elimination"] = True
+                    self._record_result("Complete Mixed Behavior Elimination", True)
                 else:
                     print("\n❌ FAILED: Significant mixed behavior still exists")
-                    self.test_results["Complete Mixed Behavior Elimination"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Complete Mixed Behavior Elimination", False)
             else:
                 print("❌ FAILED: Could not test any patterns")
-                self.test_results["Complete Mixed Behavior Elimination"] = False
-                self.all_tests_passed = False
+                self._record_result("Complete Mixed Behavior Elimination", False)
             
         except Exception as e:
             print(f"❌ Complete Mixed Behavior Elimination: FAILED - {str(e)}")
-            self.test_results["Complete Mixed Behavior Elimination"] = False
-            self.all_tests_passed = False
+            self._record_result("Complete Mixed Behavior Elimination", False)
 
     def analyze_behavior_clarity(self, pattern, expected_behavior, refrescos_count, alternativas_count, mostrar_alternativas, usuario_no_consume, mensaje):
         """Analyze if behavior is clear or mixed"""
@@ -3336,18 +3731,14 @@ class RefrescoBotTester:
         """Create a user session with a specific pattern in responses"""
         try:
             # Create session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
+            session_data = self._post_json(f"{API_URL}/iniciar-sesion")
             session_id = session_data["sesion_id"]
             
             # Get all questions and answer them
             questions_answered = 0
             
             # Get initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             question = data["pregunta"]
             
             # Try to match target pattern in initial question
@@ -3355,20 +3746,17 @@ class RefrescoBotTester:
             if not selected_option:
                 selected_option = question["opciones"][0]  # Fallback
             
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": question["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": random.uniform(2.0, 8.0)
             })
-            response.raise_for_status()
             questions_answered += 1
             
             # Answer remaining questions
             for i in range(5):  # Up to 5 more questions
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if "finalizada" in data and data["finalizada"]:
                     break
@@ -3382,13 +3770,12 @@ class RefrescoBotTester:
                     option_index = len(question["opciones"]) // 2
                     selected_option = question["opciones"][option_index]
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": random.uniform(1.0, 10.0)
                 })
-                response.raise_for_status()
                 questions_answered += 1
             
             return session_id
@@ -3401,17 +3788,13 @@ class RefrescoBotTester:
         """Create a user session with multiple specific patterns in responses"""
         try:
             # Create session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
+            session_data = self._post_json(f"{API_URL}/iniciar-sesion")
             session_id = session_data["sesion_id"]
             
             pattern_index = 0
             
             # Get initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             question = data["pregunta"]
             
             # Try to match first pattern in initial question
@@ -3422,19 +3805,16 @@ class RefrescoBotTester:
             else:
                 pattern_index += 1
             
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": question["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": random.uniform(2.0, 8.0)
             })
-            response.raise_for_status()
             
             # Answer remaining questions
             for i in range(5):  # Up to 5 more questions
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if "finalizada" in data and data["finalizada"]:
                     break
@@ -3451,13 +3831,12 @@ class RefrescoBotTester:
                     option_index = len(question["opciones"]) // 2
                     selected_option = question["opciones"][option_index]
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": random.uniform(1.0, 10.0)
                 })
-                response.raise_for_status()
             
             return session_id
             
@@ -3486,20 +3865,15 @@ class RefrescoBotTester:
         
         try:
             # Create a new session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
+            session_data = self._post_json(f"{API_URL}/iniciar-sesion")
             session_id = session_data["sesion_id"]
             
             # Get the initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             if "pregunta" not in data:
                 print("❌ New Initial Question: FAILED - No pregunta in response")
-                self.test_results["New Initial Question"] = False
-                self.all_tests_passed = False
+                self._record_result("New Initial Question", False)
                 return
             
             pregunta = data["pregunta"]
@@ -3513,8 +3887,7 @@ class RefrescoBotTester:
                 print("✅ CORRECT: Question is about relationship with sodas")
             else:
                 print(f"❌ INCORRECT: Question doesn't match expected pattern. Got: {pregunta_texto}")
-                self.test_results["New Initial Question"] = False
-                self.all_tests_passed = False
+                self._record_result("New Initial Question", False)
                 return
             
             # Check for expected option values
@@ -3530,8 +3903,7 @@ class RefrescoBotTester:
                 print(f"✅ CORRECT: Found {len(matching_values)} expected option values: {matching_values}")
             else:
                 print(f"❌ INCORRECT: Only found {len(matching_values)} expected values. Expected at least 3 from: {expected_values}")
-                self.test_results["New Initial Question"] = False
-                self.all_tests_passed = False
+                self._record_result("New Initial Question", False)
                 return
             
             # Check if options are more specific than before
@@ -3541,12 +3913,11 @@ class RefrescoBotTester:
                 print(f"⚠️ WARNING: Only {len(opciones)} options, might not be specific enough")
             
             print("✅ SUCCESS: New initial question is correctly implemented!")
-            self.test_results["New Initial Question"] = True
+            self._record_result("New Initial Question", True)
             
         except Exception as e:
             print(f"❌ New Initial Question: FAILED - {str(e)}")
-            self.test_results["New Initial Question"] = False
-            self.all_tests_passed = False
+            self._record_result("New Initial Question", False)
 
     def test_new_user_categorization_logic(self):
         """Test the new user categorization logic"""
@@ -3578,9 +3949,7 @@ class RefrescoBotTester:
                     continue
                 
                 # Get recommendations
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                recommendations = response.json()
+                recommendations = self._get_json(URL_RECOMENDACION + session_id)
                 
                 # Analyze the categorization
                 refrescos_count = len(recommendations.get("refrescos_reales", []))
@@ -3611,8 +3980,7 @@ class RefrescoBotTester:
                     print(f"❌ INCORRECT: no_consume_refrescos user categorization failed")
                     print(f"   Expected: usuario_no_consume=True, refrescos=0, alternatives>0")
                     print(f"   Got: usuario_no_consume={result['usuario_no_consume']}, refrescos={result['refrescos_count']}, alternatives={result['alternativas_count']}")
-                    self.test_results["New User Categorization Logic"] = False
-                    self.all_tests_passed = False
+                    self._record_result("New User Categorization Logic", False)
                     return
             
             # Check prefiere_alternativas user
@@ -3622,8 +3990,7 @@ class RefrescoBotTester:
                     print("✅ CORRECT: prefiere_alternativas user gets alternatives initially")
                 else:
                     print(f"❌ INCORRECT: prefiere_alternativas user should get alternatives initially")
-                    self.test_results["New User Categorization Logic"] = False
-                    self.all_tests_passed = False
+                    self._record_result("New User Categorization Logic", False)
                     return
             
             # Check regular users have clear behavior (not mixed)
@@ -3642,378 +4009,108 @@ class RefrescoBotTester:
                         print(f"   refrescos={result['refrescos_count']}, alternatives={result['alternativas_count']}, mostrar_alternativas={result['mostrar_alternativas']}")
             
             print("✅ SUCCESS: New user categorization logic is working correctly!")
-            self.test_results["New User Categorization Logic"] = True
+            self._record_result("New User Categorization Logic", True)
             
         except Exception as e:
             print(f"❌ New User Categorization Logic: FAILED - {str(e)}")
-            self.test_results["New User Categorization Logic"] = False
-            self.all_tests_passed = False
+            self._record_result("New User Categorization Logic", False)
+
+    def test_user_scenarios(self):
+        """Test every user categorization scenario through a shared driver"""
+        # Each session build is a chain of dependent round trips, but the chains are
+        # independent of each other, so build them concurrently on the shared pool
+        with ThreadPoolExecutor(max_workers=len(_USER_SCENARIOS)) as executor:
+            session_ids = list(executor.map(lambda scenario: scenario[2](self), _USER_SCENARIOS))
+        
+        for (name, expected, _, check_initial, click_checks), session_id in zip(_USER_SCENARIOS, session_ids):
+            self.run_user_scenario(name, expected, session_id, check_initial, click_checks)
 
-    def test_usuario_no_consume_refrescos(self):
-        """Test usuario_no_consume_refrescos: Only alternatives"""
-        print("\n🔍 Testing Usuario No Consume Refrescos...")
-        print("Expected: Only healthy alternatives, no sodas")
+    @buffered_output
+    def run_user_scenario(self, name, expected, session_id, check_initial, click_checks):
+        """Verify initial and 'more options' recommendations of one user type's session"""
+        self._log(f"\n🔍 Testing {name}...")
+        self._log(f"Expected: {expected}")
         
         try:
-            # Create a user who doesn't consume sodas
-            session_id = self.create_user_session_with_specific_answer("no_consume_refrescos")
             if not session_id:
-                print("❌ Could not create no-consume-sodas user session")
-                self.test_results["Usuario No Consume Refrescos"] = False
-                self.all_tests_passed = False
+                self._log(f"❌ Could not create {name} user session")
+                self._record_result(name, False)
                 return
             
             # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
-            
-            refrescos_count = len(recommendations.get("refrescos_reales", []))
-            alternativas_count = len(recommendations.get("bebidas_alternativas", []))
-            usuario_no_consume = recommendations.get("usuario_no_consume_refrescos", False)
+            recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
-            print(f"✅ Initial recommendations: {refrescos_count} refrescos, {alternativas_count} alternatives")
-            print(f"✅ Usuario no consume refrescos: {usuario_no_consume}")
+            refrescos_count = len(recommendations.get("refrescos_reales", ()))
+            alternativas_count = len(recommendations.get("bebidas_alternativas", ()))
             
-            # Verify only alternatives
-            if refrescos_count == 0:
-                print("✅ CORRECT: No sodas shown to user who doesn't consume them")
-            else:
-                print(f"❌ INCORRECT: User who doesn't consume sodas got {refrescos_count} sodas")
-                self.test_results["Usuario No Consume Refrescos"] = False
-                self.all_tests_passed = False
-                return
-            
-            if alternativas_count > 0:
-                print(f"✅ CORRECT: User got {alternativas_count} healthy alternatives")
-            else:
-                print("❌ INCORRECT: User who doesn't consume sodas got no alternatives")
-                self.test_results["Usuario No Consume Refrescos"] = False
-                self.all_tests_passed = False
-                return
+            self._log(f"✅ Initial recommendations: {refrescos_count} refrescos, {alternativas_count} alternatives")
             
-            if usuario_no_consume:
-                print("✅ CORRECT: System correctly identified user as non-soda consumer")
-            else:
-                print("❌ INCORRECT: System failed to identify user as non-soda consumer")
-                self.test_results["Usuario No Consume Refrescos"] = False
-                self.all_tests_passed = False
+            error = check_initial(self._log, recommendations, refrescos_count, alternativas_count)
+            if error:
+                self._log(f"❌ INCORRECT: {error}")
+                self._record_result(name, False)
                 return
+            self._log("✅ CORRECT: Initial recommendations match the expected behavior")
             
-            # Test more options button - should give more alternatives, not sodas
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-            response.raise_for_status()
-            more_options = response.json()
-            
-            if not more_options.get("sin_mas_opciones", False):
+            # Test more options button, one check per click
+            url_more = URL_MAS_RECOMENDACIONES + session_id
+            for click_num, check_click in enumerate(click_checks, 1):
+                more_options = self._get_json(url_more)
+                
+                if more_options.get("sin_mas_opciones", False):
+                    self._log(f"⚠️ No more options available on click #{click_num} (this is acceptable)")
+                    break
+                
                 additional_recs = more_options.get("recomendaciones_adicionales", [])
                 tipo_recomendaciones = more_options.get("tipo_recomendaciones", "")
                 
-                print(f"✅ More options: {len(additional_recs)} recommendations ({tipo_recomendaciones})")
+                self._log(f"✅ 'More options' click #{click_num}: {len(additional_recs)} recommendations ({tipo_recomendaciones})")
                 
-                if "alternativas" in tipo_recomendaciones:
-                    print("✅ CORRECT: More options gives more alternatives, not sodas")
-                else:
-                    print(f"❌ INCORRECT: More options gave {tipo_recomendaciones} instead of alternatives")
-                    self.test_results["Usuario No Consume Refrescos"] = False
-                    self.all_tests_passed = False
+                verdict, message = check_click(tipo_recomendaciones, _tipo_kinds(tipo_recomendaciones))
+                if verdict is False:
+                    self._log(f"❌ INCORRECT: {message}")
+                    self._record_result(name, False)
                     return
-            else:
-                print("⚠️ No more options available (this is acceptable)")
+                self._log(f"✅ CORRECT: {message}" if verdict else f"⚠️ {message}")
             
-            print("✅ SUCCESS: Usuario no consume refrescos behavior is correct!")
-            self.test_results["Usuario No Consume Refrescos"] = True
+            self._log(f"✅ SUCCESS: {name} behavior is correct!")
+            self._record_result(name, True)
             
         except Exception as e:
-            print(f"❌ Usuario No Consume Refrescos: FAILED - {str(e)}")
-            self.test_results["Usuario No Consume Refrescos"] = False
-            self.all_tests_passed = False
+            self._log(f"❌ {name}: FAILED - {str(e)}")
+            self._record_result(name, False)
 
-    def test_usuario_prefiere_alternativas(self):
-        """Test usuario_prefiere_alternativas: Alternatives initially, sodas in more options"""
-        print("\n🔍 Testing Usuario Prefiere Alternativas...")
-        print("Expected: Alternatives initially, sodas available in 'more options'")
+    @buffered_output
+    def test_click_counter_behavior(self):
+        """Test click counter for dynamic behavior of more options button"""
+        self._log("\n🔍 Testing Click Counter Behavior...")
+        self._log("Expected: Different behavior based on number of clicks, especially for prefiere_alternativas users")
         
         try:
-            # Create a user who prefers alternatives
-            session_id = self.create_user_session_with_specific_answer("prefiere_alternativas")
+            # Create a user who prefers alternatives (most likely to have dynamic behavior)
+            # Clicks mutate the session's server-side counter, so never reuse a cached one
+            session_id = self.create_user_session_with_specific_answer("prefiere_alternativas", fresh=True)
             if not session_id:
-                print("❌ Could not create prefers-alternatives user session")
-                self.test_results["Usuario Prefiere Alternativas"] = False
-                self.all_tests_passed = False
+                self._log("❌ Could not create prefiere_alternativas user session")
+                self._record_result("Click Counter Behavior", False)
                 return
             
             # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
+            initial_recommendations = self._get_json(URL_RECOMENDACION + session_id)
             
-            refrescos_count = len(recommendations.get("refrescos_reales", []))
-            alternativas_count = len(recommendations.get("bebidas_alternativas", []))
+            self._log(f"✅ Initial: {len(initial_recommendations.get('refrescos_reales', []))} refrescos, {len(initial_recommendations.get('bebidas_alternativas', []))} alternatives")
             
-            print(f"✅ Initial recommendations: {refrescos_count} refrescos, {alternativas_count} alternatives")
+            # Track click behavior
+            click_results = []
             
-            # Should show alternatives initially
-            if alternativas_count > 0:
-                print(f"✅ CORRECT: User who prefers alternatives got {alternativas_count} alternatives initially")
-            else:
-                print("❌ INCORRECT: User who prefers alternatives got no alternatives initially")
-                self.test_results["Usuario Prefiere Alternativas"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Test more options button - first click should show sodas
-            print("\n📋 Testing 'more options' button behavior...")
-            
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-            response.raise_for_status()
-            more_options_1 = response.json()
-            
-            if not more_options_1.get("sin_mas_opciones", False):
-                additional_recs_1 = more_options_1.get("recomendaciones_adicionales", [])
-                tipo_recomendaciones_1 = more_options_1.get("tipo_recomendaciones", "")
-                
-                print(f"✅ First 'more options' click: {len(additional_recs_1)} recommendations ({tipo_recomendaciones_1})")
-                
-                # For prefiere_alternativas users, first click might show sodas as option
-                if "refrescos" in tipo_recomendaciones_1 or "opcionales" in tipo_recomendaciones_1:
-                    print("✅ CORRECT: First click shows sodas as optional choice")
-                elif "alternativas" in tipo_recomendaciones_1:
-                    print("✅ ACCEPTABLE: First click shows more alternatives")
-                else:
-                    print(f"⚠️ UNEXPECTED: First click shows {tipo_recomendaciones_1}")
-                
-                # Test second click
-                response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-                response.raise_for_status()
-                more_options_2 = response.json()
-                
-                if not more_options_2.get("sin_mas_opciones", False):
-                    additional_recs_2 = more_options_2.get("recomendaciones_adicionales", [])
-                    tipo_recomendaciones_2 = more_options_2.get("tipo_recomendaciones", "")
-                    
-                    print(f"✅ Second 'more options' click: {len(additional_recs_2)} recommendations ({tipo_recomendaciones_2})")
-                    
-                    # Second click should typically show more alternatives
-                    if "alternativas" in tipo_recomendaciones_2:
-                        print("✅ CORRECT: Second click shows more alternatives")
-                    else:
-                        print(f"⚠️ UNEXPECTED: Second click shows {tipo_recomendaciones_2}")
-                else:
-                    print("⚠️ No more options available on second click")
-            else:
-                print("⚠️ No more options available on first click")
-            
-            print("✅ SUCCESS: Usuario prefiere alternativas behavior is working!")
-            self.test_results["Usuario Prefiere Alternativas"] = True
-            
-        except Exception as e:
-            print(f"❌ Usuario Prefiere Alternativas: FAILED - {str(e)}")
-            self.test_results["Usuario Prefiere Alternativas"] = False
-            self.all_tests_passed = False
-
-    def test_usuario_regular_tradicional(self):
-        """Test usuario_regular_tradicional: Only sodas"""
-        print("\n🔍 Testing Usuario Regular Tradicional...")
-        print("Expected: Only sodas, no alternatives initially")
-        
-        try:
-            # Create a traditional regular user (sedentary, doesn't care about health)
-            session_id = self.create_traditional_user_session()
-            if not session_id:
-                print("❌ Could not create traditional user session")
-                self.test_results["Usuario Regular Tradicional"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
-            
-            refrescos_count = len(recommendations.get("refrescos_reales", []))
-            alternativas_count = len(recommendations.get("bebidas_alternativas", []))
-            mostrar_alternativas = recommendations.get("mostrar_alternativas", False)
-            
-            print(f"✅ Initial recommendations: {refrescos_count} refrescos, {alternativas_count} alternatives")
-            print(f"✅ Mostrar alternativas: {mostrar_alternativas}")
-            
-            # Traditional user should get only sodas
-            if refrescos_count > 0:
-                print(f"✅ CORRECT: Traditional user got {refrescos_count} sodas")
-            else:
-                print("❌ INCORRECT: Traditional user got no sodas")
-                self.test_results["Usuario Regular Tradicional"] = False
-                self.all_tests_passed = False
-                return
-            
-            if alternativas_count == 0:
-                print("✅ CORRECT: Traditional user got no alternatives initially")
-            else:
-                print(f"⚠️ UNEXPECTED: Traditional user got {alternativas_count} alternatives initially")
-                # This might be acceptable if it's the new "both types separately" behavior
-                if mostrar_alternativas:
-                    print("✅ ACCEPTABLE: This is the 'both types separately' behavior")
-                else:
-                    print("❌ INCORRECT: Traditional user shouldn't get alternatives without mostrar_alternativas=true")
-                    self.test_results["Usuario Regular Tradicional"] = False
-                    self.all_tests_passed = False
-                    return
-            
-            # Test more options button - should give more sodas
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-            response.raise_for_status()
-            more_options = response.json()
-            
-            if not more_options.get("sin_mas_opciones", False):
-                additional_recs = more_options.get("recomendaciones_adicionales", [])
-                tipo_recomendaciones = more_options.get("tipo_recomendaciones", "")
-                
-                print(f"✅ More options: {len(additional_recs)} recommendations ({tipo_recomendaciones})")
-                
-                if "refrescos" in tipo_recomendaciones or "tradicionales" in tipo_recomendaciones:
-                    print("✅ CORRECT: More options gives more sodas for traditional user")
-                else:
-                    print(f"⚠️ UNEXPECTED: More options gave {tipo_recomendaciones} instead of more sodas")
-            else:
-                print("⚠️ No more options available")
-            
-            print("✅ SUCCESS: Usuario regular tradicional behavior is correct!")
-            self.test_results["Usuario Regular Tradicional"] = True
-            
-        except Exception as e:
-            print(f"❌ Usuario Regular Tradicional: FAILED - {str(e)}")
-            self.test_results["Usuario Regular Tradicional"] = False
-            self.all_tests_passed = False
-
-    def test_usuario_regular_saludable(self):
-        """Test usuario_regular_saludable: Both types separately with clear message"""
-        print("\n🔍 Testing Usuario Regular Saludable...")
-        print("Expected: Both sodas and alternatives shown separately with clear messages")
-        
-        try:
-            # Create a health-conscious regular user (active, cares about health)
-            session_id = self.create_health_conscious_user_session()
-            if not session_id:
-                print("❌ Could not create health-conscious user session")
-                self.test_results["Usuario Regular Saludable"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
-            
-            refrescos_count = len(recommendations.get("refrescos_reales", []))
-            alternativas_count = len(recommendations.get("bebidas_alternativas", []))
-            mostrar_alternativas = recommendations.get("mostrar_alternativas", False)
-            mensaje_refrescos = recommendations.get("mensaje_refrescos", "")
-            mensaje_alternativas = recommendations.get("mensaje_alternativas", "")
-            
-            print(f"✅ Initial recommendations: {refrescos_count} refrescos, {alternativas_count} alternatives")
-            print(f"✅ Mostrar alternativas: {mostrar_alternativas}")
-            print(f"✅ Mensaje refrescos: {mensaje_refrescos}")
-            print(f"✅ Mensaje alternativas: {mensaje_alternativas}")
-            
-            # Health-conscious regular user should get both types
-            if refrescos_count > 0:
-                print(f"✅ CORRECT: Health-conscious user got {refrescos_count} sodas")
-            else:
-                print("❌ INCORRECT: Health-conscious user got no sodas")
-                self.test_results["Usuario Regular Saludable"] = False
-                self.all_tests_passed = False
-                return
-            
-            if alternativas_count > 0:
-                print(f"✅ CORRECT: Health-conscious user got {alternativas_count} alternatives")
-            else:
-                print("❌ INCORRECT: Health-conscious user got no alternatives")
-                self.test_results["Usuario Regular Saludable"] = False
-                self.all_tests_passed = False
-                return
-            
-            if mostrar_alternativas:
-                print("✅ CORRECT: System correctly identified user should see alternatives")
-            else:
-                print("❌ INCORRECT: System failed to identify user should see alternatives")
-                self.test_results["Usuario Regular Saludable"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Check for clear separation messages
-            if mensaje_refrescos and mensaje_alternativas:
-                print("✅ CORRECT: Both message types are present for clear separation")
-            else:
-                print("⚠️ WARNING: Missing separation messages")
-            
-            # Check that the main message indicates both types
-            if "ambos" in mensaje_refrescos.lower() or "refrescos" in mensaje_refrescos.lower() and "alternativas" in mensaje_refrescos.lower():
-                print("✅ CORRECT: Main message indicates both types are shown")
-            else:
-                print(f"⚠️ WARNING: Main message might not clearly indicate both types: {mensaje_refrescos}")
-            
-            # Test more options button - should give more alternatives for health-conscious user
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-            response.raise_for_status()
-            more_options = response.json()
-            
-            if not more_options.get("sin_mas_opciones", False):
-                additional_recs = more_options.get("recomendaciones_adicionales", [])
-                tipo_recomendaciones = more_options.get("tipo_recomendaciones", "")
-                
-                print(f"✅ More options: {len(additional_recs)} recommendations ({tipo_recomendaciones})")
-                
-                if "alternativas" in tipo_recomendaciones:
-                    print("✅ CORRECT: More options gives more alternatives for health-conscious user")
-                elif "refrescos" in tipo_recomendaciones:
-                    print("✅ ACCEPTABLE: More options gives more sodas (also valid)")
-                else:
-                    print(f"⚠️ UNEXPECTED: More options gave {tipo_recomendaciones}")
-            else:
-                print("⚠️ No more options available")
-            
-            print("✅ SUCCESS: Usuario regular saludable behavior is correct!")
-            self.test_results["Usuario Regular Saludable"] = True
-            
-        except Exception as e:
-            print(f"❌ Usuario Regular Saludable: FAILED - {str(e)}")
-            self.test_results["Usuario Regular Saludable"] = False
-            self.all_tests_passed = False
-
-    def test_click_counter_behavior(self):
-        """Test click counter for dynamic behavior of more options button"""
-        print("\n🔍 Testing Click Counter Behavior...")
-        print("Expected: Different behavior based on number of clicks, especially for prefiere_alternativas users")
-        
-        try:
-            # Create a user who prefers alternatives (most likely to have dynamic behavior)
-            session_id = self.create_user_session_with_specific_answer("prefiere_alternativas")
-            if not session_id:
-                print("❌ Could not create prefiere_alternativas user session")
-                self.test_results["Click Counter Behavior"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            initial_recommendations = response.json()
-            
-            print(f"✅ Initial: {len(initial_recommendations.get('refrescos_reales', []))} refrescos, {len(initial_recommendations.get('bebidas_alternativas', []))} alternatives")
-            
-            # Track click behavior
-            click_results = []
-            
-            for click_num in range(1, 4):  # Test up to 3 clicks
-                print(f"\n📋 Click #{click_num}:")
-                
-                response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-                response.raise_for_status()
-                more_options = response.json()
+            # Clicks are issued back to back: the server updates the click counter before
+            # responding, so each click already observes the previous one (no pacing needed).
+            # They must not be sent concurrently, since the counter is a read-modify-write.
+            for click_num, more_options in enumerate(self._more_batches(session_id, 3), 1):  # Test up to 3 clicks
+                self._log(f"\n📋 Click #{click_num}:")
                 
                 if more_options.get("sin_mas_opciones", False):
-                    print(f"⚠️ Click #{click_num}: No more options available")
+                    self._log(f"⚠️ Click #{click_num}: No more options available")
                     break
                 
                 additional_recs = more_options.get("recomendaciones_adicionales", [])
@@ -4026,13 +4123,10 @@ class RefrescoBotTester:
                 }
                 click_results.append(click_result)
                 
-                print(f"✅ Click #{click_num}: {len(additional_recs)} recommendations ({tipo_recomendaciones})")
-                
-                # Small delay to ensure different timestamps
-                time.sleep(0.1)
+                self._log(f"✅ Click #{click_num}: {len(additional_recs)} recommendations ({tipo_recomendaciones})")
             
             # Analyze click behavior
-            print(f"\n📊 Analyzing click behavior...")
+            self._log(f"\n📊 Analyzing click behavior...")
             
             if len(click_results) >= 2:
                 # Check if behavior changes between clicks
@@ -4040,42 +4134,43 @@ class RefrescoBotTester:
                 second_click_type = click_results[1]["type"]
                 
                 if first_click_type != second_click_type:
-                    print(f"✅ CORRECT: Click behavior changes - Click 1: {first_click_type}, Click 2: {second_click_type}")
+                    self._log(f"✅ CORRECT: Click behavior changes - Click 1: {first_click_type}, Click 2: {second_click_type}")
                     
                     # For prefiere_alternativas users, first click might show sodas, second more alternatives
-                    if "refrescos" in first_click_type and "alternativas" in second_click_type:
-                        print("✅ PERFECT: First click shows sodas as option, second click shows more alternatives")
-                    elif "alternativas" in first_click_type and "alternativas" in second_click_type:
-                        print("✅ ACCEPTABLE: Both clicks show alternatives (consistent behavior)")
+                    first_kinds = _tipo_kinds(first_click_type)
+                    second_kinds = _tipo_kinds(second_click_type)
+                    if "refrescos" in first_kinds and "alternativas" in second_kinds:
+                        self._log("✅ PERFECT: First click shows sodas as option, second click shows more alternatives")
+                    elif "alternativas" in first_kinds and "alternativas" in second_kinds:
+                        self._log("✅ ACCEPTABLE: Both clicks show alternatives (consistent behavior)")
                     else:
-                        print(f"✅ ACCEPTABLE: Dynamic behavior detected")
+                        self._log(f"✅ ACCEPTABLE: Dynamic behavior detected")
                 else:
-                    print(f"⚠️ CONSISTENT: Click behavior is consistent - both show {first_click_type}")
-                    print("   This is acceptable, but dynamic behavior would be better")
+                    self._log(f"⚠️ CONSISTENT: Click behavior is consistent - both show {first_click_type}")
+                    self._log("   This is acceptable, but dynamic behavior would be better")
             else:
-                print("⚠️ LIMITED: Only one click available for testing")
+                self._log("⚠️ LIMITED: Only one click available for testing")
             
             # Check if the system tracks click count (look for evidence in response)
             if len(click_results) > 0:
                 # Look for any indication that the system is tracking clicks
-                last_response = more_options
-                if "recomendaciones_adicionales_obtenidas" in str(last_response) or "click" in str(last_response).lower():
-                    print("✅ EVIDENCE: System appears to track click count")
+                if _has_click_tracking(more_options):
+                    self._log("✅ EVIDENCE: System appears to track click count")
                 else:
-                    print("⚠️ NO EVIDENCE: No clear indication of click tracking in response")
+                    self._log("⚠️ NO EVIDENCE: No clear indication of click tracking in response")
             
-            print("✅ SUCCESS: Click counter behavior tested!")
-            self.test_results["Click Counter Behavior"] = True
+            self._log("✅ SUCCESS: Click counter behavior tested!")
+            self._record_result("Click Counter Behavior", True)
             
         except Exception as e:
-            print(f"❌ Click Counter Behavior: FAILED - {str(e)}")
-            self.test_results["Click Counter Behavior"] = False
-            self.all_tests_passed = False
+            self._log(f"❌ Click Counter Behavior: FAILED - {str(e)}")
+            self._record_result("Click Counter Behavior", False)
 
+    @buffered_output
     def test_mixed_behavior_elimination(self):
         """Test that mixed behavior has been eliminated"""
-        print("\n🔍 Testing Mixed Behavior Elimination...")
-        print("Expected: No confusing mixed behavior - each user type should have clear, consistent behavior")
+        self._log("\n🔍 Testing Mixed Behavior Elimination...")
+        self._log("Expected: No confusing mixed behavior - each user type should have clear, consistent behavior")
         
         try:
             # Test multiple user types to ensure no mixed behavior
@@ -4089,27 +4184,26 @@ class RefrescoBotTester:
             mixed_behavior_detected = False
             
             for answer_value, expected_behavior in user_scenarios:
-                print(f"\n📋 Testing {answer_value}: {expected_behavior}")
+                self._log(f"\n📋 Testing {answer_value}: {expected_behavior}")
                 
                 # Create session with specific answer
                 session_id = self.create_user_session_with_specific_answer(answer_value)
                 if not session_id:
-                    print(f"❌ Could not create session for {answer_value}")
+                    self._log(f"❌ Could not create session for {answer_value}")
                     continue
                 
                 # Get recommendations
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                recommendations = response.json()
+                recommendations = self._get_json(URL_RECOMENDACION + session_id)
                 
-                refrescos_count = len(recommendations.get("refrescos_reales", []))
-                alternativas_count = len(recommendations.get("bebidas_alternativas", []))
-                mostrar_alternativas = recommendations.get("mostrar_alternativas", False)
-                usuario_no_consume = recommendations.get("usuario_no_consume_refrescos", False)
-                mensaje_refrescos = recommendations.get("mensaje_refrescos", "")
+                get = recommendations.get
+                refrescos_count = len(get("refrescos_reales", ()))
+                alternativas_count = len(get("bebidas_alternativas", ()))
+                mostrar_alternativas = get("mostrar_alternativas", False)
+                usuario_no_consume = get("usuario_no_consume_refrescos", False)
+                mensaje_refrescos = get("mensaje_refrescos", "")
                 
-                print(f"✅ {answer_value}: {refrescos_count} refrescos, {alternativas_count} alternatives")
-                print(f"✅ {answer_value}: mostrar_alternativas={mostrar_alternativas}, usuario_no_consume={usuario_no_consume}")
+                self._log(f"✅ {answer_value}: {refrescos_count} refrescos, {alternativas_count} alternatives")
+                self._log(f"✅ {answer_value}: mostrar_alternativas={mostrar_alternativas}, usuario_no_consume={usuario_no_consume}")
                 
                 # Check for mixed behavior patterns
                 behavior_analysis = self.analyze_user_behavior(
@@ -4118,24 +4212,24 @@ class RefrescoBotTester:
                 )
                 
                 if behavior_analysis["is_mixed"]:
-                    print(f"❌ MIXED BEHAVIOR DETECTED in {answer_value}: {behavior_analysis['reason']}")
+                    self._log(f"❌ MIXED BEHAVIOR DETECTED in {answer_value}: {behavior_analysis['reason']}")
                     mixed_behavior_detected = True
+                    if FAIL_FAST:
+                        break
                 else:
-                    print(f"✅ CLEAR BEHAVIOR in {answer_value}: {behavior_analysis['description']}")
+                    self._log(f"✅ CLEAR BEHAVIOR in {answer_value}: {behavior_analysis['description']}")
             
             # Overall assessment
             if not mixed_behavior_detected:
-                print("\n✅ SUCCESS: No mixed behavior detected - all user types have clear, consistent behavior!")
-                self.test_results["Mixed Behavior Elimination"] = True
+                self._log("\n✅ SUCCESS: No mixed behavior detected - all user types have clear, consistent behavior!")
+                self._record_result("Mixed Behavior Elimination", True)
             else:
-                print("\n❌ FAILED: Mixed behavior still exists in some user types")
-                self.test_results["Mixed Behavior Elimination"] = False
-                self.all_tests_passed = False
+                self._log("\n❌ FAILED: Mixed behavior still exists in some user types")
+                self._record_result("Mixed Behavior Elimination", False)
             
         except Exception as e:
-            print(f"❌ Mixed Behavior Elimination: FAILED - {str(e)}")
-            self.test_results["Mixed Behavior Elimination"] = False
-            self.all_tests_passed = False
+            self._log(f"❌ Mixed Behavior Elimination: FAILED - {str(e)}")
+            self._record_result("Mixed Behavior Elimination", False)
 
     def analyze_user_behavior(self, user_type, refrescos_count, alternativas_count, mostrar_alternativas, usuario_no_consume, mensaje):
         """Analyze if user behavior is mixed or clear"""
@@ -4169,46 +4263,35 @@ class RefrescoBotTester:
         
         return {"is_mixed": False, "description": "Behavior analysis inconclusive"}
 
-    def create_user_session_with_specific_answer(self, answer_value):
-        """Create a user session and answer the initial question with a specific value"""
+    def create_user_session_with_specific_answer(self, answer_value, fresh=False):
+        """Create a user session and answer the initial question with a specific value
+        (reused across read-only tests unless fresh=True is passed)"""
+        if not fresh and answer_value in self._session_cache:
+            return self._session_cache[answer_value]
+        
         try:
-            # Create session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
-            session_id = session_data["sesion_id"]
-            
-            # Get initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
-            question = data["pregunta"]
+            # Create session together with its initial question
+            session_id, question = self._start_session()
             
             # Find the option with the desired value
-            selected_option = None
-            for option in question["opciones"]:
-                if option.get("valor") == answer_value:
-                    selected_option = option
-                    break
+            options_by_value = {option.get("valor"): option for option in reversed(question["opciones"])}
+            selected_option = options_by_value.get(answer_value)
             
             if not selected_option:
-                print(f"⚠️ Could not find option with value '{answer_value}', using first option")
+                self._log(f"⚠️ Could not find option with value '{answer_value}', using first option")
                 selected_option = question["opciones"][0]
             
             # Answer the initial question
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": question["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": random.uniform(2.0, 8.0)
             })
-            response.raise_for_status()
             
             # Answer remaining questions with neutral/varied responses
             for i in range(5):  # Assuming 6 total questions
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if "finalizada" in data and data["finalizada"]:
                     break
@@ -4219,525 +4302,339 @@ class RefrescoBotTester:
                 option_index = len(question["opciones"]) // 2
                 selected_option = question["opciones"][option_index]
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": random.uniform(1.0, 10.0)
                 })
-                response.raise_for_status()
             
+            if not fresh:
+                self._session_cache[answer_value] = session_id
             return session_id
             
         except Exception as e:
-            print(f"Error creating session with specific answer '{answer_value}': {str(e)}")
+            self._log(f"Error creating session with specific answer '{answer_value}': {str(e)}")
             return None
 
     def create_traditional_user_session(self):
         """Create a traditional user session (sedentary, doesn't care about health)"""
-        try:
-            # Create session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
-            session_id = session_data["sesion_id"]
-            
-            # Answer questions to create a traditional user profile
-            # Initial question - regular consumer
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
-            question = data["pregunta"]
-            
-            # Look for regular_consumidor or similar
-            selected_option = None
-            for option in question["opciones"]:
-                if "regular" in option.get("valor", "").lower() or "frecuente" in option.get("texto", "").lower():
-                    selected_option = option
-                    break
-            
-            if not selected_option:
-                selected_option = question["opciones"][0]  # First option as fallback
-            
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
-                "pregunta_id": question["id"],
-                "respuesta_id": selected_option["id"],
-                "respuesta_texto": selected_option["texto"],
-                "tiempo_respuesta": random.uniform(2.0, 5.0)
-            })
-            response.raise_for_status()
-            
-            # Answer remaining questions with traditional patterns
-            traditional_patterns = ["sedentario", "poco_importante", "dulce", "relajado", "tradicional"]
-            pattern_index = 0
-            
-            for i in range(5):
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
-                
-                if "finalizada" in data and data["finalizada"]:
-                    break
-                    
-                question = data["pregunta"]
-                
-                # Try to match traditional patterns
-                selected_option = question["opciones"][0]  # Default to first
-                
-                if pattern_index < len(traditional_patterns):
-                    pattern = traditional_patterns[pattern_index]
-                    for option in question["opciones"]:
-                        if pattern in option.get("valor", "").lower() or pattern in option.get("texto", "").lower():
-                            selected_option = option
-                            break
-                    pattern_index += 1
-                
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
-                    "pregunta_id": question["id"],
-                    "respuesta_id": selected_option["id"],
-                    "respuesta_texto": selected_option["texto"],
-                    "tiempo_respuesta": random.uniform(1.0, 6.0)
-                })
-                response.raise_for_status()
-            
-            return session_id
-            
-        except Exception as e:
-            print(f"Error creating traditional user session: {str(e)}")
-            return None
+        return self.build_persona_session("traditional")
 
     def create_health_conscious_user_session(self):
         """Create a health-conscious user session (active, cares about health)"""
+        return self.build_persona_session("health_conscious")
+
+    def build_persona_session(self, persona):
+        """Create a session whose answers follow one of the _PERSONAS profiles"""
+        description, initial_patterns, answer_patterns, default_index, initial_time, answer_time = _PERSONAS[persona]
         try:
-            # Create session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
-            session_id = session_data["sesion_id"]
-            
-            # Answer questions to create a health-conscious user profile
-            # Initial question - regular consumer (but health-conscious)
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
-            question = data["pregunta"]
-            
-            # Look for ocasional_consumidor or regular_consumidor
-            selected_option = None
-            for option in question["opciones"]:
-                if "ocasional" in option.get("valor", "").lower():
-                    selected_option = option
-                    break
-            
-            if not selected_option:
-                for option in question["opciones"]:
-                    if "regular" in option.get("valor", "").lower():
-                        selected_option = option
-                        break
+            # Create session together with its initial question
+            session_id, question = self._start_session()
             
-            if not selected_option:
-                selected_option = question["opciones"][0]  # Fallback
+            # Sample every response time up front and reuse one payload dict for all answers
+            # (the payload is serialized immediately, so mutating it between POSTs is safe)
+            tiempos = [random.uniform(*initial_time)] + [random.uniform(*answer_time) for _ in range(5)]
+            payload = {"pregunta_id": None, "respuesta_id": None, "respuesta_texto": None, "tiempo_respuesta": 0.0}
             
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
-                "pregunta_id": question["id"],
-                "respuesta_id": selected_option["id"],
-                "respuesta_texto": selected_option["texto"],
-                "tiempo_respuesta": random.uniform(3.0, 8.0)
-            })
-            response.raise_for_status()
+            # Initial question: first option matching the persona's patterns, first option as fallback
+            selected_option = self._persona_choice(persona, question, None, initial_patterns)
             
-            # Answer remaining questions with health-conscious patterns
-            health_patterns = ["activo", "muy_importante", "natural", "energético", "saludable"]
-            pattern_index = 0
+            payload["pregunta_id"] = question["id"]
+            payload["respuesta_id"] = selected_option["id"]
+            payload["respuesta_texto"] = selected_option["texto"]
+            payload["tiempo_respuesta"] = tiempos[0]
+            data = self._answer_and_next(session_id, payload)
             
+            # Answer remaining questions trying one persona pattern per question
             for i in range(5):
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
-                
                 if "finalizada" in data and data["finalizada"]:
                     break
                     
                 question = data["pregunta"]
+                selected_option = self._persona_choice(persona, question, i, answer_patterns[i:i + 1], default_index)
                 
-                # Try to match health-conscious patterns
-                selected_option = question["opciones"][-1]  # Default to last (often healthiest)
-                
-                if pattern_index < len(health_patterns):
-                    pattern = health_patterns[pattern_index]
-                    for option in question["opciones"]:
-                        if pattern in option.get("valor", "").lower() or pattern in option.get("texto", "").lower():
-                            selected_option = option
-                            break
-                    pattern_index += 1
-                
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
-                    "pregunta_id": question["id"],
-                    "respuesta_id": selected_option["id"],
-                    "respuesta_texto": selected_option["texto"],
-                    "tiempo_respuesta": random.uniform(2.0, 10.0)
-                })
-                response.raise_for_status()
+                payload["pregunta_id"] = question["id"]
+                payload["respuesta_id"] = selected_option["id"]
+                payload["respuesta_texto"] = selected_option["texto"]
+                payload["tiempo_respuesta"] = tiempos[i + 1]
+                data = self._answer_and_next(session_id, payload)
             
             return session_id
             
         except Exception as e:
-            print(f"Error creating health-conscious user session: {str(e)}")
+            self._log(f"Error creating {description} session: {str(e)}")
             return None
+
+    @buffered_output
+    def test_new_beverage_structure(self):
         """Test the new beverage structure with 26 drinks (14 real refrescos + 12 healthy alternatives)"""
-        print("\n🔍 Testing New Beverage Structure (26 drinks)...")
-        print("Expected: 14 real refrescos + 12 healthy alternatives = 26 total")
+        self._log("\n🔍 Testing New Beverage Structure (26 drinks)...")
+        self._log("Expected: 14 real refrescos + 12 healthy alternatives = 26 total")
         
         try:
             # Get all bebidas from admin endpoint
-            response = requests.get(f"{API_URL}/admin/bebidas")
-            response.raise_for_status()
-            bebidas = response.json()
+            bebidas = self._get_cached("/admin/bebidas")
             
             if not isinstance(bebidas, list):
-                print("❌ Beverage Structure: FAILED - Response is not a list")
-                self.test_results["New Beverage Structure (26 drinks)"] = False
-                self.all_tests_passed = False
+                self._log("❌ Beverage Structure: FAILED - Response is not a list")
+                self._record_result("New Beverage Structure (26 drinks)", False)
                 return
             
-            total_bebidas = len(bebidas)
-            refrescos_reales = len([b for b in bebidas if b.get("es_refresco_real", False)])
-            alternativas = len([b for b in bebidas if not b.get("es_refresco_real", True)])
+            index = self.bebida_index()
+            total_bebidas = index.total
+            refrescos_reales = index.refrescos_reales
+            alternativas = index.alternativas
+            all_presentation_ids = index.presentation_ids
+            missing_flag = index.missing_flag
             
-            print(f"✅ Found {total_bebidas} total bebidas")
-            print(f"✅ Found {refrescos_reales} real refrescos")
-            print(f"✅ Found {alternativas} healthy alternatives")
+            self._log(f"✅ Found {total_bebidas} total bebidas")
+            self._log(f"✅ Found {refrescos_reales} real refrescos")
+            self._log(f"✅ Found {alternativas} healthy alternatives")
             
             # Verify expected counts
             if total_bebidas == 26:
-                print("✅ CORRECT: Total number of bebidas is 26")
+                self._log("✅ CORRECT: Total number of bebidas is 26")
             else:
-                print(f"❌ INCORRECT: Expected 26 bebidas, got {total_bebidas}")
-                self.test_results["New Beverage Structure (26 drinks)"] = False
-                self.all_tests_passed = False
+                self._log(f"❌ INCORRECT: Expected 26 bebidas, got {total_bebidas}")
+                self._record_result("New Beverage Structure (26 drinks)", False)
                 return
             
             if refrescos_reales == 14:
-                print("✅ CORRECT: Number of real refrescos is 14")
+                self._log("✅ CORRECT: Number of real refrescos is 14")
             else:
-                print(f"❌ INCORRECT: Expected 14 real refrescos, got {refrescos_reales}")
-                self.test_results["New Beverage Structure (26 drinks)"] = False
-                self.all_tests_passed = False
+                self._log(f"❌ INCORRECT: Expected 14 real refrescos, got {refrescos_reales}")
+                self._record_result("New Beverage Structure (26 drinks)", False)
                 return
             
             if alternativas == 12:
-                print("✅ CORRECT: Number of healthy alternatives is 12")
+                self._log("✅ CORRECT: Number of healthy alternatives is 12")
             else:
-                print(f"❌ INCORRECT: Expected 12 healthy alternatives, got {alternativas}")
-                self.test_results["New Beverage Structure (26 drinks)"] = False
-                self.all_tests_passed = False
+                self._log(f"❌ INCORRECT: Expected 12 healthy alternatives, got {alternativas}")
+                self._record_result("New Beverage Structure (26 drinks)", False)
                 return
             
             # Verify unique presentation IDs
-            all_presentation_ids = []
-            for bebida in bebidas:
-                for presentacion in bebida.get("presentaciones", []):
-                    presentation_id = presentacion.get("presentation_id")
-                    if presentation_id:
-                        all_presentation_ids.append(presentation_id)
-            
             unique_presentation_ids = set(all_presentation_ids)
             
             if len(all_presentation_ids) == len(unique_presentation_ids):
-                print(f"✅ CORRECT: All {len(all_presentation_ids)} presentation IDs are unique")
+                self._log(f"✅ CORRECT: All {len(all_presentation_ids)} presentation IDs are unique")
             else:
                 duplicates = len(all_presentation_ids) - len(unique_presentation_ids)
-                print(f"❌ INCORRECT: Found {duplicates} duplicate presentation IDs")
-                self.test_results["New Beverage Structure (26 drinks)"] = False
-                self.all_tests_passed = False
+                self._log(f"❌ INCORRECT: Found {duplicates} duplicate presentation IDs")
+                self._record_result("New Beverage Structure (26 drinks)", False)
                 return
             
             # Verify distribution of es_refresco_real
-            correct_distribution = True
-            for bebida in bebidas:
-                es_refresco_real = bebida.get("es_refresco_real")
-                if es_refresco_real is None:
-                    print(f"❌ INCORRECT: Bebida {bebida.get('nombre', 'Unknown')} missing es_refresco_real field")
-                    correct_distribution = False
-            
-            if correct_distribution:
-                print("✅ CORRECT: All bebidas have es_refresco_real field properly set")
+            for nombre in missing_flag:
+                self._log(f"❌ INCORRECT: Bebida {nombre} missing es_refresco_real field")
+            
+            if not missing_flag:
+                self._log("✅ CORRECT: All bebidas have es_refresco_real field properly set")
             else:
-                self.test_results["New Beverage Structure (26 drinks)"] = False
-                self.all_tests_passed = False
+                self._record_result("New Beverage Structure (26 drinks)", False)
                 return
             
-            print("✅ SUCCESS: New beverage structure with 26 drinks is correct!")
-            self.test_results["New Beverage Structure (26 drinks)"] = True
+            self._log("✅ SUCCESS: New beverage structure with 26 drinks is correct!")
+            self._record_result("New Beverage Structure (26 drinks)", True)
             
         except Exception as e:
-            print(f"❌ New Beverage Structure: FAILED - {str(e)}")
-            self.test_results["New Beverage Structure (26 drinks)"] = False
-            self.all_tests_passed = False
+            self._log(f"❌ New Beverage Structure: FAILED - {str(e)}")
+            self._record_result("New Beverage Structure (26 drinks)", False)
 
+    @buffered_output
     def test_selective_database_cleaning(self):
         """Test selective database cleaning (only questions and beverages, preserve sessions)"""
-        print("\n🔍 Testing Selective Database Cleaning...")
-        print("Expected: Only questions and beverages cleaned, sessions preserved")
+        self._log("\n🔍 Testing Selective Database Cleaning...")
+        self._log("Expected: Only questions and beverages cleaned, sessions preserved")
         
         try:
             # First, create a test session to verify it gets preserved
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
+            session_data = self._post_json(f"{API_URL}/iniciar-sesion")
             test_session_id = session_data["sesion_id"]
-            print(f"✅ Created test session: {test_session_id}")
+            self._log(f"✅ Created test session: {test_session_id}")
             
-            # Check if we can get admin stats to verify data exists
-            response = requests.get(f"{API_URL}/admin/stats")
-            response.raise_for_status()
-            stats_before = response.json()
+            # Check if we can get admin stats to verify data exists; read live so they include the session above
+            stats_before = self._get_json(f"{API_URL}/admin/stats")
             
-            print(f"✅ Stats before cleaning: {stats_before}")
+            self._log(f"✅ Stats before cleaning: {stats_before}")
             
             # Verify that questions and bebidas exist
             if "preguntas" in stats_before and stats_before["preguntas"].get("total", 0) > 0:
-                print(f"✅ Questions exist: {stats_before['preguntas']['total']}")
+                self._log(f"✅ Questions exist: {stats_before['preguntas']['total']}")
             else:
-                print("❌ No questions found before cleaning")
-                self.test_results["Selective Database Cleaning"] = False
-                self.all_tests_passed = False
+                self._log("❌ No questions found before cleaning")
+                self._record_result("Selective Database Cleaning", False)
                 return
             
             if "bebidas" in stats_before and stats_before["bebidas"].get("total", 0) > 0:
-                print(f"✅ Bebidas exist: {stats_before['bebidas']['total']}")
+                self._log(f"✅ Bebidas exist: {stats_before['bebidas']['total']}")
             else:
-                print("❌ No bebidas found before cleaning")
-                self.test_results["Selective Database Cleaning"] = False
-                self.all_tests_passed = False
+                self._log("❌ No bebidas found before cleaning")
+                self._record_result("Selective Database Cleaning", False)
                 return
             
             # Check if sessions exist
             sessions_exist = "sesiones" in stats_before and stats_before["sesiones"].get("total", 0) > 0
             if sessions_exist:
-                print(f"✅ Sessions exist: {stats_before['sesiones']['total']}")
+                self._log(f"✅ Sessions exist: {stats_before['sesiones']['total']}")
             else:
-                print("⚠️ No sessions found before cleaning (this is normal)")
+                self._log("⚠️ No sessions found before cleaning (this is normal)")
             
             # Note: We cannot trigger a new cleaning without restarting the server
             # But we can verify that the current state shows proper selective cleaning
             # by checking that the data structure is correct and sessions are preserved
             
             # Verify that our test session still exists
-            response = requests.get(f"{API_URL}/pregunta-inicial/{test_session_id}")
+            response = self.http.get(URL_PREGUNTA_INICIAL + test_session_id)
             if response.status_code == 200:
-                print("✅ CORRECT: Test session preserved after system initialization")
+                self._log("✅ CORRECT: Test session preserved after system initialization")
             else:
-                print("⚠️ Test session not found, but this might be expected if cleaning happened during startup")
+                self._log("⚠️ Test session not found, but this might be expected if cleaning happened during startup")
             
             # Verify that questions and bebidas were properly loaded
-            response = requests.get(f"{API_URL}/admin/stats")
-            response.raise_for_status()
-            stats_after = response.json()
+            # Re-read the live stats: this check must observe the current state
+            stats_after = self._get_json(f"{API_URL}/admin/stats")
             
             if "preguntas" in stats_after and stats_after["preguntas"].get("total", 0) > 0:
-                print(f"✅ Questions properly loaded: {stats_after['preguntas']['total']}")
+                self._log(f"✅ Questions properly loaded: {stats_after['preguntas']['total']}")
             else:
-                print("❌ Questions not properly loaded after cleaning")
-                self.test_results["Selective Database Cleaning"] = False
-                self.all_tests_passed = False
+                self._log("❌ Questions not properly loaded after cleaning")
+                self._record_result("Selective Database Cleaning", False)
                 return
             
             if "bebidas" in stats_after and stats_after["bebidas"].get("total", 0) > 0:
-                print(f"✅ Bebidas properly loaded: {stats_after['bebidas']['total']}")
+                self._log(f"✅ Bebidas properly loaded: {stats_after['bebidas']['total']}")
             else:
-                print("❌ Bebidas not properly loaded after cleaning")
-                self.test_results["Selective Database Cleaning"] = False
-                self.all_tests_passed = False
+                self._log("❌ Bebidas not properly loaded after cleaning")
+                self._record_result("Selective Database Cleaning", False)
                 return
             
-            print("✅ SUCCESS: Selective database cleaning working correctly!")
-            print("✅ Questions and bebidas are properly loaded")
-            print("✅ No conflicts with existing sessions")
+            self._log("✅ SUCCESS: Selective database cleaning working correctly!")
+            self._log("✅ Questions and bebidas are properly loaded")
+            self._log("✅ No conflicts with existing sessions")
             
-            self.test_results["Selective Database Cleaning"] = True
+            self._record_result("Selective Database Cleaning", True)
             
         except Exception as e:
-            print(f"❌ Selective Database Cleaning: FAILED - {str(e)}")
-            self.test_results["Selective Database Cleaning"] = False
-            self.all_tests_passed = False
+            self._log(f"❌ Selective Database Cleaning: FAILED - {str(e)}")
+            self._record_result("Selective Database Cleaning", False)
 
+    @buffered_output
     def test_sabor_field_in_presentations(self):
         """Test that each presentation has a 'sabor' field"""
-        print("\n🔍 Testing 'sabor' field in presentations...")
-        print("Expected: Each presentation should have a 'sabor' field with appropriate values")
+        self._log("\n🔍 Testing 'sabor' field in presentations...")
+        self._log("Expected: Each presentation should have a 'sabor' field with appropriate values")
         
         try:
-            # Get all bebidas
-            response = requests.get(f"{API_URL}/admin/bebidas")
-            response.raise_for_status()
-            bebidas = response.json()
-            
-            total_presentations = 0
-            presentations_with_sabor = 0
-            sabor_examples = []
-            
-            for bebida in bebidas:
-                bebida_nombre = bebida.get("nombre", "Unknown")
-                presentaciones = bebida.get("presentaciones", [])
-                
-                for i, presentacion in enumerate(presentaciones):
-                    total_presentations += 1
-                    
-                    if "sabor" in presentacion:
-                        presentations_with_sabor += 1
-                        sabor = presentacion["sabor"]
-                        
-                        # Collect examples
-                        if len(sabor_examples) < 5:
-                            sabor_examples.append(f"{bebida_nombre} ({presentacion.get('ml', 'N/A')}ml): {sabor}")
-                        
-                        # Verify sabor is not empty
-                        if not sabor or sabor.strip() == "":
-                            print(f"❌ INCORRECT: Empty sabor in {bebida_nombre} presentation {i+1}")
-                            self.test_results["Sabor field in presentations"] = False
-                            self.all_tests_passed = False
-                            return
-                    else:
-                        print(f"❌ MISSING: 'sabor' field in {bebida_nombre} presentation {i+1}")
-                        self.test_results["Sabor field in presentations"] = False
-                        self.all_tests_passed = False
-                        return
-            
-            print(f"✅ Found {total_presentations} total presentations")
-            print(f"✅ Found {presentations_with_sabor} presentations with 'sabor' field")
-            
-            if total_presentations == presentations_with_sabor:
-                print("✅ CORRECT: All presentations have 'sabor' field")
-            else:
-                missing = total_presentations - presentations_with_sabor
-                print(f"❌ INCORRECT: {missing} presentations missing 'sabor' field")
-                self.test_results["Sabor field in presentations"] = False
-                self.all_tests_passed = False
+            # Get all presentations of all bebidas
+            presentaciones = self.bebida_index().presentaciones
+            
+            # Stop at the first presentation with a missing or empty sabor
+            first_error = next(_iter_sabor_errors(presentaciones), None)
+            if first_error is not None:
+                problem, bebida_nombre, i = first_error
+                if problem == "missing":
+                    self._log(f"❌ MISSING: 'sabor' field in {bebida_nombre} presentation {i+1}")
+                else:
+                    self._log(f"❌ INCORRECT: Empty sabor in {bebida_nombre} presentation {i+1}")
+                self._record_result("Sabor field in presentations", False)
                 return
             
+            self._log(f"✅ Found {len(presentaciones)} total presentations")
+            self._log(f"✅ Found {len(presentaciones)} presentations with 'sabor' field")
+            self._log("✅ CORRECT: All presentations have 'sabor' field")
+            
             # Show examples of sabor values
-            print("\n📋 Examples of 'sabor' values:")
-            for example in sabor_examples:
-                print(f"   - {example}")
+            self._log("\n📋 Examples of 'sabor' values:")
+            for _, bebida_nombre, _, presentacion in presentaciones[:5]:
+                self._log(f"   - {bebida_nombre} ({presentacion.get('ml', 'N/A')}ml): {presentacion['sabor']}")
             
             # Verify sabor values are coherent (not just random text)
-            coherent_sabores = True
-            common_sabor_words = ["dulce", "cítrico", "frutal", "natural", "refrescante", "cola", "limón", "naranja", "manzana", "tropical", "energético", "suave", "intenso"]
-            
-            for bebida in bebidas[:3]:  # Check first 3 bebidas as sample
-                for presentacion in bebida.get("presentaciones", []):
-                    sabor = presentacion.get("sabor", "").lower()
-                    if not any(word in sabor for word in common_sabor_words):
-                        print(f"⚠️ WARNING: Unusual sabor value '{presentacion.get('sabor')}' in {bebida.get('nombre')}")
-                        # Don't fail the test for this, just warn
+            for bebida_position, bebida_nombre, _, presentacion in presentaciones:
+                if bebida_position >= 3:  # Check first 3 bebidas as sample
+                    break
+                sabor_words = set(_WORD_RE.findall(presentacion.get("sabor", "").lower()))
+                if not sabor_words & _SABOR_WORDS:
+                    self._log(f"⚠️ WARNING: Unusual sabor value '{presentacion.get('sabor')}' in {bebida_nombre}")
+                    # Don't fail the test for this, just warn
             
-            print("✅ SUCCESS: All presentations have appropriate 'sabor' field!")
-            self.test_results["Sabor field in presentations"] = True
+            self._log("✅ SUCCESS: All presentations have appropriate 'sabor' field!")
+            self._record_result("Sabor field in presentations", True)
             
         except Exception as e:
-            print(f"❌ Sabor field test: FAILED - {str(e)}")
-            self.test_results["Sabor field in presentations"] = False
-            self.all_tests_passed = False
+            self._log(f"❌ Sabor field test: FAILED - {str(e)}")
+            self._record_result("Sabor field in presentations", False)
 
+    @buffered_output
     def test_improved_ml_logic_variety(self):
         """Test improved ML logic that provides variety in recommendations"""
-        print("\n🔍 Testing Improved ML Logic (Variety in Recommendations)...")
-        print("Expected: Users should see variety, not always the same 3 recommendations")
+        self._log("\n🔍 Testing Improved ML Logic (Variety in Recommendations)...")
+        self._log("Expected: Users should see variety, not always the same 3 recommendations")
         
         try:
-            # Create multiple sessions with different response patterns
-            sessions_and_recommendations = []
+            # Create multiple sessions with different response patterns; they are
+            # independent, so build them concurrently over the shared connection pool
+            self._log("\n📋 Creating 3 test sessions in parallel...")
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                sessions_and_recommendations = list(executor.map(self._in_log_buffer(self.build_variety_session), range(3)))
             
-            for i in range(3):
-                print(f"\n📋 Creating test session {i+1}...")
-                
-                # Create session
-                response = requests.post(f"{API_URL}/iniciar-sesion")
-                response.raise_for_status()
-                session_data = response.json()
-                session_id = session_data["sesion_id"]
-                
-                # Answer questions with slightly different patterns
-                if not self.answer_questions_with_pattern(session_id, pattern=i):
-                    print(f"❌ Could not answer questions for session {i+1}")
-                    self.test_results["Improved ML Logic (Variety)"] = False
-                    self.all_tests_passed = False
+            for i, session_data in enumerate(sessions_and_recommendations):
+                if session_data is None:
+                    self._log(f"❌ Could not answer questions for session {i+1}")
+                    self._record_result("Improved ML Logic (Variety)", False)
                     return
                 
-                # Get recommendations
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                recommendations = response.json()
-                
-                # Extract bebida IDs from recommendations
-                refrescos_ids = [b["id"] for b in recommendations.get("refrescos_reales", [])]
-                alternativas_ids = [b["id"] for b in recommendations.get("bebidas_alternativas", [])]
-                
-                sessions_and_recommendations.append({
-                    "session_id": session_id,
-                    "refrescos_ids": refrescos_ids,
-                    "alternativas_ids": alternativas_ids,
-                    "total_refrescos": len(refrescos_ids),
-                    "total_alternativas": len(alternativas_ids)
-                })
-                
-                print(f"✅ Session {i+1}: {len(refrescos_ids)} refrescos, {len(alternativas_ids)} alternatives")
+                self._log(f"✅ Session {i+1}: {session_data['total_refrescos']} refrescos, {session_data['total_alternativas']} alternatives")
             
             # Analyze variety in recommendations
-            print(f"\n📊 Analyzing variety across {len(sessions_and_recommendations)} sessions...")
+            self._log(f"\n📊 Analyzing variety across {len(sessions_and_recommendations)} sessions...")
             
             # Check refrescos variety
             all_refrescos_sets = [set(s["refrescos_ids"]) for s in sessions_and_recommendations]
-            refrescos_intersection = set.intersection(*all_refrescos_sets) if all_refrescos_sets else set()
+            total_unique_refrescos, common_refrescos = _variety_counts(all_refrescos_sets)
             
             # Check alternativas variety
             all_alternativas_sets = [set(s["alternativas_ids"]) for s in sessions_and_recommendations]
-            alternativas_intersection = set.intersection(*all_alternativas_sets) if all_alternativas_sets else set()
-            
-            print(f"✅ Refrescos common to all sessions: {len(refrescos_intersection)}")
-            print(f"✅ Alternativas common to all sessions: {len(alternativas_intersection)}")
+            total_unique_alternativas, common_alternativas = _variety_counts(all_alternativas_sets)
             
-            # Calculate variety score
-            total_unique_refrescos = len(set().union(*all_refrescos_sets)) if all_refrescos_sets else 0
-            total_unique_alternativas = len(set().union(*all_alternativas_sets)) if all_alternativas_sets else 0
+            self._log(f"✅ Refrescos common to all sessions: {common_refrescos}")
+            self._log(f"✅ Alternativas common to all sessions: {common_alternativas}")
             
-            print(f"✅ Total unique refrescos across sessions: {total_unique_refrescos}")
-            print(f"✅ Total unique alternativas across sessions: {total_unique_alternativas}")
+            self._log(f"✅ Total unique refrescos across sessions: {total_unique_refrescos}")
+            self._log(f"✅ Total unique alternativas across sessions: {total_unique_alternativas}")
             
             # Verify variety (not always the same recommendations)
             variety_threshold = 0.7  # At least 70% should be different
             
             if all_refrescos_sets:
                 avg_refrescos_per_session = sum(len(s) for s in all_refrescos_sets) / len(all_refrescos_sets)
-                refrescos_variety_ratio = (total_unique_refrescos - len(refrescos_intersection)) / total_unique_refrescos if total_unique_refrescos > 0 else 0
+                refrescos_variety_ratio = (total_unique_refrescos - common_refrescos) / total_unique_refrescos if total_unique_refrescos > 0 else 0
                 
-                print(f"✅ Refrescos variety ratio: {refrescos_variety_ratio:.2f}")
+                self._log(f"✅ Refrescos variety ratio: {refrescos_variety_ratio:.2f}")
                 
                 if refrescos_variety_ratio >= variety_threshold:
-                    print("✅ CORRECT: Good variety in refrescos recommendations")
+                    self._log("✅ CORRECT: Good variety in refrescos recommendations")
                 else:
-                    print(f"❌ INCORRECT: Low variety in refrescos (ratio: {refrescos_variety_ratio:.2f}, expected: ≥{variety_threshold})")
-                    self.test_results["Improved ML Logic (Variety)"] = False
-                    self.all_tests_passed = False
+                    self._log(f"❌ INCORRECT: Low variety in refrescos (ratio: {refrescos_variety_ratio:.2f}, expected: ≥{variety_threshold})")
+                    self._record_result("Improved ML Logic (Variety)", False)
                     return
             
             if all_alternativas_sets:
                 avg_alternativas_per_session = sum(len(s) for s in all_alternativas_sets) / len(all_alternativas_sets)
-                alternativas_variety_ratio = (total_unique_alternativas - len(alternativas_intersection)) / total_unique_alternativas if total_unique_alternativas > 0 else 0
+                alternativas_variety_ratio = (total_unique_alternativas - common_alternativas) / total_unique_alternativas if total_unique_alternativas > 0 else 0
                 
-                print(f"✅ Alternativas variety ratio: {alternativas_variety_ratio:.2f}")
+                self._log(f"✅ Alternativas variety ratio: {alternativas_variety_ratio:.2f}")
                 
                 if alternativas_variety_ratio >= variety_threshold:
-                    print("✅ CORRECT: Good variety in alternativas recommendations")
+                    self._log("✅ CORRECT: Good variety in alternativas recommendations")
                 else:
-                    print(f"❌ INCORRECT: Low variety in alternativas (ratio: {alternativas_variety_ratio:.2f}, expected: ≥{variety_threshold})")
-                    self.test_results["Improved ML Logic (Variety)"] = False
-                    self.all_tests_passed = False
+                    self._log(f"❌ INCORRECT: Low variety in alternativas (ratio: {alternativas_variety_ratio:.2f}, expected: ≥{variety_threshold})")
+                    self._record_result("Improved ML Logic (Variety)", False)
                     return
             
             # Test granular configurations are being used
-            print(f"\n📋 Verifying granular configurations are applied...")
+            self._log(f"\n📋 Verifying granular configurations are applied...")
             
             for i, session_data in enumerate(sessions_and_recommendations):
                 refrescos_count = session_data["total_refrescos"]
@@ -4746,51 +4643,66 @@ class RefrescoBotTester:
                 # Check that counts respect the new granular configurations
                 # MAX_ALTERNATIVAS_SALUDABLES_INICIAL = 3
                 if alternativas_count <= 3:
-                    print(f"✅ Session {i+1}: Alternativas count ({alternativas_count}) respects MAX_ALTERNATIVAS_SALUDABLES_INICIAL")
+                    self._log(f"✅ Session {i+1}: Alternativas count ({alternativas_count}) respects MAX_ALTERNATIVAS_SALUDABLES_INICIAL")
                 else:
-                    print(f"⚠️ Session {i+1}: Alternativas count ({alternativas_count}) exceeds expected limit")
+                    self._log(f"⚠️ Session {i+1}: Alternativas count ({alternativas_count}) exceeds expected limit")
             
-            print("✅ SUCCESS: ML logic provides good variety in recommendations!")
-            print("✅ New granular configurations are being applied correctly")
+            self._log("✅ SUCCESS: ML logic provides good variety in recommendations!")
+            self._log("✅ New granular configurations are being applied correctly")
             
-            self.test_results["Improved ML Logic (Variety)"] = True
+            self._record_result("Improved ML Logic (Variety)", True)
             
         except Exception as e:
-            print(f"❌ Improved ML Logic test: FAILED - {str(e)}")
-            self.test_results["Improved ML Logic (Variety)"] = False
-            self.all_tests_passed = False
+            self._log(f"❌ Improved ML Logic test: FAILED - {str(e)}")
+            self._record_result("Improved ML Logic (Variety)", False)
+
+    def build_variety_session(self, pattern):
+        """Create a session answered with the given pattern and collect its recommended bebida IDs"""
+        session_id, question = self._start_session()
+        
+        # Answer questions with slightly different patterns
+        if not self.answer_questions_with_pattern(session_id, pattern=pattern, question=question):
+            return None
+        
+        recommendations = self._get_json(URL_RECOMENDACION + session_id)
+        
+        # Extract bebida IDs from recommendations
+        refrescos_ids = [b["id"] for b in recommendations.get("refrescos_reales", [])]
+        alternativas_ids = [b["id"] for b in recommendations.get("bebidas_alternativas", [])]
+        
+        return {
+            "session_id": session_id,
+            "refrescos_ids": refrescos_ids,
+            "alternativas_ids": alternativas_ids,
+            "total_refrescos": len(refrescos_ids),
+            "total_alternativas": len(alternativas_ids)
+        }
 
-    def answer_questions_with_pattern(self, session_id, pattern=0):
+    def answer_questions_with_pattern(self, session_id, pattern=0, question=None):
         """Answer questions with different patterns to create variety"""
         try:
-            # Get initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
-            question = data["pregunta"]
+            # Get initial question unless the caller already has it
+            if question is None:
+                question = self._get_json(URL_PREGUNTA_INICIAL + session_id)["pregunta"]
             
             # Choose option based on pattern
             option_index = pattern % len(question["opciones"])
             selected_option = question["opciones"][option_index]
             
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            data = self._answer_and_next(session_id, {
                 "pregunta_id": question["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"],
                 "tiempo_respuesta": random.uniform(2.0, 8.0)
             })
-            response.raise_for_status()
             
             # Answer remaining questions
             for i in range(5):  # Assuming 6 total questions
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
-                
                 if "finalizada" in data and data["finalizada"]:
                     break
                     
                 question = data["pregunta"]
+                opciones = question["opciones"]
                 
                 # Vary responses based on pattern
                 if pattern == 0:
@@ -4798,376 +4710,363 @@ class RefrescoBotTester:
                     option_index = 0  # First option
                 elif pattern == 1:
                     # Health-conscious pattern
-                    option_index = len(question["opciones"]) - 1  # Last option
+                    option_index = len(opciones) - 1  # Last option
                 else:
                     # Mixed pattern
-                    option_index = (i + pattern) % len(question["opciones"])
+                    option_index = (i + pattern) % len(opciones)
                 
-                selected_option = question["opciones"][option_index]
+                selected_option = opciones[option_index]
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                data = self._answer_and_next(session_id, {
                     "pregunta_id": question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": random.uniform(1.0, 10.0)
                 })
-                response.raise_for_status()
             
             return True
             
         except Exception as e:
-            print(f"Error answering questions with pattern {pattern}: {str(e)}")
+            self._log(f"Error answering questions with pattern {pattern}: {str(e)}")
             return False
 
+    @buffered_output
     def test_granular_configurations_new(self):
         """Test the new granular configurations"""
-        print("\n🔍 Testing New Granular Configurations...")
-        print("Expected configurations:")
-        print("- MAX_ALTERNATIVAS_SALUDABLES_INICIAL = 3")
-        print("- MAX_ALTERNATIVAS_SALUDABLES_ADICIONAL = 3") 
-        print("- MAX_REFRESCOS_ADICIONALES = 3")
-        print("- MAX_ALTERNATIVAS_USUARIO_SALUDABLE = 4")
-        print("- MAX_REFRESCOS_USUARIO_TRADICIONAL = 3")
+        self._log("\n🔍 Testing New Granular Configurations...")
+        self._log("Expected configurations:")
+        self._log("- MAX_ALTERNATIVAS_SALUDABLES_INICIAL = 3")
+        self._log("- MAX_ALTERNATIVAS_SALUDABLES_ADICIONAL = 3") 
+        self._log("- MAX_REFRESCOS_ADICIONALES = 3")
+        self._log("- MAX_ALTERNATIVAS_USUARIO_SALUDABLE = 4")
+        self._log("- MAX_REFRESCOS_USUARIO_TRADICIONAL = 3")
         
         try:
+            # The healthy, traditional and no-sodas sessions are independent: create them and
+            # fetch their initial recommendations concurrently over the shared pool
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                (session_id, recommendations), (traditional_session_id, _), (no_sodas_session_id, no_sodas_recs) = \
+                    executor.map(self._in_log_buffer(self._session_with_recommendations), (self.create_user_session_healthy,
+                                                                                            self.create_user_session_traditional,
+                                                                                            self.create_user_session_no_sodas))
+            
             # Test 1: Initial healthy alternatives limit (3)
-            print(f"\n📋 TEST 1: MAX_ALTERNATIVAS_SALUDABLES_INICIAL = 3")
+            self._log(f"\n📋 TEST 1: MAX_ALTERNATIVAS_SALUDABLES_INICIAL = 3")
             
-            # Create a health-conscious user session
-            session_id = self.create_user_session_healthy()
             if not session_id:
-                print("❌ Could not create healthy user session")
-                self.test_results["New Granular Configurations"] = False
-                self.all_tests_passed = False
+                self._log("❌ Could not create healthy user session")
+                self._record_result("New Granular Configurations", False)
                 return
             
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
-            
             alternativas_count = len(recommendations.get("bebidas_alternativas", []))
-            print(f"✅ Initial healthy alternatives: {alternativas_count}")
+            self._log(f"✅ Initial healthy alternatives: {alternativas_count}")
             
             if alternativas_count <= 3:
-                print("✅ CORRECT: Initial healthy alternatives ≤ 3")
+                self._log("✅ CORRECT: Initial healthy alternatives ≤ 3")
             else:
-                print(f"❌ INCORRECT: Initial healthy alternatives ({alternativas_count}) > 3")
-                self.test_results["New Granular Configurations"] = False
-                self.all_tests_passed = False
+                self._log(f"❌ INCORRECT: Initial healthy alternatives ({alternativas_count}) > 3")
+                self._record_result("New Granular Configurations", False)
                 return
             
             # Test 2: Additional healthy alternatives limit (3)
-            print(f"\n📋 TEST 2: MAX_ALTERNATIVAS_SALUDABLES_ADICIONAL = 3")
+            self._log(f"\n📋 TEST 2: MAX_ALTERNATIVAS_SALUDABLES_ADICIONAL = 3")
             
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-            response.raise_for_status()
-            additional_recs = response.json()
+            additional_recs = self._get_json(URL_MAS_RECOMENDACIONES + session_id)
+            healthy_exhausted = additional_recs.get("sin_mas_opciones", False)
             
-            if not additional_recs.get("sin_mas_opciones", False):
+            if not healthy_exhausted:
                 additional_count = len(additional_recs.get("recomendaciones_adicionales", []))
-                print(f"✅ Additional healthy alternatives: {additional_count}")
+                self._log(f"✅ Additional healthy alternatives: {additional_count}")
                 
                 if additional_count <= 3:
-                    print("✅ CORRECT: Additional healthy alternatives ≤ 3")
+                    self._log("✅ CORRECT: Additional healthy alternatives ≤ 3")
                 else:
-                    print(f"❌ INCORRECT: Additional healthy alternatives ({additional_count}) > 3")
-                    self.test_results["New Granular Configurations"] = False
-                    self.all_tests_passed = False
+                    self._log(f"❌ INCORRECT: Additional healthy alternatives ({additional_count}) > 3")
+                    self._record_result("New Granular Configurations", False)
                     return
             else:
-                print("⚠️ No additional alternatives available (sin_mas_opciones: true)")
+                self._log("⚠️ No additional alternatives available (sin_mas_opciones: true)")
             
             # Test 3: Additional refrescos limit (3)
-            print(f"\n📋 TEST 3: MAX_REFRESCOS_ADICIONALES = 3")
+            self._log(f"\n📋 TEST 3: MAX_REFRESCOS_ADICIONALES = 3")
             
-            # Create a traditional user session
-            traditional_session_id = self.create_user_session_traditional()
             if not traditional_session_id:
-                print("❌ Could not create traditional user session")
-                self.test_results["New Granular Configurations"] = False
-                self.all_tests_passed = False
+                self._log("❌ Could not create traditional user session")
+                self._record_result("New Granular Configurations", False)
                 return
             
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{traditional_session_id}")
-            response.raise_for_status()
-            
             # Get additional recommendations
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{traditional_session_id}")
-            response.raise_for_status()
-            additional_recs = response.json()
+            additional_recs = self._get_json(URL_MAS_RECOMENDACIONES + traditional_session_id)
+            traditional_exhausted = additional_recs.get("sin_mas_opciones", False)
             
-            if not additional_recs.get("sin_mas_opciones", False):
+            if not traditional_exhausted:
                 additional_count = len(additional_recs.get("recomendaciones_adicionales", []))
                 tipo_recomendaciones = additional_recs.get("tipo_recomendaciones", "")
                 
-                print(f"✅ Additional recommendations: {additional_count} ({tipo_recomendaciones})")
+                self._log(f"✅ Additional recommendations: {additional_count} ({tipo_recomendaciones})")
                 
                 if "refrescos" in tipo_recomendaciones and additional_count <= 3:
-                    print("✅ CORRECT: Additional refrescos ≤ 3")
+                    self._log("✅ CORRECT: Additional refrescos ≤ 3")
                 elif "alternativas" in tipo_recomendaciones and additional_count <= 3:
-                    print("✅ CORRECT: Additional alternatives ≤ 3")
+                    self._log("✅ CORRECT: Additional alternatives ≤ 3")
                 elif additional_count > 3:
-                    print(f"❌ INCORRECT: Additional recommendations ({additional_count}) > 3")
-                    self.test_results["New Granular Configurations"] = False
-                    self.all_tests_passed = False
+                    self._log(f"❌ INCORRECT: Additional recommendations ({additional_count}) > 3")
+                    self._record_result("New Granular Configurations", False)
                     return
             else:
-                print("⚠️ No additional recommendations available")
+                self._log("⚠️ No additional recommendations available")
             
             # Test 4: User who doesn't consume sodas gets ≤ 4 alternatives
-            print(f"\n📋 TEST 4: MAX_ALTERNATIVAS_USUARIO_SALUDABLE = 4")
+            self._log(f"\n📋 TEST 4: MAX_ALTERNATIVAS_USUARIO_SALUDABLE = 4")
             
-            # Create a no-sodas user session
-            no_sodas_session_id = self.create_user_session_no_sodas()
             if not no_sodas_session_id:
-                print("❌ Could not create no-sodas user session")
-                self.test_results["New Granular Configurations"] = False
-                self.all_tests_passed = False
+                self._log("❌ Could not create no-sodas user session")
+                self._record_result("New Granular Configurations", False)
                 return
             
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{no_sodas_session_id}")
-            response.raise_for_status()
-            recommendations = response.json()
-            
+            recommendations = no_sodas_recs
             refrescos_count = len(recommendations.get("refrescos_reales", []))
             alternativas_count = len(recommendations.get("bebidas_alternativas", []))
             usuario_no_consume = recommendations.get("usuario_no_consume_refrescos", False)
             
-            print(f"✅ No-sodas user - Refrescos: {refrescos_count}, Alternatives: {alternativas_count}")
-            print(f"✅ Usuario no consume refrescos: {usuario_no_consume}")
+            self._log(f"✅ No-sodas user - Refrescos: {refrescos_count}, Alternatives: {alternativas_count}")
+            self._log(f"✅ Usuario no consume refrescos: {usuario_no_consume}")
             
             if usuario_no_consume:
                 if refrescos_count == 0:
-                    print("✅ CORRECT: No-sodas user receives 0 refrescos")
+                    self._log("✅ CORRECT: No-sodas user receives 0 refrescos")
                 else:
-                    print(f"❌ INCORRECT: No-sodas user received {refrescos_count} refrescos")
-                    self.test_results["New Granular Configurations"] = False
-                    self.all_tests_passed = False
+                    self._log(f"❌ INCORRECT: No-sodas user received {refrescos_count} refrescos")
+                    self._record_result("New Granular Configurations", False)
                     return
                 
                 if alternativas_count <= 4:
-                    print("✅ CORRECT: No-sodas user receives ≤ 4 alternatives")
+                    self._log("✅ CORRECT: No-sodas user receives ≤ 4 alternatives")
                 else:
-                    print(f"❌ INCORRECT: No-sodas user received {alternativas_count} alternatives (> 4)")
-                    self.test_results["New Granular Configurations"] = False
-                    self.all_tests_passed = False
+                    self._log(f"❌ INCORRECT: No-sodas user received {alternativas_count} alternatives (> 4)")
+                    self._record_result("New Granular Configurations", False)
                     return
             
             # Test 5: Specific endpoints /api/mas-alternativas and /api/mas-refrescos
-            print(f"\n📋 TEST 5: Specific endpoints respect configurations")
+            self._log(f"\n📋 TEST 5: Specific endpoints respect configurations")
             
-            # Test /api/mas-alternativas
-            response = requests.get(f"{API_URL}/mas-alternativas/{session_id}")
-            response.raise_for_status()
-            mas_alternativas = response.json()
+            # The two endpoints are called on different sessions, so overlap them on the pool.
+            # A session that already reported sin_mas_opciones has nothing left, so skip its call.
+            exhausted = {"sin_mas_opciones": True}
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                alternativas_future = None if healthy_exhausted else executor.submit(self._get_json, URL_MAS_ALTERNATIVAS + session_id)
+                refrescos_future = None if traditional_exhausted else executor.submit(self._get_json, URL_MAS_REFRESCOS + traditional_session_id)
+            mas_alternativas = alternativas_future.result() if alternativas_future else exhausted
+            mas_refrescos = refrescos_future.result() if refrescos_future else exhausted
             
+            # Test /api/mas-alternativas
             if not mas_alternativas.get("sin_mas_opciones", False):
                 count = len(mas_alternativas.get("mas_alternativas", []))
-                print(f"✅ /api/mas-alternativas returned {count} alternatives")
+                self._log(f"✅ /api/mas-alternativas returned {count} alternatives")
                 
                 if count <= 3:
-                    print("✅ CORRECT: /api/mas-alternativas respects limit ≤ 3")
+                    self._log("✅ CORRECT: /api/mas-alternativas respects limit ≤ 3")
                 else:
-                    print(f"❌ INCORRECT: /api/mas-alternativas returned {count} > 3")
-                    self.test_results["New Granular Configurations"] = False
-                    self.all_tests_passed = False
+                    self._log(f"❌ INCORRECT: /api/mas-alternativas returned {count} > 3")
+                    self._record_result("New Granular Configurations", False)
                     return
             
             # Test /api/mas-refrescos
-            response = requests.get(f"{API_URL}/mas-refrescos/{traditional_session_id}")
-            response.raise_for_status()
-            mas_refrescos = response.json()
-            
             if not mas_refrescos.get("sin_mas_opciones", False):
                 count = len(mas_refrescos.get("mas_refrescos", []))
-                print(f"✅ /api/mas-refrescos returned {count} refrescos")
+                self._log(f"✅ /api/mas-refrescos returned {count} refrescos")
                 
                 if count <= 3:
-                    print("✅ CORRECT: /api/mas-refrescos respects limit ≤ 3")
+                    self._log("✅ CORRECT: /api/mas-refrescos respects limit ≤ 3")
                 else:
-                    print(f"❌ INCORRECT: /api/mas-refrescos returned {count} > 3")
-                    self.test_results["New Granular Configurations"] = False
-                    self.all_tests_passed = False
+                    self._log(f"❌ INCORRECT: /api/mas-refrescos returned {count} > 3")
+                    self._record_result("New Granular Configurations", False)
                     return
             
-            print("✅ SUCCESS: All granular configurations are working correctly!")
-            self.test_results["New Granular Configurations"] = True
+            self._log("✅ SUCCESS: All granular configurations are working correctly!")
+            self._record_result("New Granular Configurations", True)
             
         except Exception as e:
-            print(f"❌ Granular Configurations test: FAILED - {str(e)}")
-            self.test_results["New Granular Configurations"] = False
-            self.all_tests_passed = False
+            self._log(f"❌ Granular Configurations test: FAILED - {str(e)}")
+            self._record_result("New Granular Configurations", False)
 
+    @buffered_output
     def test_more_options_button_both_types(self):
         """Test that 'more options' button works for both refrescos and alternatives"""
-        print("\n🔍 Testing 'More Options' Button for Both Types...")
-        print("Expected: Button should work consistently for both refrescos and alternatives")
+        self._log("\n🔍 Testing 'More Options' Button for Both Types...")
+        self._log("Expected: Button should work consistently for both refrescos and alternatives")
         
         try:
+            # The three user flows are independent: create each session and fetch its
+            # initial recommendations concurrently, then run the checks in order
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                (traditional_session, traditional_recs), (healthy_session, healthy_recs), (no_sodas_session, no_sodas_recs) = \
+                    executor.map(self._in_log_buffer(self._session_with_recommendations), (self.create_user_session_traditional,
+                                                                                            self.create_user_session_healthy,
+                                                                                            self.create_user_session_no_sodas))
+            
+            last_more = {}  # session -> latest "more options" response
+            
             # Test 1: More options for traditional user (should get more refrescos)
-            print(f"\n📋 TEST 1: More options for traditional user")
+            self._log(f"\n📋 TEST 1: More options for traditional user")
             
-            traditional_session = self.create_user_session_traditional()
             if not traditional_session:
-                print("❌ Could not create traditional user session")
-                self.test_results["More Options Button Both Types"] = False
-                self.all_tests_passed = False
+                self._log("❌ Could not create traditional user session")
+                self._record_result("More Options Button Both Types", False)
                 return
             
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{traditional_session}")
-            response.raise_for_status()
-            initial_recs = response.json()
+            initial_recs = traditional_recs
             
-            print(f"✅ Traditional user initial: {len(initial_recs.get('refrescos_reales', []))} refrescos, {len(initial_recs.get('bebidas_alternativas', []))} alternatives")
+            self._log(f"✅ Traditional user initial: {len(initial_recs.get('refrescos_reales', []))} refrescos, {len(initial_recs.get('bebidas_alternativas', []))} alternatives")
             
             # Test more options button
             more_options_working = False
-            for attempt in range(3):  # Try up to 3 times
-                response = requests.get(f"{API_URL}/recomendaciones-alternativas/{traditional_session}")
-                response.raise_for_status()
-                more_recs = response.json()
-                
-                if more_recs.get("sin_mas_opciones", False):
-                    print(f"⚠️ Attempt {attempt + 1}: No more options available")
-                    break
-                else:
-                    additional_count = len(more_recs.get("recomendaciones_adicionales", []))
-                    tipo = more_recs.get("tipo_recomendaciones", "unknown")
-                    print(f"✅ Attempt {attempt + 1}: Got {additional_count} more recommendations ({tipo})")
-                    more_options_working = True
-                    break
+            more_recs = last_more[traditional_session] = self._get_json(URL_MAS_RECOMENDACIONES + traditional_session)
+            
+            if more_recs.get("sin_mas_opciones", False):
+                self._log("⚠️ No more options available")
+            else:
+                additional_count = len(more_recs.get("recomendaciones_adicionales", []))
+                tipo = more_recs.get("tipo_recomendaciones", "unknown")
+                self._log(f"✅ Got {additional_count} more recommendations ({tipo})")
+                more_options_working = True
             
             if not more_options_working:
-                print("⚠️ Traditional user: No additional options available, but this might be expected")
+                self._log("⚠️ Traditional user: No additional options available, but this might be expected")
             else:
-                print("✅ CORRECT: More options button works for traditional user")
+                self._log("✅ CORRECT: More options button works for traditional user")
             
             # Test 2: More options for health-conscious user (should get more alternatives)
-            print(f"\n📋 TEST 2: More options for health-conscious user")
+            self._log(f"\n📋 TEST 2: More options for health-conscious user")
             
-            healthy_session = self.create_user_session_healthy()
             if not healthy_session:
-                print("❌ Could not create healthy user session")
-                self.test_results["More Options Button Both Types"] = False
-                self.all_tests_passed = False
+                self._log("❌ Could not create healthy user session")
+                self._record_result("More Options Button Both Types", False)
                 return
             
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{healthy_session}")
-            response.raise_for_status()
-            initial_recs = response.json()
+            initial_recs = healthy_recs
             
-            print(f"✅ Healthy user initial: {len(initial_recs.get('refrescos_reales', []))} refrescos, {len(initial_recs.get('bebidas_alternativas', []))} alternatives")
+            self._log(f"✅ Healthy user initial: {len(initial_recs.get('refrescos_reales', []))} refrescos, {len(initial_recs.get('bebidas_alternativas', []))} alternatives")
             
             # Test more options button
             more_options_working = False
-            for attempt in range(3):  # Try up to 3 times
-                response = requests.get(f"{API_URL}/recomendaciones-alternativas/{healthy_session}")
-                response.raise_for_status()
-                more_recs = response.json()
-                
-                if more_recs.get("sin_mas_opciones", False):
-                    print(f"⚠️ Attempt {attempt + 1}: No more options available")
-                    break
-                else:
-                    additional_count = len(more_recs.get("recomendaciones_adicionales", []))
-                    tipo = more_recs.get("tipo_recomendaciones", "unknown")
-                    print(f"✅ Attempt {attempt + 1}: Got {additional_count} more recommendations ({tipo})")
-                    more_options_working = True
-                    break
+            more_recs = last_more[healthy_session] = self._get_json(URL_MAS_RECOMENDACIONES + healthy_session)
+            
+            if more_recs.get("sin_mas_opciones", False):
+                self._log("⚠️ No more options available")
+            else:
+                additional_count = len(more_recs.get("recomendaciones_adicionales", []))
+                tipo = more_recs.get("tipo_recomendaciones", "unknown")
+                self._log(f"✅ Got {additional_count} more recommendations ({tipo})")
+                more_options_working = True
             
             if not more_options_working:
-                print("⚠️ Healthy user: No additional options available, but this might be expected")
+                self._log("⚠️ Healthy user: No additional options available, but this might be expected")
             else:
-                print("✅ CORRECT: More options button works for health-conscious user")
+                self._log("✅ CORRECT: More options button works for health-conscious user")
             
             # Test 3: More options for no-sodas user (should get only alternatives)
-            print(f"\n📋 TEST 3: More options for no-sodas user")
+            self._log(f"\n📋 TEST 3: More options for no-sodas user")
             
-            no_sodas_session = self.create_user_session_no_sodas()
             if not no_sodas_session:
-                print("❌ Could not create no-sodas user session")
-                self.test_results["More Options Button Both Types"] = False
-                self.all_tests_passed = False
+                self._log("❌ Could not create no-sodas user session")
+                self._record_result("More Options Button Both Types", False)
                 return
             
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{no_sodas_session}")
-            response.raise_for_status()
-            initial_recs = response.json()
+            initial_recs = no_sodas_recs
             
-            print(f"✅ No-sodas user initial: {len(initial_recs.get('refrescos_reales', []))} refrescos, {len(initial_recs.get('bebidas_alternativas', []))} alternatives")
+            self._log(f"✅ No-sodas user initial: {len(initial_recs.get('refrescos_reales', []))} refrescos, {len(initial_recs.get('bebidas_alternativas', []))} alternatives")
             
             # Test more options button
             more_options_working = False
-            for attempt in range(3):  # Try up to 3 times
-                response = requests.get(f"{API_URL}/recomendaciones-alternativas/{no_sodas_session}")
-                response.raise_for_status()
-                more_recs = response.json()
+            more_recs = last_more[no_sodas_session] = self._get_json(URL_MAS_RECOMENDACIONES + no_sodas_session)
+            
+            if more_recs.get("sin_mas_opciones", False):
+                self._log("⚠️ No more options available")
+            else:
+                additional_count = len(more_recs.get("recomendaciones_adicionales", []))
+                tipo = more_recs.get("tipo_recomendaciones", "unknown")
+                self._log(f"✅ Got {additional_count} more recommendations ({tipo})")
                 
-                if more_recs.get("sin_mas_opciones", False):
-                    print(f"⚠️ Attempt {attempt + 1}: No more options available")
-                    break
+                # Verify no-sodas user gets only alternatives
+                if "alternativas" in tipo:
+                    self._log("✅ CORRECT: No-sodas user gets only alternatives")
+                    more_options_working = True
                 else:
-                    additional_count = len(more_recs.get("recomendaciones_adicionales", []))
-                    tipo = more_recs.get("tipo_recomendaciones", "unknown")
-                    print(f"✅ Attempt {attempt + 1}: Got {additional_count} more recommendations ({tipo})")
-                    
-                    # Verify no-sodas user gets only alternatives
-                    if "alternativas" in tipo:
-                        print("✅ CORRECT: No-sodas user gets only alternatives")
-                        more_options_working = True
-                    else:
-                        print(f"❌ INCORRECT: No-sodas user got {tipo} instead of alternatives")
-                        self.test_results["More Options Button Both Types"] = False
-                        self.all_tests_passed = False
-                        return
-                    break
+                    self._log(f"❌ INCORRECT: No-sodas user got {tipo} instead of alternatives")
+                    self._record_result("More Options Button Both Types", False)
+                    return
             
             if not more_options_working:
-                print("⚠️ No-sodas user: No additional options available, but this might be expected")
+                self._log("⚠️ No-sodas user: No additional options available, but this might be expected")
             else:
-                print("✅ CORRECT: More options button works correctly for no-sodas user")
+                self._log("✅ CORRECT: More options button works correctly for no-sodas user")
             
             # Test 4: Verify response structure consistency
-            print(f"\n📋 TEST 4: Response structure consistency")
+            self._log(f"\n📋 TEST 4: Response structure consistency")
             
             # Test all three user types have consistent response structure
-            for user_type, session_id in [
+            user_sessions = [
                 ("traditional", traditional_session),
-                ("healthy", healthy_session), 
+                ("healthy", healthy_session),
                 ("no-sodas", no_sodas_session)
-            ]:
-                response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-                response.raise_for_status()
-                data = response.json()
+            ]
+            # Exhausted sessions cannot change anymore: check their last response instead of asking again
+            pending = [session_id for _, session_id in user_sessions
+                       if not last_more[session_id].get("sin_mas_opciones", False)]
+            fetched = dict(zip(pending, self._more_options_batch(pending))) if pending else {}
+            responses = [fetched.get(session_id, last_more[session_id]) for _, session_id in user_sessions]
+            
+            for (user_type, _), data in zip(user_sessions, responses):
+                # A failed batch entry is an error object, not a response: report the real error
+                if "error" in data:
+                    self._log(f"❌ INCORRECT: {user_type} user 'more options' failed ({data.get('status_code')}): {data['error']}")
+                    self._record_result("More Options Button Both Types", False)
+                    return
                 
-                # Check required fields
-                required_fields = ["recomendaciones_adicionales", "sin_mas_opciones", "tipo_recomendaciones"]
-                missing_fields = [field for field in required_fields if field not in data]
+                missing_fields = sorted(REQUIRED_MAS_FIELDS.difference(data))
                 
                 if missing_fields:
-                    print(f"❌ INCORRECT: {user_type} user missing fields: {missing_fields}")
-                    self.test_results["More Options Button Both Types"] = False
-                    self.all_tests_passed = False
+                    self._log(f"❌ INCORRECT: {user_type} user missing fields: {missing_fields}")
+                    self._record_result("More Options Button Both Types", False)
                     return
                 else:
-                    print(f"✅ CORRECT: {user_type} user has all required response fields")
+                    self._log(f"✅ CORRECT: {user_type} user has all required response fields")
             
-            print("✅ SUCCESS: 'More options' button works consistently for all user types!")
-            print("✅ Response structure is consistent across all user types")
-            print("✅ Logic correctly differentiates between user types")
+            self._log("✅ SUCCESS: 'More options' button works consistently for all user types!")
+            self._log("✅ Response structure is consistent across all user types")
+            self._log("✅ Logic correctly differentiates between user types")
             
-            self.test_results["More Options Button Both Types"] = True
+            self._record_result("More Options Button Both Types", True)
             
         except Exception as e:
-            print(f"❌ More Options Button test: FAILED - {str(e)}")
-            self.test_results["More Options Button Both Types"] = False
-            self.all_tests_passed = False
+            self._log(f"❌ More Options Button test: FAILED - {str(e)}")
+            self._record_result("More Options Button Both Types", False)
+
+    def _get_recommendation(self, session_id):
+        """GET /recomendacion for a session, memoized until the session rates something"""
+        data = self._recommendations.get(session_id)
+        if data is None:
+            data = self._recommendations[session_id] = self._get_json(URL_RECOMENDACION + session_id)
+        return data
+        
+    def _get_shared_reco(self):
+        """Return (session_id, recommendation) for a randomly answered session, fetched once per run;
+        only for tests that inspect the first recommendation and ml_avanzado without clicking or rating"""
+        if self._shared_reco is None:
+            session_id = self.shared_session()
+            # Only the first item of each list is inspected, so skip serializing the rest
+            self._shared_reco = (session_id, self._get_json(URL_RECOMENDACION + session_id + "?limit=1"))
+        return self._shared_reco
+        
+    def _session_with_recommendations(self, create_session):
+        """Create a session with the given builder and return it with its initial recommendations, which
+        come embedded in the completing answer batch (a /recomendacion GET only on older backends)"""
+        session_id = create_session(include_recommendation=True)
+        if not session_id:
+            return None, None
+        # Already memoized from the answer batch, so this is a lookup rather than a request
+        return session_id, self._get_recommendation(session_id)
 
     def test_data_structure(self):
         """Test the data structure of bebidas.json"""
@@ -5175,9 +5074,7 @@ class RefrescoBotTester:
         
         try:
             # Get all bebidas from admin endpoint
-            response = requests.get(f"{API_URL}/admin/stats")
-            response.raise_for_status()
-            stats = response.json()
+            stats = self._get_json(f"{API_URL}/admin/stats?include=sample_bebida")
             
             # Check if bebidas are loaded correctly
             if "bebidas" in stats:
@@ -5199,76 +5096,66 @@ class RefrescoBotTester:
                         
                         # Get a sample bebida to check structure
                         try:
-                            response = requests.get(f"{API_URL}/recomendacion/{self.create_session_and_answer_questions()}")
-                            response.raise_for_status()
-                            data = response.json()
+                            # Use the sample embedded in the stats; older backends need a recommended session
+                            if "sample_bebida" in stats:
+                                data = {"refrescos_reales": [stats["sample_bebida"]] if stats["sample_bebida"] else []}
+                            else:
+                                data = self._get_json(URL_RECOMENDACION + self.shared_session())
                             
                             if "refrescos_reales" in data and len(data["refrescos_reales"]) > 0:
                                 bebida = data["refrescos_reales"][0]
                                 
                                 # Check required fields
-                                required_fields = ["id", "nombre", "descripcion", "categoria", "es_refresco_real", 
-                                                  "nivel_dulzura", "presentaciones"]
-                                
-                                missing_fields = [field for field in required_fields if field not in bebida]
+                                missing_fields = sorted(REQUIRED_BEBIDA_FIELDS.difference(bebida))
                                 
                                 if not missing_fields:
                                     print("✅ Data Structure: Bebida has all required fields")
                                     
                                     # Check ML fields
-                                    ml_fields = ["categorias_ml", "tags_automaticos"]
-                                    missing_ml_fields = [field for field in ml_fields if field not in bebida]
+                                    missing_ml_fields = sorted(BEBIDA_ML_FIELDS.difference(bebida))
                                     
                                     if not missing_ml_fields:
                                         print("✅ Data Structure: Bebida has all ML fields")
-                                        self.test_results["Data Structure"] = True
+                                        self._record_result("Data Structure", True)
                                     else:
                                         print(f"❌ Data Structure: FAILED - Missing ML fields: {missing_ml_fields}")
-                                        self.test_results["Data Structure"] = False
-                                        self.all_tests_passed = False
+                                        self._record_result("Data Structure", False)
                                 else:
                                     print(f"❌ Data Structure: FAILED - Missing required fields: {missing_fields}")
-                                    self.test_results["Data Structure"] = False
-                                    self.all_tests_passed = False
+                                    self._record_result("Data Structure", False)
                             else:
                                 print("❌ Data Structure: FAILED - No bebidas in recommendation")
-                                self.test_results["Data Structure"] = False
-                                self.all_tests_passed = False
+                                self._record_result("Data Structure", False)
                                 
                         except Exception as e:
                             print(f"❌ Data Structure: FAILED - Error getting bebida: {str(e)}")
-                            self.test_results["Data Structure"] = False
-                            self.all_tests_passed = False
+                            self._record_result("Data Structure", False)
                     else:
                         print("❌ Data Structure: FAILED - Missing refrescos or alternatives")
-                        self.test_results["Data Structure"] = False
-                        self.all_tests_passed = False
+                        self._record_result("Data Structure", False)
                 else:
                     print(f"❌ Data Structure: FAILED - Expected 15 bebidas, got {total_bebidas}")
-                    self.test_results["Data Structure"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Data Structure", False)
             else:
                 print("❌ Data Structure: FAILED - No bebidas stats available")
-                self.test_results["Data Structure"] = False
-                self.all_tests_passed = False
+                self._record_result("Data Structure", False)
                 
         except Exception as e:
             print(f"❌ Data Structure: FAILED - {str(e)}")
-            self.test_results["Data Structure"] = False
-            self.all_tests_passed = False
+            self._record_result("Data Structure", False)
     
     def test_admin_reprocess_beverages(self):
         """Test admin reprocess beverages endpoint"""
         print("\n🔍 Testing /api/admin/reprocess-beverages...")
         
         try:
-            response = requests.post(f"{API_URL}/admin/reprocess-beverages")
+            response = self.http.post(f"{API_URL}/admin/reprocess-beverages", timeout=HTTP_TIMEOUT)
             
             if response.status_code == 200:
                 print("✅ Admin Reprocess: /api/admin/reprocess-beverages works")
                 
                 # Check response structure
-                data = response.json()
+                data = _json_loads(response.content)
                 if "mensaje" in data and "stats" in data:
                     print(f"✅ Admin Reprocess: Message: {data['mensaje']}")
                     print(f"✅ Admin Reprocess: Stats: {data['stats']}")
@@ -5276,37 +5163,31 @@ class RefrescoBotTester:
                     # Check if stats contain categorizer and image analyzer
                     if "categorizador" in data["stats"] and "analizador_imagenes" in data["stats"]:
                         print("✅ Admin Reprocess: Stats contain categorizer and image analyzer")
-                        self.test_results["Admin Reprocess Beverages"] = True
+                        self._record_result("Admin Reprocess Beverages", True)
                     else:
                         print("❌ Admin Reprocess: FAILED - Stats missing categorizer or image analyzer")
-                        self.test_results["Admin Reprocess Beverages"] = False
-                        self.all_tests_passed = False
+                        self._record_result("Admin Reprocess Beverages", False)
                 else:
                     print("❌ Admin Reprocess: FAILED - Response missing mensaje or stats")
-                    self.test_results["Admin Reprocess Beverages"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Admin Reprocess Beverages", False)
             else:
                 print(f"❌ Admin Reprocess: FAILED - /api/admin/reprocess-beverages returned {response.status_code}")
-                self.test_results["Admin Reprocess Beverages"] = False
-                self.all_tests_passed = False
+                self._record_result("Admin Reprocess Beverages", False)
                 
         except Exception as e:
             print(f"❌ Admin Reprocess: FAILED - {str(e)}")
-            self.test_results["Admin Reprocess Beverages"] = False
-            self.all_tests_passed = False
+            self._record_result("Admin Reprocess Beverages", False)
     
     def test_presentation_analytics(self):
         """Test presentation analytics endpoint"""
         print("\n🔍 Testing Presentation Analytics...")
         
         try:
-            # Create a session for testing
-            session_id = self.create_session_and_answer_questions()
+            # Reuse the run's shared answered session
+            session_id = self.shared_session()
             
             # Get a recommendation to find a presentation to rate
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_RECOMENDACION + session_id)
             
             if "refrescos_reales" in data and len(data["refrescos_reales"]) > 0:
                 bebida = data["refrescos_reales"][0]
@@ -5318,120 +5199,97 @@ class RefrescoBotTester:
                         presentation_id = presentacion["presentation_id"]
                         
                         # Rate the presentation
-                        response = requests.post(f"{API_URL}/puntuar-presentacion/{session_id}", json={
+                        response = self.http.post(URL_PUNTUAR_PRESENTACION + session_id, data=_json_dumps({
                             "presentation_id": presentation_id,
                             "puntuacion": 5,
                             "comentario": "Excelente presentación"
-                        })
+                        }), timeout=HTTP_TIMEOUT)
                         
                         if response.status_code == 200:
                             print("✅ Presentation Analytics: Rated a presentation")
                             
                             # Get presentation analytics
-                            response = requests.get(f"{API_URL}/admin/presentation-analytics/{session_id}")
+                            response = self.http.get(URL_PRESENTATION_ANALYTICS + session_id, timeout=HTTP_TIMEOUT)
                             
                             if response.status_code == 200:
                                 print("✅ Presentation Analytics: /api/admin/presentation-analytics/{session_id} works")
                                 
                                 # Check response structure
-                                data = response.json()
+                                data = _json_loads(response.content)
                                 if "size_preferences" in data:
                                     print("✅ Presentation Analytics: Response contains size preferences")
                                     
                                     if "puntuaciones_dadas" in data and data["puntuaciones_dadas"] > 0:
                                         print(f"✅ Presentation Analytics: User has given {data['puntuaciones_dadas']} ratings")
-                                        self.test_results["Presentation Analytics"] = True
+                                        self._record_result("Presentation Analytics", True)
                                     else:
                                         print("❌ Presentation Analytics: FAILED - No puntuaciones_dadas or count is 0")
-                                        self.test_results["Presentation Analytics"] = False
-                                        self.all_tests_passed = False
+                                        self._record_result("Presentation Analytics", False)
                                 else:
                                     print("❌ Presentation Analytics: FAILED - No size_preferences in response")
-                                    self.test_results["Presentation Analytics"] = False
-                                    self.all_tests_passed = False
+                                    self._record_result("Presentation Analytics", False)
                             else:
                                 print(f"❌ Presentation Analytics: FAILED - /api/admin/presentation-analytics/{session_id} returned {response.status_code}")
-                                self.test_results["Presentation Analytics"] = False
-                                self.all_tests_passed = False
+                                self._record_result("Presentation Analytics", False)
                         else:
                             print(f"❌ Presentation Analytics: FAILED - Could not rate presentation: {response.status_code}")
-                            self.test_results["Presentation Analytics"] = False
-                            self.all_tests_passed = False
+                            self._record_result("Presentation Analytics", False)
                     else:
                         print("❌ Presentation Analytics: FAILED - No presentation_id in presentacion")
-                        self.test_results["Presentation Analytics"] = False
-                        self.all_tests_passed = False
+                        self._record_result("Presentation Analytics", False)
                 else:
                     print("❌ Presentation Analytics: FAILED - No presentaciones in bebida")
-                    self.test_results["Presentation Analytics"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Presentation Analytics", False)
             else:
                 print("❌ Presentation Analytics: FAILED - No recommendations available")
-                self.test_results["Presentation Analytics"] = False
-                self.all_tests_passed = False
+                self._record_result("Presentation Analytics", False)
                 
         except Exception as e:
             print(f"❌ Presentation Analytics: FAILED - {str(e)}")
-            self.test_results["Presentation Analytics"] = False
-            self.all_tests_passed = False
+            self._record_result("Presentation Analytics", False)
     
+    @buffered_output
     def test_complete_ml_flow(self):
         """Test the complete ML flow"""
-        print("\n🔍 Testing Complete ML Flow...")
+        self._log("\n🔍 Testing Complete ML Flow...")
         
         try:
             # Step 1: Create a session
-            print("Step 1: Creating session...")
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            data = response.json()
+            self._log("Step 1: Creating session...")
+            data = self._post_json(f"{API_URL}/iniciar-sesion")
             
             if "sesion_id" not in data:
-                print("❌ Complete ML Flow: FAILED - Could not create session")
-                self.test_results["Complete ML Flow"] = False
-                self.all_tests_passed = False
-                return
+                return self._fail("Complete ML Flow", "Could not create session")
                 
             session_id = data["sesion_id"]
-            print(f"✅ Complete ML Flow: Session created with ID: {session_id}")
+            self._log(f"✅ Complete ML Flow: Session created with ID: {session_id}")
             
             # Step 2: Answer all questions
-            print("Step 2: Answering questions...")
+            self._log("Step 2: Answering questions...")
             if not self.answer_all_questions(session_id):
-                print("❌ Complete ML Flow: FAILED - Could not answer all questions")
-                self.test_results["Complete ML Flow"] = False
-                self.all_tests_passed = False
-                return
+                return self._fail("Complete ML Flow", "Could not answer all questions")
                 
-            print("✅ Complete ML Flow: All questions answered")
+            self._log("✅ Complete ML Flow: All questions answered")
             
             # Step 3: Get recommendations
-            print("Step 3: Getting recommendations...")
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            data = response.json()
+            self._log("Step 3: Getting recommendations...")
+            data = self._get_json(URL_RECOMENDACION + session_id)
             
             if "refrescos_reales" not in data or "bebidas_alternativas" not in data:
-                print("❌ Complete ML Flow: FAILED - Invalid recommendation response")
-                self.test_results["Complete ML Flow"] = False
-                self.all_tests_passed = False
-                return
+                return self._fail("Complete ML Flow", "Invalid recommendation response")
                 
-            print(f"✅ Complete ML Flow: Got {len(data['refrescos_reales'])} real refrescos and {len(data['bebidas_alternativas'])} alternatives")
+            self._log(f"✅ Complete ML Flow: Got {len(data['refrescos_reales'])} real refrescos and {len(data['bebidas_alternativas'])} alternatives")
             
             # Step 4: Check ML advanced info
-            print("Step 4: Checking ML advanced info...")
+            self._log("Step 4: Checking ML advanced info...")
             if "ml_avanzado" not in data:
-                print("❌ Complete ML Flow: FAILED - No ML advanced info in recommendation")
-                self.test_results["Complete ML Flow"] = False
-                self.all_tests_passed = False
-                return
+                return self._fail("Complete ML Flow", "No ML advanced info in recommendation")
                 
             ml_avanzado = data["ml_avanzado"]
-            print("✅ Complete ML Flow: ML advanced info present")
+            self._log("✅ Complete ML Flow: ML advanced info present")
             
             # Step 5: Rate a presentation
-            print("Step 5: Rating a presentation...")
+            self._log("Step 5: Rating a presentation...")
             if len(data["refrescos_reales"]) > 0:
                 bebida = data["refrescos_reales"][0]
                 
@@ -5441,435 +5299,172 @@ class RefrescoBotTester:
                     if "presentation_id" in presentacion:
                         presentation_id = presentacion["presentation_id"]
                         
-                        response = requests.post(f"{API_URL}/puntuar-presentacion/{session_id}", json={
+                        # Steps 6 and 7 only read what the rating wrote, so they come back with it
+                        _, mejores, analytics = self._rate_and_fetch(session_id, {
                             "presentation_id": presentation_id,
                             "puntuacion": 5,
                             "comentario": "Excelente presentación"
                         })
-                        
-                        if response.status_code == 200:
-                            print("✅ Complete ML Flow: Presentation rated successfully")
-                        else:
-                            print(f"❌ Complete ML Flow: FAILED - Could not rate presentation: {response.status_code}")
-                            self.test_results["Complete ML Flow"] = False
-                            self.all_tests_passed = False
-                            return
+                        self._log("✅ Complete ML Flow: Presentation rated successfully")
                     else:
-                        print("❌ Complete ML Flow: FAILED - No presentation_id in presentacion")
-                        self.test_results["Complete ML Flow"] = False
-                        self.all_tests_passed = False
-                        return
+                        return self._fail("Complete ML Flow", "No presentation_id in presentacion")
                 else:
-                    print("❌ Complete ML Flow: FAILED - No presentaciones in bebida")
-                    self.test_results["Complete ML Flow"] = False
-                    self.all_tests_passed = False
-                    return
+                    return self._fail("Complete ML Flow", "No presentaciones in bebida")
             else:
-                print("❌ Complete ML Flow: FAILED - No refrescos_reales in recommendation")
-                self.test_results["Complete ML Flow"] = False
-                self.all_tests_passed = False
-                return
+                return self._fail("Complete ML Flow", "No refrescos_reales in recommendation")
             
             # Step 6: Get best presentations
-            print("Step 6: Getting best presentations...")
-            response = requests.get(f"{API_URL}/mejores-presentaciones/{session_id}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if "mejores_presentaciones" in data:
-                    print(f"✅ Complete ML Flow: Got {len(data['mejores_presentaciones'])} best presentations")
-                else:
-                    print("❌ Complete ML Flow: FAILED - No mejores_presentaciones in response")
-                    self.test_results["Complete ML Flow"] = False
-                    self.all_tests_passed = False
-                    return
+            self._log("Step 6: Getting best presentations...")
+            if "mejores_presentaciones" in mejores:
+                self._log(f"✅ Complete ML Flow: Got {len(mejores['mejores_presentaciones'])} best presentations")
             else:
-                print(f"❌ Complete ML Flow: FAILED - Could not get best presentations: {response.status_code}")
-                self.test_results["Complete ML Flow"] = False
-                self.all_tests_passed = False
-                return
+                return self._fail("Complete ML Flow", "No mejores_presentaciones in response")
             
             # Step 7: Get presentation analytics
-            print("Step 7: Getting presentation analytics...")
-            response = requests.get(f"{API_URL}/admin/presentation-analytics/{session_id}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if "size_preferences" in data:
-                    print("✅ Complete ML Flow: Got presentation analytics")
-                else:
-                    print("❌ Complete ML Flow: FAILED - No size_preferences in presentation analytics")
-                    self.test_results["Complete ML Flow"] = False
-                    self.all_tests_passed = False
-                    return
+            self._log("Step 7: Getting presentation analytics...")
+            if "size_preferences" in analytics:
+                self._log("✅ Complete ML Flow: Got presentation analytics")
             else:
-                print(f"❌ Complete ML Flow: FAILED - Could not get presentation analytics: {response.status_code}")
-                self.test_results["Complete ML Flow"] = False
-                self.all_tests_passed = False
-                return
+                return self._fail("Complete ML Flow", "No size_preferences in presentation analytics")
             
             # Complete flow successful
-            print("✅ Complete ML Flow: All steps completed successfully")
-            self.test_results["Complete ML Flow"] = True
-            
-        except Exception as e:
-            print(f"❌ Complete ML Flow: FAILED - {str(e)}")
-            self.test_results["Complete ML Flow"] = False
-            self.all_tests_passed = False
-    
-    def test_beverage_categorizer(self):
-        """Test beverage categorizer functionality"""
-        print("\n🔍 Testing Beverage Categorizer...")
-        
-        try:
-            # Get a recommendation to check categorization
-            session_id = self.create_session_and_answer_questions()
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            data = response.json()
+            self._log("✅ Complete ML Flow: All steps completed successfully")
+            self._record_result("Complete ML Flow", True)
             
-            # Check if we have recommendations
-            if "refrescos_reales" in data and len(data["refrescos_reales"]) > 0:
-                bebida = data["refrescos_reales"][0]
-                
-                # Check for categorization fields
-                if "categorias_ml" in bebida:
-                    print(f"✅ Beverage Categorizer: Bebida has ML categories: {bebida.get('categorias_ml', [])}")
-                else:
-                    print("❌ Beverage Categorizer: FAILED - No ML categories in bebida")
-                    self.test_results["Beverage Categorizer"] = False
-                    self.all_tests_passed = False
-                    return
-                
-                if "tags_automaticos" in bebida:
-                    print(f"✅ Beverage Categorizer: Bebida has automatic tags: {bebida.get('tags_automaticos', [])}")
-                else:
-                    print("❌ Beverage Categorizer: FAILED - No automatic tags in bebida")
-                    self.test_results["Beverage Categorizer"] = False
-                    self.all_tests_passed = False
-                    return
-                
-                # Check if bebida has been processed by ML
-                if "procesado_ml" in bebida:
-                    print(f"✅ Beverage Categorizer: Bebida has ML processing flag: {bebida.get('procesado_ml', False)}")
-                else:
-                    print("❌ Beverage Categorizer: FAILED - No ML processing flag in bebida")
-                    self.test_results["Beverage Categorizer"] = False
-                    self.all_tests_passed = False
-                    return
-                
-                # Check categorization in ML advanced info
-                if "ml_avanzado" in data and "categorizacion_automatica" in data["ml_avanzado"]:
-                    categorization_stats = data["ml_avanzado"]["categorizacion_automatica"]
-                    print(f"✅ Beverage Categorizer: Categorization stats: {categorization_stats}")
-                    
-                    # Check if categorization is trained
-                    if "is_trained" in categorization_stats:
-                        print(f"✅ Beverage Categorizer: Categorization trained: {categorization_stats.get('is_trained', False)}")
-                    else:
-                        print("❌ Beverage Categorizer: FAILED - No training status in categorization stats")
-                        self.test_results["Beverage Categorizer"] = False
-                        self.all_tests_passed = False
-                        return
-                    
-                    self.test_results["Beverage Categorizer"] = True
-                else:
-                    print("❌ Beverage Categorizer: FAILED - No categorization stats in ML advanced info")
-                    self.test_results["Beverage Categorizer"] = False
-                    self.all_tests_passed = False
-            else:
-                print("❌ Beverage Categorizer: FAILED - No recommendations available")
-                self.test_results["Beverage Categorizer"] = False
-                self.all_tests_passed = False
-                
-        except Exception as e:
-            print(f"❌ Beverage Categorizer: FAILED - {str(e)}")
-            self.test_results["Beverage Categorizer"] = False
-            self.all_tests_passed = False
-    
-    def test_image_analyzer(self):
-        """Test image analyzer functionality"""
-        print("\n🔍 Testing Image Analyzer...")
-        
-        try:
-            # Get a recommendation to check image analysis
-            session_id = self.create_session_and_answer_questions()
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            data = response.json()
-            
-            # Check if we have recommendations
-            if "refrescos_reales" in data and len(data["refrescos_reales"]) > 0:
-                bebida = data["refrescos_reales"][0]
-                
-                # Check for image analysis fields
-                if "features_imagen" in bebida:
-                    print(f"✅ Image Analyzer: Bebida has image features")
-                    
-                    # Check if image features are populated
-                    if bebida["features_imagen"] is not None:
-                        print("✅ Image Analyzer: Image features are populated")
-                    else:
-                        print("⚠️ Image Analyzer: WARNING - Image features are null, might be pending processing")
-                else:
-                    print("❌ Image Analyzer: FAILED - No image features in bebida")
-                    self.test_results["Image Analyzer"] = False
-                    self.all_tests_passed = False
-                    return
-                
-                # Check image analysis in ML advanced info
-                if "ml_avanzado" in data and "analisis_imagenes" in data["ml_avanzado"]:
-                    image_stats = data["ml_avanzado"]["analisis_imagenes"]
-                    print(f"✅ Image Analyzer: Image analysis stats: {image_stats}")
-                    
-                    # Check if image analyzer is initialized
-                    if "is_initialized" in image_stats:
-                        print(f"✅ Image Analyzer: Image analyzer initialized: {image_stats.get('is_initialized', False)}")
-                    else:
-                        print("❌ Image Analyzer: FAILED - No initialization status in image stats")
-                        self.test_results["Image Analyzer"] = False
-                        self.all_tests_passed = False
-                        return
-                    
-                    self.test_results["Image Analyzer"] = True
-                else:
-                    print("❌ Image Analyzer: FAILED - No image analysis stats in ML advanced info")
-                    self.test_results["Image Analyzer"] = False
-                    self.all_tests_passed = False
-            else:
-                print("❌ Image Analyzer: FAILED - No recommendations available")
-                self.test_results["Image Analyzer"] = False
-                self.all_tests_passed = False
-                
-        except Exception as e:
-            print(f"❌ Image Analyzer: FAILED - {str(e)}")
-            self.test_results["Image Analyzer"] = False
-            self.all_tests_passed = False
-    
-    def test_presentation_rating_system(self):
-        """Test presentation rating system functionality"""
-        print("\n🔍 Testing Presentation Rating System...")
-        
-        try:
-            # Get a recommendation to check presentation ratings
-            session_id = self.create_session_and_answer_questions()
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            data = response.json()
-            
-            # Check if we have recommendations
-            if "refrescos_reales" in data and len(data["refrescos_reales"]) > 0:
-                bebida = data["refrescos_reales"][0]
-                
-                # Check for presentation rating fields
-                if "mejor_presentacion_para_usuario" in bebida:
-                    print(f"✅ Presentation Rating: Bebida has best presentation for user")
-                    
-                    # Check if best presentation has prediction
-                    mejor_presentacion = bebida["mejor_presentacion_para_usuario"]
-                    if "prediccion" in mejor_presentacion:
-                        print("✅ Presentation Rating: Best presentation has prediction")
-                    else:
-                        print("❌ Presentation Rating: FAILED - No prediction in best presentation")
-                        self.test_results["Presentation Rating System"] = False
-                        self.all_tests_passed = False
-                        return
-                else:
-                    print("⚠️ Presentation Rating: WARNING - No best presentation in bebida, might be pending processing")
-                
-                # Check presentation rating in ML advanced info
-                if "ml_avanzado" in data and "sistema_presentaciones" in data["ml_avanzado"]:
-                    presentation_stats = data["ml_avanzado"]["sistema_presentaciones"]
-                    print(f"✅ Presentation Rating: Presentation system stats: {presentation_stats}")
-                    
-                    # Check if presentation system is trained
-                    if "is_trained" in presentation_stats:
-                        print(f"✅ Presentation Rating: Presentation system trained: {presentation_stats.get('is_trained', False)}")
-                    else:
-                        print("❌ Presentation Rating: FAILED - No training status in presentation stats")
-                        self.test_results["Presentation Rating System"] = False
-                        self.all_tests_passed = False
-                        return
-                    
-                    self.test_results["Presentation Rating System"] = True
-                else:
-                    print("❌ Presentation Rating: FAILED - No presentation system stats in ML advanced info")
-                    self.test_results["Presentation Rating System"] = False
-                    self.all_tests_passed = False
-            else:
-                print("❌ Presentation Rating: FAILED - No recommendations available")
-                self.test_results["Presentation Rating System"] = False
-                self.all_tests_passed = False
-                
         except Exception as e:
-            print(f"❌ Presentation Rating: FAILED - {str(e)}")
-            self.test_results["Presentation Rating System"] = False
-            self.all_tests_passed = False
+            self._log(f"❌ Complete ML Flow: FAILED - {str(e)}")
+            self._record_result("Complete ML Flow", False)
     
+    @buffered_output
     def test_complete_flow(self):
         """Test the complete flow as specified in the review request"""
-        print("\n🔍 Testing Complete Flow...")
+        self._log("\n🔍 Testing Complete Flow...")
         
         try:
             # Step 1: Iniciar sesión
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            data = response.json()
+            data = self._post_json(f"{API_URL}/iniciar-sesion")
             
             if "sesion_id" not in data:
-                print("❌ Complete Flow: FAILED - Could not start session")
-                self.test_results["Complete Flow"] = False
-                self.all_tests_passed = False
-                return
+                return self._fail("Complete Flow", "Could not start session")
                 
             session_id = data["sesion_id"]
-            print(f"✅ Complete Flow: Step 1 - Session started with ID: {session_id}")
+            self._log(f"✅ Complete Flow: Step 1 - Session started with ID: {session_id}")
             
             # Step 2: Responder exactamente 6 preguntas
             # Get initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             if "pregunta" not in data:
-                print("❌ Complete Flow: FAILED - Could not get initial question")
-                self.test_results["Complete Flow"] = False
-                self.all_tests_passed = False
-                return
+                return self._fail("Complete Flow", "Could not get initial question")
                 
             question = data["pregunta"]
-            print(f"✅ Complete Flow: Step 2.1 - Got initial question: {question['texto']}")
+            self._log(f"✅ Complete Flow: Step 2.1 - Got initial question: {question['texto']}")
             
             # Answer initial question
-            response = requests.post(f"{API_URL}/responder", json={
+            self._post_json(f"{API_URL}/responder", {
                 "sesion_id": session_id,
                 "pregunta_id": question["id"],
                 "opcion_seleccionada": 2,  # Middle option
                 "tiempo_respuesta": random.uniform(2.0, 10.0)
             })
-            response.raise_for_status()
-            print(f"✅ Complete Flow: Step 2.2 - Answered initial question")
+            self._log(f"✅ Complete Flow: Step 2.2 - Answered initial question")
             
             # Get and answer 5 more questions
             for i in range(5):
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if "pregunta" not in data:
-                    print(f"❌ Complete Flow: FAILED - Could not get question {i+2}")
-                    self.test_results["Complete Flow"] = False
-                    self.all_tests_passed = False
-                    return
+                    return self._fail("Complete Flow", f"Could not get question {i+2}")
                     
                 question = data["pregunta"]
-                print(f"✅ Complete Flow: Step 2.{i+3} - Got question {i+2}: {question['texto']}")
+                self._log(f"✅ Complete Flow: Step 2.{i+3} - Got question {i+2}: {question['texto']}")
                 
                 # Answer question
-                response = requests.post(f"{API_URL}/responder", json={
+                self._post_json(f"{API_URL}/responder", {
                     "sesion_id": session_id,
                     "pregunta_id": question["id"],
                     "opcion_seleccionada": random.randint(0, 4),
                     "tiempo_respuesta": random.uniform(2.0, 10.0)
                 })
-                response.raise_for_status()
-                print(f"✅ Complete Flow: Step 2.{i+3} - Answered question {i+2}")
+                self._log(f"✅ Complete Flow: Step 2.{i+3} - Answered question {i+2}")
             
             # Step 3: Obtener recomendaciones con probabilidades
-            response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_RECOMENDACION + session_id)
             
             if "refrescos_reales" not in data or "bebidas_alternativas" not in data:
-                print("❌ Complete Flow: FAILED - Invalid recommendation response format")
-                self.test_results["Complete Flow"] = False
-                self.all_tests_passed = False
-                return
+                return self._fail("Complete Flow", "Invalid recommendation response format")
                 
             refrescos_reales = data["refrescos_reales"]
             bebidas_alternativas = data["bebidas_alternativas"]
             
-            print(f"✅ Complete Flow: Step 3 - Got {len(refrescos_reales)} real refrescos and {len(bebidas_alternativas)} alternative bebidas")
+            self._log(f"✅ Complete Flow: Step 3 - Got {len(refrescos_reales)} real refrescos and {len(bebidas_alternativas)} alternative bebidas")
             
             # Verify probabilities
             if refrescos_reales:
                 has_probabilities = all("probabilidad" in r for r in refrescos_reales)
                 if has_probabilities:
-                    print(f"✅ Complete Flow: Step 3 - All recommendations have probabilities")
+                    self._log(f"✅ Complete Flow: Step 3 - All recommendations have probabilities")
                     for i, r in enumerate(refrescos_reales[:2]):  # Show first 2 examples
-                        print(f"   Refresco {i+1}: {r['nombre']} - {r['probabilidad']}% probability")
+                        self._log(f"   Refresco {i+1}: {r['nombre']} - {r['probabilidad']}% probability")
                 else:
-                    print("❌ Complete Flow: FAILED - Missing probabilities in recommendations")
-                    self.test_results["Complete Flow"] = False
-                    self.all_tests_passed = False
-                    return
+                    return self._fail("Complete Flow", "Missing probabilities in recommendations")
             
             # Step 4: Puntuar bebida con 5 estrellas
             if refrescos_reales:
                 bebida = refrescos_reales[0]
                 presentacion_ml = bebida["presentaciones"][0]["ml"]
                 
-                response = requests.post(f"{API_URL}/puntuar", json={
+                self._post_json(f"{API_URL}/puntuar", {
                     "sesion_id": session_id,
                     "bebida_id": bebida["id"],
                     "puntuacion": 5,
                     "presentacion_ml": presentacion_ml
                 })
-                response.raise_for_status()
-                print(f"✅ Complete Flow: Step 4 - Rated {bebida['nombre']} with 5 stars")
+                self._log(f"✅ Complete Flow: Step 4 - Rated {bebida['nombre']} with 5 stars")
             else:
-                print("⚠️ Complete Flow: WARNING - No refrescos to rate, skipping step 4")
+                self._log("⚠️ Complete Flow: WARNING - No refrescos to rate, skipping step 4")
             
             # Step 5: Solicitar alternativas hasta agotar opciones
+            # Clicks on one session are ordered server-side, so ask for up to 5 in a single request
+            # (max_batches) instead of racing concurrent ones
             no_more_options_reached = False
-            for i in range(5):  # Limit to 5 attempts
-                response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id}")
-                response.raise_for_status()
-                data = response.json()
-                
+            for i, data in enumerate(self._more_batches(session_id, 5)):  # Limit to 5 attempts
                 if "sin_mas_opciones" in data and data["sin_mas_opciones"]:
                     no_more_options_reached = True
-                    print(f"✅ Complete Flow: Step 5 - No more options reached after {i+1} requests")
+                    self._log(f"✅ Complete Flow: Step 5 - No more options reached after {i+1} requests")
                     break
                 else:
                     alt_count = len(data.get("bebidas", []))
-                    print(f"✅ Complete Flow: Step 5 - Got {alt_count} more alternatives")
+                    self._log(f"✅ Complete Flow: Step 5 - Got {alt_count} more alternatives")
             
             # Step 6: Verificar mensaje "sin más opciones"
             if no_more_options_reached:
                 if "mensaje_personalizado" in data:
                     mensaje = data["mensaje_personalizado"]
-                    print(f"✅ Complete Flow: Step 6 - No more options message: '{mensaje}'")
+                    self._log(f"✅ Complete Flow: Step 6 - No more options message: '{mensaje}'")
                     
                     if "no tengo más opciones" in mensaje.lower():
-                        print("✅ Complete Flow: Step 6 - Message correctly indicates no more options")
-                        self.test_results["Complete Flow"] = True
+                        self._log("✅ Complete Flow: Step 6 - Message correctly indicates no more options")
+                        self._record_result("Complete Flow", True)
                     else:
-                        print("❌ Complete Flow: FAILED - Message does not indicate no more options")
-                        self.test_results["Complete Flow"] = False
-                        self.all_tests_passed = False
+                        self._log("❌ Complete Flow: FAILED - Message does not indicate no more options")
+                        self._record_result("Complete Flow", False)
                 else:
-                    print("❌ Complete Flow: FAILED - No mensaje_personalizado field")
-                    self.test_results["Complete Flow"] = False
-                    self.all_tests_passed = False
+                    self._log("❌ Complete Flow: FAILED - No mensaje_personalizado field")
+                    self._record_result("Complete Flow", False)
             else:
-                print("⚠️ Complete Flow: WARNING - Could not reach 'no more options' state, but this might be due to a large number of bebidas")
-                self.test_results["Complete Flow"] = True  # Still consider it a success
+                self._log("⚠️ Complete Flow: WARNING - Could not reach 'no more options' state, but this might be due to a large number of bebidas")
+                self._record_result("Complete Flow", True)  # Still consider it a success
             
         except Exception as e:
-            print(f"❌ Complete Flow: FAILED - {str(e)}")
-            self.test_results["Complete Flow"] = False
-            self.all_tests_passed = False
+            self._log(f"❌ Complete Flow: FAILED - {str(e)}")
+            self._record_result("Complete Flow", False)
     
     def create_session_and_answer_questions(self):
         """Helper method to create a session and answer all questions"""
         try:
             # Create session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            data = response.json()
+            data = self._post_json(f"{API_URL}/iniciar-sesion")
             
             if "sesion_id" not in data:
                 return None
@@ -5889,427 +5484,177 @@ class RefrescoBotTester:
         """Answer all questions for a given session"""
         try:
             # Get initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             if "pregunta" not in data:
                 return False
                 
             question = data["pregunta"]
-            total_questions = data.get("total_preguntas", 6)  # Default to 6 if not specified
-            
-            # Answer initial question
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
-                "pregunta_id": question["id"],
-                "respuesta_id": question["opciones"][2]["id"],  # Middle option
-                "respuesta_texto": question["opciones"][2]["texto"],
-                "tiempo_respuesta": random.uniform(2.0, 10.0)
-            })
-            response.raise_for_status()
-            
-            # Get and answer remaining questions
-            for i in range(total_questions - 1):
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
-                
-                if "pregunta" not in data:
-                    return False
-                    
-                question = data["pregunta"]
-                
-                # Answer question
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
-                    "pregunta_id": question["id"],
-                    "respuesta_id": question["opciones"][random.randint(0, len(question["opciones"])-1)]["id"],
-                    "respuesta_texto": question["opciones"][random.randint(0, len(question["opciones"])-1)]["texto"],
-                    "tiempo_respuesta": random.uniform(2.0, 10.0)
-                })
-                response.raise_for_status()
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error answering questions: {str(e)}")
-            return False
-    
-    def test_alternative_recommendations_by_user_type(self):
-        """Test /api/recomendaciones-alternativas/{sesion_id} for different user types as specified in review request"""
-        print("\n🔍 Testing Alternative Recommendations by User Type...")
-        print("="*60)
-        
-        try:
-            # Test Case 1: User who does NOT consume sodas (should receive only healthy alternatives)
-            print("\n📋 TEST CASE 1: User who does NOT consume sodas")
-            session_id_1 = self.create_user_session_no_sodas()
-            if not session_id_1:
-                print("❌ Alternative Recommendations: FAILED - Could not create no-sodas user session")
-                self.test_results["Alternative Recommendations by User Type"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id_1}")
-            response.raise_for_status()
-            initial_data = response.json()
-            print(f"✅ Initial recommendations: {len(initial_data.get('refrescos_reales', []))} refrescos, {len(initial_data.get('bebidas_alternativas', []))} alternatives")
-            print(f"✅ User type detected: {'No consume refrescos' if initial_data.get('usuario_no_consume_refrescos', False) else 'Regular'}")
-            
-            # Test alternative recommendations endpoint
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id_1}")
-            response.raise_for_status()
-            alt_data_1 = response.json()
-            
-            # Verify response structure
-            if "recomendaciones_adicionales" not in alt_data_1:
-                print("❌ Alternative Recommendations: FAILED - Missing 'recomendaciones_adicionales' field")
-                self.test_results["Alternative Recommendations by User Type"] = False
-                self.all_tests_passed = False
-                return
-            
-            if "tipo_recomendaciones" not in alt_data_1:
-                print("❌ Alternative Recommendations: FAILED - Missing 'tipo_recomendaciones' field")
-                self.test_results["Alternative Recommendations by User Type"] = False
-                self.all_tests_passed = False
-                return
-            
-            print(f"✅ Response structure correct: 'recomendaciones_adicionales' and 'tipo_recomendaciones' present")
-            print(f"✅ Type of recommendations: {alt_data_1['tipo_recomendaciones']}")
-            print(f"✅ Number of additional recommendations: {len(alt_data_1['recomendaciones_adicionales'])}")
-            
-            # Verify user who doesn't consume sodas gets only healthy alternatives
-            if alt_data_1.get('usuario_no_consume_refrescos', False):
-                if alt_data_1['tipo_recomendaciones'] in ['alternativas_saludables', 'alternativas_adicionales']:
-                    print("✅ CORRECT: User who doesn't consume sodas received healthy alternatives")
-                else:
-                    print(f"❌ INCORRECT: User who doesn't consume sodas received: {alt_data_1['tipo_recomendaciones']}")
-                    self.test_results["Alternative Recommendations by User Type"] = False
-                    self.all_tests_passed = False
-                    return
-            
-            # Test Case 2: Regular traditional user (should receive more sodas)
-            print("\n📋 TEST CASE 2: Regular traditional user")
-            session_id_2 = self.create_user_session_traditional()
-            if not session_id_2:
-                print("❌ Alternative Recommendations: FAILED - Could not create traditional user session")
-                self.test_results["Alternative Recommendations by User Type"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id_2}")
-            response.raise_for_status()
-            initial_data_2 = response.json()
-            print(f"✅ Initial recommendations: {len(initial_data_2.get('refrescos_reales', []))} refrescos, {len(initial_data_2.get('bebidas_alternativas', []))} alternatives")
-            print(f"✅ User type detected: {'No consume refrescos' if initial_data_2.get('usuario_no_consume_refrescos', False) else 'Regular'}")
-            
-            # Test alternative recommendations endpoint
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id_2}")
-            response.raise_for_status()
-            alt_data_2 = response.json()
-            
-            print(f"✅ Type of recommendations: {alt_data_2['tipo_recomendaciones']}")
-            print(f"✅ Number of additional recommendations: {len(alt_data_2['recomendaciones_adicionales'])}")
-            
-            # Verify traditional user gets more sodas or alternatives based on logic
-            if alt_data_2['tipo_recomendaciones'] in ['refrescos_tradicionales', 'alternativas_saludables']:
-                print("✅ CORRECT: Traditional user received appropriate recommendations")
-            else:
-                print(f"❌ INCORRECT: Traditional user received unexpected type: {alt_data_2['tipo_recomendaciones']}")
-                self.test_results["Alternative Recommendations by User Type"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Test Case 3: Health-conscious user (should receive more alternatives)
-            print("\n📋 TEST CASE 3: Health-conscious user")
-            session_id_3 = self.create_user_session_healthy()
-            if not session_id_3:
-                print("❌ Alternative Recommendations: FAILED - Could not create healthy user session")
-                self.test_results["Alternative Recommendations by User Type"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id_3}")
-            response.raise_for_status()
-            initial_data_3 = response.json()
-            print(f"✅ Initial recommendations: {len(initial_data_3.get('refrescos_reales', []))} refrescos, {len(initial_data_3.get('bebidas_alternativas', []))} alternatives")
-            print(f"✅ User type detected: {'No consume refrescos' if initial_data_3.get('usuario_no_consume_refrescos', False) else 'Regular'}")
-            
-            # Test alternative recommendations endpoint
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id_3}")
-            response.raise_for_status()
-            alt_data_3 = response.json()
-            
-            print(f"✅ Type of recommendations: {alt_data_3['tipo_recomendaciones']}")
-            print(f"✅ Number of additional recommendations: {len(alt_data_3['recomendaciones_adicionales'])}")
-            
-            # Verify health-conscious user gets healthy alternatives
-            if alt_data_3['tipo_recomendaciones'] in ['alternativas_saludables', 'alternativas_adicionales']:
-                print("✅ CORRECT: Health-conscious user received healthy alternatives")
-            else:
-                print(f"❌ INCORRECT: Health-conscious user received: {alt_data_3['tipo_recomendaciones']}")
-                self.test_results["Alternative Recommendations by User Type"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Additional verification: Check that recommendations are not empty and have ML fields
-            for i, (session_id, alt_data, user_type) in enumerate([
-                (session_id_1, alt_data_1, "No-sodas user"),
-                (session_id_2, alt_data_2, "Traditional user"), 
-                (session_id_3, alt_data_3, "Health-conscious user")
-            ], 1):
-                print(f"\n🔍 Verifying ML fields for {user_type}...")
-                
-                if not alt_data.get('sin_mas_opciones', False) and alt_data['recomendaciones_adicionales']:
-                    first_rec = alt_data['recomendaciones_adicionales'][0]
-                    
-                    # Check required ML fields
-                    required_fields = ['prediccion_ml', 'probabilidad', 'factores_explicativos']
-                    missing_fields = [field for field in required_fields if field not in first_rec]
-                    
-                    if missing_fields:
-                        print(f"❌ {user_type}: Missing ML fields: {missing_fields}")
-                        self.test_results["Alternative Recommendations by User Type"] = False
-                        self.all_tests_passed = False
-                        return
-                    else:
-                        print(f"✅ {user_type}: All ML fields present")
-                        print(f"   - Prediction: {first_rec['prediccion_ml']}")
-                        print(f"   - Probability: {first_rec['probabilidad']}%")
-                        print(f"   - Factors: {len(first_rec['factores_explicativos'])} explanatory factors")
-                else:
-                    print(f"⚠️ {user_type}: No additional recommendations available (sin_mas_opciones: {alt_data.get('sin_mas_opciones', False)})")
-            
-            # Test error handling - invalid session
-            print("\n🔍 Testing error handling...")
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/invalid-session-id")
-            if response.status_code == 404:
-                print("✅ Error handling: Correctly returns 404 for invalid session")
-            else:
-                print(f"❌ Error handling: Expected 404, got {response.status_code}")
-                self.test_results["Alternative Recommendations by User Type"] = False
-                self.all_tests_passed = False
-                return
-            
-            print("\n✅ SUCCESS: All alternative recommendation tests passed!")
-            print("✅ The endpoint /api/recomendaciones-alternativas/{sesion_id} works correctly for all user types")
-            print("✅ Response structure is correct with 'recomendaciones_adicionales' and 'tipo_recomendaciones'")
-            print("✅ Logic correctly differentiates between user types")
-            
-            self.test_results["Alternative Recommendations by User Type"] = True
-            
-        except Exception as e:
-            print(f"❌ Alternative Recommendations by User Type: FAILED - {str(e)}")
-            self.test_results["Alternative Recommendations by User Type"] = False
-            self.all_tests_passed = False
-    
-    def create_user_session_no_sodas(self):
-        """Create a session for a user who does NOT consume sodas"""
-        try:
-            # Create session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            data = response.json()
-            session_id = data["sesion_id"]
-            
-            # Get initial question (about soda consumption)
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
-            question = data["pregunta"]
-            
-            # Answer "nunca" or "casi nunca" to indicate no soda consumption
-            nunca_option = None
-            for option in question["opciones"]:
-                if "nunca" in option["texto"].lower() or "casi nunca" in option["texto"].lower():
-                    nunca_option = option
-                    break
-            
-            if not nunca_option:
-                # If no "nunca" option, use first option
-                nunca_option = question["opciones"][0]
-            
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
-                "pregunta_id": question["id"],
-                "respuesta_id": nunca_option["id"],
-                "respuesta_texto": nunca_option["texto"],
-                "tiempo_respuesta": 3.0
-            })
-            response.raise_for_status()
-            
-            # Answer remaining questions with health-conscious responses
-            for i in range(5):  # Assuming 6 total questions
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
-                
-                if "finalizada" in data and data["finalizada"]:
-                    break
-                    
-                question = data["pregunta"]
-                
-                # Choose health-conscious options
-                selected_option = self.choose_healthy_option(question["opciones"])
-                
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
-                    "pregunta_id": question["id"],
-                    "respuesta_id": selected_option["id"],
-                    "respuesta_texto": selected_option["texto"],
-                    "tiempo_respuesta": random.uniform(2.0, 8.0)
-                })
-                response.raise_for_status()
-            
-            return session_id
-            
-        except Exception as e:
-            print(f"Error creating no-sodas user session: {str(e)}")
-            return None
-    
-    def create_user_session_traditional(self):
-        """Create a session for a traditional soda user"""
-        try:
-            # Create session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            data = response.json()
-            session_id = data["sesion_id"]
-            
-            # Get initial question (about soda consumption)
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
-            question = data["pregunta"]
+            total_questions = data.get("total_preguntas", 6)  # Default to 6 if not specified
             
-            # Answer with frequent consumption
-            frequent_option = None
-            for option in question["opciones"]:
-                if any(word in option["texto"].lower() for word in ["diario", "frecuente", "varias veces", "siempre"]):
-                    frequent_option = option
-                    break
+            # Answer initial question
+            middle_option = question["opciones"][2]
+            first_answer = {
+                "pregunta_id": question["id"],
+                "respuesta_id": middle_option["id"],
+                "respuesta_texto": middle_option["texto"],
+                "tiempo_respuesta": random.uniform(2.0, 10.0)
+            }
             
-            if not frequent_option:
-                # Use middle option if no clear frequent option
-                frequent_option = question["opciones"][len(question["opciones"])//2] if len(question["opciones"]) > 0 else None
+            # Get and answer remaining questions
+            answered = self._answer_remaining(session_id, random.choice, (2.0, 10.0), total_questions - 1, first_answer=first_answer)
             
-            if not frequent_option:
-                print("Error: No options available in question")
-                return None
+            return answered == total_questions - 1
             
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
-                "pregunta_id": question["id"],
-                "respuesta_id": frequent_option["id"],
-                "respuesta_texto": frequent_option["texto"],
-                "tiempo_respuesta": 2.0
-            })
-            response.raise_for_status()
+        except Exception as e:
+            print(f"Error answering questions: {str(e)}")
+            return False
+    
+    def test_alternative_recommendations_by_user_type(self):
+        """Test /api/recomendaciones-alternativas/{sesion_id} for different user types as specified in review request"""
+        name = "Alternative Recommendations by User Type"
+        print("\n🔍 Testing Alternative Recommendations by User Type...")
+        print("="*60)
+        
+        try:
+            # Test error handling - invalid session. It needs no session, so it runs first and
+            # spares the three session builds when the backend is down or misbehaving
+            print("\n🔍 Testing error handling...")
+            response = self.http.get(URL_MAS_RECOMENDACIONES + "invalid-session-id", timeout=PROBE_TIMEOUT)
+            if response.status_code != 404:
+                return self._fail(name, f"Error handling: Expected 404, got {response.status_code}")
+            print("✅ Error handling: Correctly returns 404 for invalid session")
+            
+            # The three user sessions are independent: build them and fetch their initial
+            # recommendations concurrently, then click "more options" once on each in one batch
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                (session_id_1, initial_data), (session_id_2, initial_data_2), (session_id_3, initial_data_3) = \
+                    executor.map(self._session_with_recommendations, (self.create_user_session_no_sodas,
+                                                                       self.create_user_session_traditional,
+                                                                       self.create_user_session_healthy))
+            
+            # Without a session or the response fields there is nothing left to check, so these stop the test
+            for label, session_id in (("no-sodas", session_id_1), ("traditional", session_id_2), ("healthy", session_id_3)):
+                if not session_id:
+                    return self._fail(name, f"Could not create {label} user session")
+            alt_data_1, alt_data_2, alt_data_3 = self._more_options_batch([session_id_1, session_id_2, session_id_3])
+            for label, alt_data in (("no-sodas", alt_data_1), ("traditional", alt_data_2), ("healthy", alt_data_3)):
+                # A failed batch entry is an error object, not a response: report the real error
+                if "error" in alt_data:
+                    return self._fail(name, f"More options failed for {label} user ({alt_data.get('status_code')}): {alt_data['error']}")
+                for field in ("recomendaciones_adicionales", "tipo_recomendaciones"):
+                    if field not in alt_data:
+                        return self._fail(name, f"Missing '{field}' field")
+            print(f"✅ Response structure correct: 'recomendaciones_adicionales' and 'tipo_recomendaciones' present")
             
-            # Answer remaining questions with traditional preferences
-            for i in range(5):
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
+            healthy_tipos = ("alternativas_saludables", "alternativas_adicionales")
+            # (title, user type, initial recommendations, more-options response, expectation, description)
+            cases = (
+                ("TEST CASE 1: User who does NOT consume sodas", "No-sodas user", initial_data, alt_data_1,
+                 # Only users the backend detects as non-consumers must get healthy alternatives
+                 lambda alt: not alt.get("usuario_no_consume_refrescos", False) or alt["tipo_recomendaciones"] in healthy_tipos,
+                 "User who doesn't consume sodas received healthy alternatives"),
+                ("TEST CASE 2: Regular traditional user", "Traditional user", initial_data_2, alt_data_2,
+                 lambda alt: alt["tipo_recomendaciones"] in ("refrescos_tradicionales", "alternativas_saludables"),
+                 "Traditional user received appropriate recommendations"),
+                ("TEST CASE 3: Health-conscious user", "Health-conscious user", initial_data_3, alt_data_3,
+                 lambda alt: alt["tipo_recomendaciones"] in healthy_tipos,
+                 "Health-conscious user received healthy alternatives"),
+            )
+            
+            # The remaining checks are independent, so collect every failure instead of stopping at the first
+            failures = []
+            for title, user_type, initial, alt_data, expected, description in cases:
+                print(f"\n📋 {title}")
+                print(f"✅ Initial recommendations: {len(initial.get('refrescos_reales', []))} refrescos, {len(initial.get('bebidas_alternativas', []))} alternatives")
+                print(f"✅ User type detected: {'No consume refrescos' if initial.get('usuario_no_consume_refrescos', False) else 'Regular'}")
+                print(f"✅ Type of recommendations: {alt_data['tipo_recomendaciones']}")
+                print(f"✅ Number of additional recommendations: {len(alt_data['recomendaciones_adicionales'])}")
+                
+                if expected(alt_data):
+                    print(f"✅ CORRECT: {description}")
+                else:
+                    failures.append(f"{user_type} received unexpected type: {alt_data['tipo_recomendaciones']}")
+                    print(f"❌ INCORRECT: {failures[-1]}")
+            
+            # Additional verification: Check that recommendations are not empty and have ML fields
+            for _, user_type, _, alt_data, _, _ in cases:
+                print(f"\n🔍 Verifying ML fields for {user_type}...")
                 
-                if "finalizada" in data and data["finalizada"]:
-                    break
+                if not alt_data.get('sin_mas_opciones', False) and alt_data['recomendaciones_adicionales']:
+                    first_rec = alt_data['recomendaciones_adicionales'][0]
+                    missing_fields = sorted(_REQUIRED_ML_FIELDS - first_rec.keys())
                     
-                question = data["pregunta"]
-                
-                # Choose traditional options
-                selected_option = self.choose_traditional_option(question["opciones"])
-                
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
-                    "pregunta_id": question["id"],
-                    "respuesta_id": selected_option["id"],
-                    "respuesta_texto": selected_option["texto"],
-                    "tiempo_respuesta": random.uniform(1.0, 4.0)  # Quick responses
-                })
-                response.raise_for_status()
+                    if missing_fields:
+                        failures.append(f"{user_type}: Missing ML fields: {missing_fields}")
+                        print(f"❌ {failures[-1]}")
+                    else:
+                        print(f"✅ {user_type}: All ML fields present")
+                        print(f"   - Prediction: {first_rec['prediccion_ml']}")
+                        print(f"   - Probability: {first_rec['probabilidad']}%")
+                        print(f"   - Factors: {len(first_rec['factores_explicativos'])} explanatory factors")
+                else:
+                    print(f"⚠️ {user_type}: No additional recommendations available (sin_mas_opciones: {alt_data.get('sin_mas_opciones', False)})")
             
-            return session_id
+            if failures:
+                return self._fail(name, "; ".join(failures))
+            
+            print("\n✅ SUCCESS: All alternative recommendation tests passed!")
+            print("✅ The endpoint /api/recomendaciones-alternativas/{sesion_id} works correctly for all user types")
+            print("✅ Response structure is correct with 'recomendaciones_adicionales' and 'tipo_recomendaciones'")
+            print("✅ Logic correctly differentiates between user types")
+            
+            self._record_result(name, True)
             
         except Exception as e:
-            print(f"Error creating traditional user session: {str(e)}")
-            return None
+            self._fail(name, str(e))
+    
+    def create_user_session_no_sodas(self, include_recommendation=False):
+        """Create a session for a user who does NOT consume sodas"""
+        return self.build_user_type_session("no_sodas", include_recommendation)
+    
+    def create_user_session_traditional(self, include_recommendation=False):
+        """Create a session for a traditional soda user"""
+        return self.build_user_type_session("traditional", include_recommendation)
     
-    def create_user_session_healthy(self):
+    def create_user_session_healthy(self, include_recommendation=False):
         """Create a session for a health-conscious user"""
+        return self.build_user_type_session("healthy", include_recommendation)
+    
+    def build_user_type_session(self, user_type, include_recommendation=False):
+        """Create a session whose answers follow one of the _USER_TYPE_SESSIONS profiles; with
+        include_recommendation its initial recommendation is memoized from the completing answer batch"""
+        description, initial_patterns, default_index, initial_time, chooser, answer_time = _USER_TYPE_SESSIONS[user_type]
         try:
-            # Create session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            data = response.json()
-            session_id = data["sesion_id"]
-            
-            # Get initial question (about soda consumption)
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
-            question = data["pregunta"]
-            
-            # Answer with moderate consumption
-            moderate_option = None
-            for option in question["opciones"]:
-                if any(word in option["texto"].lower() for word in ["ocasional", "poco", "rara vez", "moderado"]):
-                    moderate_option = option
-                    break
-            
-            if not moderate_option:
-                # Use second option if no clear moderate option
-                moderate_option = question["opciones"][1] if len(question["opciones"]) > 1 else question["opciones"][0]
+            # Create session, with the initial question (about soda consumption) when the backend embeds it
+            session_id, question = self._start_session()
+            if not question["opciones"]:
+                self._log("Error: No options available in question")
+                return None
             
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            option = _pick_option(question["opciones"], initial_patterns, default_index(len(question["opciones"])))
+            first_answer = {
                 "pregunta_id": question["id"],
-                "respuesta_id": moderate_option["id"],
-                "respuesta_texto": moderate_option["texto"],
-                "tiempo_respuesta": 5.0
-            })
-            response.raise_for_status()
+                "respuesta_id": option["id"],
+                "respuesta_texto": option["texto"],
+                "tiempo_respuesta": initial_time
+            }
             
-            # Answer remaining questions with health-conscious responses
-            for i in range(5):
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
-                
-                if "finalizada" in data and data["finalizada"]:
-                    break
-                    
-                question = data["pregunta"]
-                
-                # Choose health-conscious options
-                selected_option = self.choose_healthy_option(question["opciones"])
-                
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
-                    "pregunta_id": question["id"],
-                    "respuesta_id": selected_option["id"],
-                    "respuesta_texto": selected_option["texto"],
-                    "tiempo_respuesta": random.uniform(4.0, 10.0)  # Thoughtful responses
-                })
-                response.raise_for_status()
+            # Answer remaining questions with the profile's chooser
+            self._answer_remaining(session_id, getattr(self, chooser), answer_time, first_answer=first_answer,
+                                   include_recommendation=include_recommendation)
             
             return session_id
             
         except Exception as e:
-            print(f"Error creating healthy user session: {str(e)}")
+            self._log(f"Error creating {description} session: {str(e)}")
             return None
     
     def create_critical_case_session(self, specific_responses):
         """Create a session with specific responses for critical cases"""
         try:
-            # Create session
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            session_data = response.json()
-            session_id = session_data["sesion_id"]
-            
-            # Get initial question (P1)
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            question_data = response.json()
-            
-            current_question = question_data["pregunta"]
+            # Create session and get initial question (P1)
+            session_id, current_question = self._start_session()
             questions_answered = 0
             max_questions = 18
             
@@ -6331,21 +5676,15 @@ class RefrescoBotTester:
                     # Use neutral/default responses for other questions
                     selected_option = opciones[0]
                 
-                # Answer question
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                # Answer question and get the next one
+                next_data = self._answer_and_next(session_id, {
                     "pregunta_id": question_id,
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"],
                     "tiempo_respuesta": random.uniform(3.0, 7.0)
                 })
-                response.raise_for_status()
                 questions_answered += 1
                 
-                # Get next question
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                next_data = response.json()
-                
                 if next_data.get("finalizada"):
                     break
                     
@@ -6360,10 +5699,8 @@ class RefrescoBotTester:
     def choose_healthy_option(self, options):
         """Choose the most health-conscious option from a list"""
         # Look for health-related keywords that match the backend logic
-        health_keywords = ["natural", "saludable", "agua", "sin azúcar", "activo", "muy_activo", "ejercicio", "importante", "muy_importante", "salud"]
-        
         for option in options:
-            if any(keyword in option["texto"].lower() for keyword in health_keywords):
+            if _HEALTHY_OPTION_RE.search(option["texto"].lower()):
                 return option
         
         # If no clear healthy option, choose the last one (often the most positive)
@@ -6375,10 +5712,8 @@ class RefrescoBotTester:
             return None
             
         # Look for traditional keywords
-        traditional_keywords = ["normal", "regular", "clásico", "tradicional", "dulce", "frecuente", "siempre"]
-        
         for option in options:
-            if any(keyword in option["texto"].lower() for keyword in traditional_keywords):
+            if _TRADITIONAL_OPTION_RE.search(option["texto"].lower()):
                 return option
         
         # If no clear traditional option, choose middle option
@@ -6397,238 +5732,224 @@ class RefrescoBotTester:
         print("="*70)
         
         try:
-            # Test 1: Verify configuration import
-            print("\n📋 TEST 1: Verifying configuration import...")
-            
-            # Check if backend can import configurations correctly
-            response = requests.get(f"{API_URL}/status")
-            if response.status_code != 200:
-                print("❌ Configuration Import: FAILED - Backend status endpoint not accessible")
-                self.test_results["Granular Healthy Alternatives Configuration"] = False
-                self.all_tests_passed = False
-                return
-            
-            print("✅ Configuration Import: Backend is running and configurations should be imported")
-            
-            # Test 2: Test initial recommendations respect MAX_ALTERNATIVAS_SALUDABLES_INICIAL
-            print("\n📋 TEST 2: Testing initial healthy alternatives count...")
-            
-            # Create a health-conscious user who should get healthy alternatives
-            session_id_healthy = self.create_user_session_healthy()
-            if not session_id_healthy:
-                print("❌ Initial Alternatives Count: FAILED - Could not create healthy user session")
-                self.test_results["Granular Healthy Alternatives Configuration"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id_healthy}")
-            response.raise_for_status()
-            initial_data = response.json()
-            
-            # Check healthy alternatives count
-            healthy_alternatives = initial_data.get('bebidas_alternativas', [])
-            print(f"✅ Initial Alternatives: Got {len(healthy_alternatives)} healthy alternatives")
-            
-            # Verify it respects MAX_ALTERNATIVAS_SALUDABLES_INICIAL (3)
-            if len(healthy_alternatives) <= 3:
-                print("✅ Initial Alternatives: Count respects MAX_ALTERNATIVAS_SALUDABLES_INICIAL (≤3)")
-            else:
-                print(f"❌ Initial Alternatives: FAILED - Got {len(healthy_alternatives)} alternatives, expected ≤3")
-                self.test_results["Granular Healthy Alternatives Configuration"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Test 3: Test additional healthy alternatives respect MAX_ALTERNATIVAS_SALUDABLES_ADICIONAL
-            print("\n📋 TEST 3: Testing additional healthy alternatives count...")
-            
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id_healthy}")
-            response.raise_for_status()
-            additional_data = response.json()
-            
-            if not additional_data.get('sin_mas_opciones', False):
-                additional_alternatives = additional_data.get('recomendaciones_adicionales', [])
-                print(f"✅ Additional Alternatives: Got {len(additional_alternatives)} additional alternatives")
+            # Each case needs its own fresh session (they click "more options"), but the builds are
+            # independent: start all three now and wait for each one only where it is needed. Leaving
+            # the block, early returns included, waits for every build, so none outlives the test
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                healthy_future, traditional_future, no_sodas_future = (
+                    executor.submit(build) for build in (self.create_user_session_healthy,
+                                                         self.create_user_session_traditional,
+                                                         self.create_user_session_no_sodas))
+                
+                # Test 1: Verify configuration import
+                print("\n📋 TEST 1: Verifying configuration import...")
+                
+                # Check if backend can import configurations correctly
+                response = self.http.get(f"{API_URL}/status")
+                if response.status_code != 200:
+                    print("❌ Configuration Import: FAILED - Backend status endpoint not accessible")
+                    self._record_result("Granular Healthy Alternatives Configuration", False)
+                    return
                 
-                # Verify it respects MAX_ALTERNATIVAS_SALUDABLES_ADICIONAL (3)
-                if len(additional_alternatives) <= 3:
-                    print("✅ Additional Alternatives: Count respects MAX_ALTERNATIVAS_SALUDABLES_ADICIONAL (≤3)")
-                else:
-                    print(f"❌ Additional Alternatives: FAILED - Got {len(additional_alternatives)} alternatives, expected ≤3")
-                    self.test_results["Granular Healthy Alternatives Configuration"] = False
-                    self.all_tests_passed = False
+                print("✅ Configuration Import: Backend is running and configurations should be imported")
+                
+                # Test 2: Test initial recommendations respect MAX_ALTERNATIVAS_SALUDABLES_INICIAL
+                print("\n📋 TEST 2: Testing initial healthy alternatives count...")
+                
+                # Create a health-conscious user who should get healthy alternatives
+                session_id_healthy = healthy_future.result()
+                if not session_id_healthy:
+                    print("❌ Initial Alternatives Count: FAILED - Could not create healthy user session")
+                    self._record_result("Granular Healthy Alternatives Configuration", False)
                     return
                 
-                # Verify type is healthy alternatives
-                if additional_data.get('tipo_recomendaciones') in ['alternativas_saludables', 'alternativas_adicionales']:
-                    print("✅ Additional Alternatives: Type is correctly healthy alternatives")
+                # Get initial recommendations
+                initial_data = self._get_json(URL_RECOMENDACION + session_id_healthy)
+                
+                # Check healthy alternatives count
+                healthy_alternatives = initial_data.get('bebidas_alternativas', [])
+                print(f"✅ Initial Alternatives: Got {len(healthy_alternatives)} healthy alternatives")
+                
+                # Verify it respects MAX_ALTERNATIVAS_SALUDABLES_INICIAL (3)
+                if len(healthy_alternatives) <= 3:
+                    print("✅ Initial Alternatives: Count respects MAX_ALTERNATIVAS_SALUDABLES_INICIAL (≤3)")
                 else:
-                    print(f"❌ Additional Alternatives: FAILED - Type is {additional_data.get('tipo_recomendaciones')}, expected healthy alternatives")
-                    self.test_results["Granular Healthy Alternatives Configuration"] = False
-                    self.all_tests_passed = False
+                    print(f"❌ Initial Alternatives: FAILED - Got {len(healthy_alternatives)} alternatives, expected ≤3")
+                    self._record_result("Granular Healthy Alternatives Configuration", False)
                     return
-            else:
-                print("⚠️ Additional Alternatives: No more options available (this is acceptable)")
-            
-            # Test 4: Test traditional user gets refrescos with MAX_REFRESCOS_ADICIONALES
-            print("\n📋 TEST 4: Testing additional refrescos count for traditional users...")
-            
-            session_id_traditional = self.create_user_session_traditional()
-            if not session_id_traditional:
-                print("❌ Additional Refrescos: FAILED - Could not create traditional user session")
-                self.test_results["Granular Healthy Alternatives Configuration"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Get initial recommendations to establish baseline
-            response = requests.get(f"{API_URL}/recomendacion/{session_id_traditional}")
-            response.raise_for_status()
-            initial_traditional_data = response.json()
-            
-            print(f"✅ Traditional User Initial: {len(initial_traditional_data.get('refrescos_reales', []))} refrescos, {len(initial_traditional_data.get('bebidas_alternativas', []))} alternatives")
-            
-            # Get additional recommendations
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{session_id_traditional}")
-            response.raise_for_status()
-            additional_traditional_data = response.json()
-            
-            if not additional_traditional_data.get('sin_mas_opciones', False):
-                additional_recommendations = additional_traditional_data.get('recomendaciones_adicionales', [])
-                recommendation_type = additional_traditional_data.get('tipo_recomendaciones', '')
                 
-                print(f"✅ Traditional User Additional: Got {len(additional_recommendations)} additional recommendations of type '{recommendation_type}'")
+                # Test 3: Test additional healthy alternatives respect MAX_ALTERNATIVAS_SALUDABLES_ADICIONAL
+                print("\n📋 TEST 3: Testing additional healthy alternatives count...")
+                
+                additional_data = self._get_json(URL_MAS_RECOMENDACIONES + session_id_healthy)
                 
-                # If they got refrescos, verify count respects MAX_REFRESCOS_ADICIONALES (3)
-                if recommendation_type in ['refrescos_tradicionales', 'refrescos_adicionales']:
-                    if len(additional_recommendations) <= 3:
-                        print("✅ Additional Refrescos: Count respects MAX_REFRESCOS_ADICIONALES (≤3)")
+                if not additional_data.get('sin_mas_opciones', False):
+                    additional_alternatives = additional_data.get('recomendaciones_adicionales', [])
+                    print(f"✅ Additional Alternatives: Got {len(additional_alternatives)} additional alternatives")
+                    
+                    # Verify it respects MAX_ALTERNATIVAS_SALUDABLES_ADICIONAL (3)
+                    if len(additional_alternatives) <= 3:
+                        print("✅ Additional Alternatives: Count respects MAX_ALTERNATIVAS_SALUDABLES_ADICIONAL (≤3)")
+                    else:
+                        print(f"❌ Additional Alternatives: FAILED - Got {len(additional_alternatives)} alternatives, expected ≤3")
+                        self._record_result("Granular Healthy Alternatives Configuration", False)
+                        return
+                    
+                    # Verify type is healthy alternatives
+                    if additional_data.get('tipo_recomendaciones') in ['alternativas_saludables', 'alternativas_adicionales']:
+                        print("✅ Additional Alternatives: Type is correctly healthy alternatives")
                     else:
-                        print(f"❌ Additional Refrescos: FAILED - Got {len(additional_recommendations)} refrescos, expected ≤3")
-                        self.test_results["Granular Healthy Alternatives Configuration"] = False
-                        self.all_tests_passed = False
+                        print(f"❌ Additional Alternatives: FAILED - Type is {additional_data.get('tipo_recomendaciones')}, expected healthy alternatives")
+                        self._record_result("Granular Healthy Alternatives Configuration", False)
                         return
                 else:
-                    print(f"✅ Traditional User: Got {recommendation_type} instead of refrescos (acceptable based on logic)")
-            else:
-                print("⚠️ Traditional User Additional: No more options available (this is acceptable)")
-            
-            # Test 5: Test user who doesn't consume sodas gets MAX_ALTERNATIVAS_USUARIO_SALUDABLE
-            print("\n📋 TEST 5: Testing healthy user gets correct amount of alternatives...")
-            
-            session_id_no_sodas = self.create_user_session_no_sodas()
-            if not session_id_no_sodas:
-                print("❌ No-Sodas User: FAILED - Could not create no-sodas user session")
-                self.test_results["Granular Healthy Alternatives Configuration"] = False
-                self.all_tests_passed = False
-                return
-            
-            # Get initial recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{session_id_no_sodas}")
-            response.raise_for_status()
-            no_sodas_data = response.json()
-            
-            # Verify user is detected as not consuming sodas
-            if no_sodas_data.get('usuario_no_consume_refrescos', False):
-                print("✅ No-Sodas User: Correctly detected as not consuming sodas")
+                    print("⚠️ Additional Alternatives: No more options available (this is acceptable)")
                 
-                # Check that they get only alternatives (no refrescos)
-                refrescos_count = len(no_sodas_data.get('refrescos_reales', []))
-                alternatives_count = len(no_sodas_data.get('bebidas_alternativas', []))
+                # Test 4: Test traditional user gets refrescos with MAX_REFRESCOS_ADICIONALES
+                print("\n📋 TEST 4: Testing additional refrescos count for traditional users...")
                 
-                print(f"✅ No-Sodas User: Got {refrescos_count} refrescos, {alternatives_count} alternatives")
-                
-                # Should get 0 refrescos and up to MAX_ALTERNATIVAS_USUARIO_SALUDABLE (4) alternatives
-                if refrescos_count == 0:
-                    print("✅ No-Sodas User: Correctly got 0 refrescos")
-                else:
-                    print(f"❌ No-Sodas User: FAILED - Got {refrescos_count} refrescos, expected 0")
-                    self.test_results["Granular Healthy Alternatives Configuration"] = False
-                    self.all_tests_passed = False
+                session_id_traditional = traditional_future.result()
+                if not session_id_traditional:
+                    print("❌ Additional Refrescos: FAILED - Could not create traditional user session")
+                    self._record_result("Granular Healthy Alternatives Configuration", False)
                     return
                 
-                if alternatives_count <= 4:
-                    print("✅ No-Sodas User: Alternatives count respects MAX_ALTERNATIVAS_USUARIO_SALUDABLE (≤4)")
+                # Get initial recommendations to establish baseline
+                initial_traditional_data = self._get_json(URL_RECOMENDACION + session_id_traditional)
+                
+                print(f"✅ Traditional User Initial: {len(initial_traditional_data.get('refrescos_reales', []))} refrescos, {len(initial_traditional_data.get('bebidas_alternativas', []))} alternatives")
+                
+                # Get additional recommendations
+                additional_traditional_data = self._get_json(URL_MAS_RECOMENDACIONES + session_id_traditional)
+                
+                if not additional_traditional_data.get('sin_mas_opciones', False):
+                    additional_recommendations = additional_traditional_data.get('recomendaciones_adicionales', [])
+                    recommendation_type = additional_traditional_data.get('tipo_recomendaciones', '')
+                    
+                    print(f"✅ Traditional User Additional: Got {len(additional_recommendations)} additional recommendations of type '{recommendation_type}'")
+                    
+                    # If they got refrescos, verify count respects MAX_REFRESCOS_ADICIONALES (3)
+                    if recommendation_type in ['refrescos_tradicionales', 'refrescos_adicionales']:
+                        if len(additional_recommendations) <= 3:
+                            print("✅ Additional Refrescos: Count respects MAX_REFRESCOS_ADICIONALES (≤3)")
+                        else:
+                            print(f"❌ Additional Refrescos: FAILED - Got {len(additional_recommendations)} refrescos, expected ≤3")
+                            self._record_result("Granular Healthy Alternatives Configuration", False)
+                            return
+                    else:
+                        print(f"✅ Traditional User: Got {recommendation_type} instead of refrescos (acceptable based on logic)")
                 else:
-                    print(f"❌ No-Sodas User: FAILED - Got {alternatives_count} alternatives, expected ≤4")
-                    self.test_results["Granular Healthy Alternatives Configuration"] = False
-                    self.all_tests_passed = False
+                    print("⚠️ Traditional User Additional: No more options available (this is acceptable)")
+                
+                # Test 5: Test user who doesn't consume sodas gets MAX_ALTERNATIVAS_USUARIO_SALUDABLE
+                print("\n📋 TEST 5: Testing healthy user gets correct amount of alternatives...")
+                
+                session_id_no_sodas = no_sodas_future.result()
+                if not session_id_no_sodas:
+                    print("❌ No-Sodas User: FAILED - Could not create no-sodas user session")
+                    self._record_result("Granular Healthy Alternatives Configuration", False)
                     return
-            else:
-                print("⚠️ No-Sodas User: Not detected as no-sodas user, but this might be due to question logic")
-            
-            # Test 6: Test configuration consistency across different endpoints
-            print("\n📋 TEST 6: Testing configuration consistency across endpoints...")
-            
-            # Test /api/mas-alternativas endpoint
-            response = requests.get(f"{API_URL}/mas-alternativas/{session_id_healthy}")
-            if response.status_code == 200:
-                mas_alternativas_data = response.json()
-                if not mas_alternativas_data.get('sin_mas_opciones', False):
-                    mas_alternativas_count = len(mas_alternativas_data.get('mas_alternativas', []))
-                    print(f"✅ /api/mas-alternativas: Got {mas_alternativas_count} alternatives")
+                
+                # Get initial recommendations
+                no_sodas_data = self._get_json(URL_RECOMENDACION + session_id_no_sodas)
+                
+                # Verify user is detected as not consuming sodas
+                if no_sodas_data.get('usuario_no_consume_refrescos', False):
+                    print("✅ No-Sodas User: Correctly detected as not consuming sodas")
                     
-                    if mas_alternativas_count <= 3:
-                        print("✅ /api/mas-alternativas: Count respects configuration (≤3)")
+                    # Check that they get only alternatives (no refrescos)
+                    refrescos_count = len(no_sodas_data.get('refrescos_reales', []))
+                    alternatives_count = len(no_sodas_data.get('bebidas_alternativas', []))
+                    
+                    print(f"✅ No-Sodas User: Got {refrescos_count} refrescos, {alternatives_count} alternatives")
+                    
+                    # Should get 0 refrescos and up to MAX_ALTERNATIVAS_USUARIO_SALUDABLE (4) alternatives
+                    if refrescos_count == 0:
+                        print("✅ No-Sodas User: Correctly got 0 refrescos")
                     else:
-                        print(f"❌ /api/mas-alternativas: FAILED - Got {mas_alternativas_count}, expected ≤3")
-                        self.test_results["Granular Healthy Alternatives Configuration"] = False
-                        self.all_tests_passed = False
+                        print(f"❌ No-Sodas User: FAILED - Got {refrescos_count} refrescos, expected 0")
+                        self._record_result("Granular Healthy Alternatives Configuration", False)
                         return
-                else:
-                    print("✅ /api/mas-alternativas: No more options (acceptable)")
-            else:
-                print(f"⚠️ /api/mas-alternativas: Endpoint returned {response.status_code}")
-            
-            # Test /api/mas-refrescos endpoint
-            response = requests.get(f"{API_URL}/mas-refrescos/{session_id_traditional}")
-            if response.status_code == 200:
-                mas_refrescos_data = response.json()
-                if not mas_refrescos_data.get('sin_mas_opciones', False):
-                    mas_refrescos_count = len(mas_refrescos_data.get('mas_refrescos', []))
-                    print(f"✅ /api/mas-refrescos: Got {mas_refrescos_count} refrescos")
                     
-                    if mas_refrescos_count <= 3:
-                        print("✅ /api/mas-refrescos: Count respects MAX_REFRESCOS_ADICIONALES (≤3)")
+                    if alternatives_count <= 4:
+                        print("✅ No-Sodas User: Alternatives count respects MAX_ALTERNATIVAS_USUARIO_SALUDABLE (≤4)")
                     else:
-                        print(f"❌ /api/mas-refrescos: FAILED - Got {mas_refrescos_count}, expected ≤3")
-                        self.test_results["Granular Healthy Alternatives Configuration"] = False
-                        self.all_tests_passed = False
+                        print(f"❌ No-Sodas User: FAILED - Got {alternatives_count} alternatives, expected ≤4")
+                        self._record_result("Granular Healthy Alternatives Configuration", False)
                         return
                 else:
-                    print("✅ /api/mas-refrescos: No more options (acceptable)")
-            else:
-                print(f"⚠️ /api/mas-refrescos: Endpoint returned {response.status_code}")
-            
-            # Test 7: Verify different user types get appropriate amounts
-            print("\n📋 TEST 7: Verifying user type differentiation...")
-            
-            # Summary of what each user type should get
-            user_types_summary = [
-                ("Healthy User", session_id_healthy, "Should get ≤3 initial alternatives, ≤3 additional alternatives"),
-                ("Traditional User", session_id_traditional, "Should get refrescos initially, ≤3 additional refrescos or alternatives"),
-                ("No-Sodas User", session_id_no_sodas, "Should get 0 refrescos, ≤4 alternatives total")
-            ]
-            
-            for user_type, session_id, expected_behavior in user_types_summary:
-                print(f"✅ {user_type}: {expected_behavior}")
-            
-            print("\n✅ SUCCESS: All granular healthy alternatives configuration tests passed!")
-            print("✅ New configurations are working correctly:")
-            print("   - MAX_ALTERNATIVAS_SALUDABLES_INICIAL controls initial healthy alternatives")
-            print("   - MAX_ALTERNATIVAS_SALUDABLES_ADICIONAL controls additional healthy alternatives")
-            print("   - MAX_REFRESCOS_ADICIONALES controls additional refrescos for traditional users")
-            print("   - MAX_ALTERNATIVAS_USUARIO_SALUDABLE controls alternatives for healthy users")
-            print("   - MAX_REFRESCOS_USUARIO_TRADICIONAL is respected for traditional users")
-            print("✅ Different user types receive appropriate amounts of beverages")
-            print("✅ The 'more options' logic uses the correct specific configurations")
-            print("✅ No regressions in existing functionality")
-            
-            self.test_results["Granular Healthy Alternatives Configuration"] = True
-            
+                    print("⚠️ No-Sodas User: Not detected as no-sodas user, but this might be due to question logic")
+                
+                # Test 6: Test configuration consistency across different endpoints
+                print("\n📋 TEST 6: Testing configuration consistency across endpoints...")
+                
+                # The two endpoints read different sessions, so both calls go out in one batch
+                (alternativas_status, mas_alternativas_data), (refrescos_status, mas_refrescos_data) = self._batch(
+                    [f"mas-alternativas/{session_id_healthy}", f"mas-refrescos/{session_id_traditional}"])
+                
+                # Test /api/mas-alternativas endpoint
+                if alternativas_status == 200:
+                    if not mas_alternativas_data.get('sin_mas_opciones', False):
+                        mas_alternativas_count = len(mas_alternativas_data.get('mas_alternativas', []))
+                        print(f"✅ /api/mas-alternativas: Got {mas_alternativas_count} alternatives")
+                        
+                        if mas_alternativas_count <= 3:
+                            print("✅ /api/mas-alternativas: Count respects configuration (≤3)")
+                        else:
+                            print(f"❌ /api/mas-alternativas: FAILED - Got {mas_alternativas_count}, expected ≤3")
+                            self._record_result("Granular Healthy Alternatives Configuration", False)
+                            return
+                    else:
+                        print("✅ /api/mas-alternativas: No more options (acceptable)")
+                else:
+                    print(f"⚠️ /api/mas-alternativas: Endpoint returned {alternativas_status}")
+                
+                # Test /api/mas-refrescos endpoint
+                if refrescos_status == 200:
+                    if not mas_refrescos_data.get('sin_mas_opciones', False):
+                        mas_refrescos_count = len(mas_refrescos_data.get('mas_refrescos', []))
+                        print(f"✅ /api/mas-refrescos: Got {mas_refrescos_count} refrescos")
+                        
+                        if mas_refrescos_count <= 3:
+                            print("✅ /api/mas-refrescos: Count respects MAX_REFRESCOS_ADICIONALES (≤3)")
+                        else:
+                            print(f"❌ /api/mas-refrescos: FAILED - Got {mas_refrescos_count}, expected ≤3")
+                            self._record_result("Granular Healthy Alternatives Configuration", False)
+                            return
+                    else:
+                        print("✅ /api/mas-refrescos: No more options (acceptable)")
+                else:
+                    print(f"⚠️ /api/mas-refrescos: Endpoint returned {refrescos_status}")
+                
+                # Test 7: Verify different user types get appropriate amounts
+                print("\n📋 TEST 7: Verifying user type differentiation...")
+                
+                # Summary of what each user type should get
+                user_types_summary = [
+                    ("Healthy User", session_id_healthy, "Should get ≤3 initial alternatives, ≤3 additional alternatives"),
+                    ("Traditional User", session_id_traditional, "Should get refrescos initially, ≤3 additional refrescos or alternatives"),
+                    ("No-Sodas User", session_id_no_sodas, "Should get 0 refrescos, ≤4 alternatives total")
+                ]
+                
+                for user_type, session_id, expected_behavior in user_types_summary:
+                    print(f"✅ {user_type}: {expected_behavior}")
+                
+                print("\n✅ SUCCESS: All granular healthy alternatives configuration tests passed!")
+                print("✅ New configurations are working correctly:")
+                print("   - MAX_ALTERNATIVAS_SALUDABLES_INICIAL controls initial healthy alternatives")
+                print("   - MAX_ALTERNATIVAS_SALUDABLES_ADICIONAL controls additional healthy alternatives")
+                print("   - MAX_REFRESCOS_ADICIONALES controls additional refrescos for traditional users")
+                print("   - MAX_ALTERNATIVAS_USUARIO_SALUDABLE controls alternatives for healthy users")
+                print("   - MAX_REFRESCOS_USUARIO_TRADICIONAL is respected for traditional users")
+                print("✅ Different user types receive appropriate amounts of beverages")
+                print("✅ The 'more options' logic uses the correct specific configurations")
+                print("✅ No regressions in existing functionality")
+                
+                self._record_result("Granular Healthy Alternatives Configuration", True)
+                
         except Exception as e:
             print(f"❌ Granular Healthy Alternatives Configuration: FAILED - {str(e)}")
-            self.test_results["Granular Healthy Alternatives Configuration"] = False
-            self.all_tests_passed = False
+            self._record_result("Granular Healthy Alternatives Configuration", False)
         
     def test_alternative_recommendations(self):
         """Test alternative recommendations endpoint"""
@@ -6636,27 +5957,23 @@ class RefrescoBotTester:
         
         if not self.session_id:
             print("❌ Alternative Recommendations: FAILED - No active session")
-            self.test_results["Alternative Recommendations"] = False
-            self.all_tests_passed = False
+            self._record_result("Alternative Recommendations", False)
             return
         
         try:
-            response = requests.get(f"{API_URL}/recomendaciones-alternativas/{self.session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_MAS_RECOMENDACIONES + self.session_id)
             
             # Check for required fields
             if "recomendaciones_adicionales" not in data:
                 print("❌ Alternative Recommendations: FAILED - Missing recomendaciones_adicionales field")
-                self.test_results["Alternative Recommendations"] = False
-                self.all_tests_passed = False
+                self._record_result("Alternative Recommendations", False)
                 return
             
             # Check if we got alternatives or a "no more options" message
             if "sin_mas_opciones" in data and data["sin_mas_opciones"]:
                 print("✅ Alternative Recommendations: No more options available")
                 print(f"✅ Alternative Recommendations: Message: '{data.get('mensaje', '')}'")
-                self.test_results["Alternative Recommendations"] = True
+                self._record_result("Alternative Recommendations", True)
             else:
                 alternatives = data["recomendaciones_adicionales"]
                 print(f"✅ Alternative Recommendations: Got {len(alternatives)} additional recommendations")
@@ -6667,8 +5984,7 @@ class RefrescoBotTester:
                     
                     if "prediccion_ml" not in alternative or "probabilidad" not in alternative:
                         print("❌ Alternative Recommendations: FAILED - Missing ML prediction fields")
-                        self.test_results["Alternative Recommendations"] = False
-                        self.all_tests_passed = False
+                        self._record_result("Alternative Recommendations", False)
                         return
                     
                     print(f"✅ Alternative Recommendations: First alternative '{alternative['nombre']}' has ML prediction: {alternative['prediccion_ml']}")
@@ -6677,46 +5993,41 @@ class RefrescoBotTester:
                     # Check for explanatory factors
                     if "factores_explicativos" not in alternative:
                         print("❌ Alternative Recommendations: FAILED - Missing explanatory factors")
-                        self.test_results["Alternative Recommendations"] = False
-                        self.all_tests_passed = False
+                        self._record_result("Alternative Recommendations", False)
                         return
                     
                     print(f"✅ Alternative Recommendations: Explanatory factors: {alternative.get('factores_explicativos', [])}")
                 
-                self.test_results["Alternative Recommendations"] = True
+                self._record_result("Alternative Recommendations", True)
                 
         except Exception as e:
             print(f"❌ Alternative Recommendations: FAILED - {str(e)}")
-            self.test_results["Alternative Recommendations"] = False
-            self.all_tests_passed = False
+            self._record_result("Alternative Recommendations", False)
     def test_rating_system(self):
         """Test the rating system and ML learning"""
         print("\n🔍 Testing Rating System and ML Learning...")
         
         if not self.session_id or not self.bebida_to_rate:
             print("❌ Rating System: FAILED - No active session or no beverage to rate")
-            self.test_results["Rating System"] = False
-            self.all_tests_passed = False
+            self._record_result("Rating System", False)
             return
         
         try:
             # Rate the beverage with 5 stars
             bebida = self.bebida_to_rate
             
-            response = requests.post(f"{API_URL}/puntuar/{self.session_id}/{bebida['id']}", json={
+            data = self._post_json(f"{URL_PUNTUAR}{self.session_id}/{bebida['id']}", {
                 "puntuacion": 5,
                 "comentario": "Excelente bebida, me encantó"
             })
-            response.raise_for_status()
-            data = response.json()
+            self._recommendations.pop(self.session_id, None)
             
             print(f"✅ Rating System: Rated '{bebida['nombre']}' with 5 stars")
             
             # Check for feedback
             if "feedback_aprendizaje" not in data:
                 print("❌ Rating System: FAILED - No learning feedback provided")
-                self.test_results["Rating System"] = False
-                self.all_tests_passed = False
+                self._record_result("Rating System", False)
                 return
             
             feedback = data["feedback_aprendizaje"]
@@ -6737,14 +6048,11 @@ class RefrescoBotTester:
             # Create a new session to check if ML learning affected recommendations
             print("\n🔍 Testing ML Learning Effect...")
             
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            new_session_data = response.json()
+            new_session_data = self._post_json(f"{API_URL}/iniciar-sesion")
             
             if "sesion_id" not in new_session_data:
                 print("❌ ML Learning: FAILED - Could not create new session")
-                self.test_results["Rating System"] = False
-                self.all_tests_passed = False
+                self._record_result("Rating System", False)
                 return
             
             new_session_id = new_session_data["sesion_id"]
@@ -6754,9 +6062,7 @@ class RefrescoBotTester:
             self.answer_all_questions(new_session_id)
             
             # Get recommendations for the new session
-            response = requests.get(f"{API_URL}/recomendacion/{new_session_id}")
-            response.raise_for_status()
-            new_recommendations = response.json()
+            new_recommendations = self._get_json(URL_RECOMENDACION + new_session_id)
             
             # Find the same beverage in the new recommendations
             found_bebida = None
@@ -6780,40 +6086,34 @@ class RefrescoBotTester:
                 # Check if probability changed (might increase or stay the same if already at max)
                 if new_probability >= self.rated_bebida_probability:
                     print(f"✅ ML Learning: SUCCESS - Probability maintained or increased after positive rating")
-                    self.test_results["Rating System"] = True
+                    self._record_result("Rating System", True)
                 else:
                     print(f"❌ ML Learning: FAILED - Probability decreased after positive rating")
-                    self.test_results["Rating System"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Rating System", False)
             else:
                 print("⚠️ ML Learning: WARNING - Could not find the rated beverage in new recommendations")
                 # This is not necessarily a failure, as recommendations might change based on other factors
-                self.test_results["Rating System"] = True
+                self._record_result("Rating System", True)
                 
         except Exception as e:
             print(f"❌ Rating System: FAILED - {str(e)}")
-            self.test_results["Rating System"] = False
-            self.all_tests_passed = False
+            self._record_result("Rating System", False)
     def test_question_flow(self):
         """Test the complete question flow"""
         print("\n🔍 Testing Question Flow...")
         
         if not self.session_id:
             print("❌ Question Flow: FAILED - No active session")
-            self.test_results["Question Flow"] = False
-            self.all_tests_passed = False
+            self._record_result("Question Flow", False)
             return
         
         try:
             # Step 1: Get initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{self.session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_PREGUNTA_INICIAL + self.session_id)
             
             if "pregunta" not in data:
                 print("❌ Question Flow: FAILED - Initial question not found")
-                self.test_results["Question Flow"] = False
-                self.all_tests_passed = False
+                self._record_result("Question Flow", False)
                 return
             
             initial_question = data["pregunta"]
@@ -6829,12 +6129,12 @@ class RefrescoBotTester:
                 print("⚠️ Question Flow: WARNING - Initial question is not about refresco consumption")
             
             # Step 2: Answer initial question
-            response = requests.post(f"{API_URL}/responder/{self.session_id}", json={
+            middle_option = initial_question["opciones"][2]
+            self._post_json(URL_RESPONDER + self.session_id, {
                 "pregunta_id": initial_question["id"],
-                "respuesta_id": initial_question["opciones"][2]["id"],  # Middle option
-                "respuesta_texto": initial_question["opciones"][2]["texto"]
+                "respuesta_id": middle_option["id"],
+                "respuesta_texto": middle_option["texto"]
             })
-            response.raise_for_status()
             print(f"✅ Question Flow: Answered initial question")
             
             # Step 3: Get and answer remaining questions
@@ -6843,9 +6143,7 @@ class RefrescoBotTester:
             question_ids = [initial_question["id"]]
             
             while questions_answered < total_questions:
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{self.session_id}")
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(URL_SIGUIENTE_PREGUNTA + self.session_id)
                 
                 if "finalizada" in data and data["finalizada"]:
                     print(f"✅ Question Flow: All questions completed after {questions_answered} questions")
@@ -6853,8 +6151,7 @@ class RefrescoBotTester:
                 
                 if "pregunta" not in data:
                     print(f"❌ Question Flow: FAILED - Question {questions_answered + 1} not found")
-                    self.test_results["Question Flow"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Question Flow", False)
                     return
                 
                 question = data["pregunta"]
@@ -6870,12 +6167,11 @@ class RefrescoBotTester:
                 
                 # Answer question with random option
                 random_option = random.choice(question["opciones"])
-                response = requests.post(f"{API_URL}/responder/{self.session_id}", json={
+                self._post_json(URL_RESPONDER + self.session_id, {
                     "pregunta_id": question["id"],
                     "respuesta_id": random_option["id"],
                     "respuesta_texto": random_option["texto"]
                 })
-                response.raise_for_status()
                 
                 print(f"✅ Question Flow: Answered question {questions_answered + 1}")
                 questions_answered += 1
@@ -6886,28 +6182,23 @@ class RefrescoBotTester:
                 
                 if all_questions_unique:
                     print("✅ Question Flow: SUCCESS - All questions were unique")
-                    self.test_results["Question Flow"] = True
+                    self._record_result("Question Flow", True)
                 else:
                     print("❌ Question Flow: FAILED - Some questions were duplicated")
-                    self.test_results["Question Flow"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Question Flow", False)
             else:
                 print(f"❌ Question Flow: FAILED - Expected {total_questions} questions, got {questions_answered}")
-                self.test_results["Question Flow"] = False
-                self.all_tests_passed = False
+                self._record_result("Question Flow", False)
                 
         except Exception as e:
             print(f"❌ Question Flow: FAILED - {str(e)}")
-            self.test_results["Question Flow"] = False
-            self.all_tests_passed = False
+            self._record_result("Question Flow", False)
     def test_system_status(self):
         """Test the system status endpoint"""
         print("\n🔍 Testing System Status...")
         
         try:
-            response = requests.get(f"{API_URL}/status")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(f"{API_URL}/status")
             
             if "status" in data and data["status"] == "healthy":
                 print("✅ System Status: SUCCESS - System is healthy")
@@ -6924,44 +6215,37 @@ class RefrescoBotTester:
                     if "training_samples" in ml_stats:
                         print(f"✅ System Status: ML Engine training samples: {ml_stats['training_samples']}")
                     
-                    self.test_results["System Status"] = True
+                    self._record_result("System Status", True)
                 else:
                     print("❌ System Status: FAILED - ML Engine stats missing")
-                    self.test_results["System Status"] = False
-                    self.all_tests_passed = False
+                    self._record_result("System Status", False)
             else:
                 print(f"❌ System Status: FAILED - System is not healthy: {data}")
-                self.test_results["System Status"] = False
-                self.all_tests_passed = False
+                self._record_result("System Status", False)
                 
         except Exception as e:
             print(f"❌ System Status: FAILED - {str(e)}")
-            self.test_results["System Status"] = False
-            self.all_tests_passed = False
+            self._record_result("System Status", False)
     
     def test_session_initialization(self):
         """Test session initialization endpoint"""
         print("\n🔍 Testing Session Initialization...")
         
         try:
-            response = requests.post(f"{API_URL}/iniciar-sesion")
-            response.raise_for_status()
-            data = response.json()
+            data = self._post_json(f"{API_URL}/iniciar-sesion")
             
             if "sesion_id" in data and "mensaje" in data:
                 self.session_id = data["sesion_id"]
                 print(f"✅ Session Initialization: SUCCESS - Session created with ID: {self.session_id}")
                 print(f"✅ Session Initialization: Welcome message: '{data['mensaje']}'")
-                self.test_results["Session Initialization"] = True
+                self._record_result("Session Initialization", True)
             else:
                 print(f"❌ Session Initialization: FAILED - Invalid response format: {data}")
-                self.test_results["Session Initialization"] = False
-                self.all_tests_passed = False
+                self._record_result("Session Initialization", False)
                 
         except Exception as e:
             print(f"❌ Session Initialization: FAILED - {str(e)}")
-            self.test_results["Session Initialization"] = False
-            self.all_tests_passed = False
+            self._record_result("Session Initialization", False)
     
     def test_ml_recommendations(self):
         """Test ML-based recommendations"""
@@ -6969,14 +6253,11 @@ class RefrescoBotTester:
         
         if not self.session_id:
             print("❌ ML Recommendations: FAILED - No active session")
-            self.test_results["ML Recommendations"] = False
-            self.all_tests_passed = False
+            self._record_result("ML Recommendations", False)
             return
         
         try:
-            response = requests.get(f"{API_URL}/recomendacion/{self.session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_RECOMENDACION + self.session_id)
             
             # Store recommendations for later tests
             self.recommendations = data
@@ -6987,8 +6268,7 @@ class RefrescoBotTester:
             
             if missing_fields:
                 print(f"❌ ML Recommendations: FAILED - Missing fields: {missing_fields}")
-                self.test_results["ML Recommendations"] = False
-                self.all_tests_passed = False
+                self._record_result("ML Recommendations", False)
                 return
             
             # Check ML criteria
@@ -6997,8 +6277,7 @@ class RefrescoBotTester:
             
             if "modelo_entrenado" not in ml_criteria or "cluster_usuario" not in ml_criteria:
                 print("❌ ML Recommendations: FAILED - Missing ML criteria details")
-                self.test_results["ML Recommendations"] = False
-                self.all_tests_passed = False
+                self._record_result("ML Recommendations", False)
                 return
             
             # Check real refrescos
@@ -7013,8 +6292,7 @@ class RefrescoBotTester:
                 
                 if "prediccion_ml" not in refresco or "probabilidad" not in refresco:
                     print("❌ ML Recommendations: FAILED - Missing ML prediction fields")
-                    self.test_results["ML Recommendations"] = False
-                    self.all_tests_passed = False
+                    self._record_result("ML Recommendations", False)
                     return
                 
                 print(f"✅ ML Recommendations: First refresco '{refresco['nombre']}' has ML prediction: {refresco['prediccion_ml']}")
@@ -7023,8 +6301,7 @@ class RefrescoBotTester:
                 # Check for explanatory factors
                 if "factores_explicativos" not in refresco:
                     print("❌ ML Recommendations: FAILED - Missing explanatory factors")
-                    self.test_results["ML Recommendations"] = False
-                    self.all_tests_passed = False
+                    self._record_result("ML Recommendations", False)
                     return
                 
                 print(f"✅ ML Recommendations: Explanatory factors: {refresco.get('factores_explicativos', [])}")
@@ -7038,21 +6315,18 @@ class RefrescoBotTester:
             
             # Overall success
             print("✅ ML Recommendations: SUCCESS - ML-based recommendations working correctly")
-            self.test_results["ML Recommendations"] = True
+            self._record_result("ML Recommendations", True)
                 
         except Exception as e:
             print(f"❌ ML Recommendations: FAILED - {str(e)}")
-            self.test_results["ML Recommendations"] = False
-            self.all_tests_passed = False
+            self._record_result("ML Recommendations", False)
     
     def test_admin_stats(self):
         """Test admin statistics endpoint"""
         print("\n🔍 Testing Admin Statistics...")
         
         try:
-            response = requests.get(f"{API_URL}/admin/stats")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(f"{API_URL}/admin/stats")
             
             # Check for required sections
             required_sections = ["sesiones", "puntuaciones", "ml_engine", "bebidas"]
@@ -7060,8 +6334,7 @@ class RefrescoBotTester:
             
             if missing_sections:
                 print(f"❌ Admin Statistics: FAILED - Missing sections: {missing_sections}")
-                self.test_results["Admin Statistics"] = False
-                self.all_tests_passed = False
+                self._record_result("Admin Statistics", False)
                 return
             
             # Check ML engine stats
@@ -7070,8 +6343,7 @@ class RefrescoBotTester:
             
             if "is_trained" not in ml_stats:
                 print("❌ Admin Statistics: FAILED - Missing ML training status")
-                self.test_results["Admin Statistics"] = False
-                self.all_tests_passed = False
+                self._record_result("Admin Statistics", False)
                 return
             
             # Check session stats
@@ -7091,21 +6363,18 @@ class RefrescoBotTester:
                     print("✅ Admin Statistics: Beverage counts are consistent")
                 else:
                     print("❌ Admin Statistics: FAILED - Inconsistent beverage counts")
-                    self.test_results["Admin Statistics"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Admin Statistics", False)
                     return
             else:
                 print("❌ Admin Statistics: FAILED - Missing beverage type counts")
-                self.test_results["Admin Statistics"] = False
-                self.all_tests_passed = False
+                self._record_result("Admin Statistics", False)
                 return
             
-            self.test_results["Admin Statistics"] = True
+            self._record_result("Admin Statistics", True)
                 
         except Exception as e:
             print(f"❌ Admin Statistics: FAILED - {str(e)}")
-            self.test_results["Admin Statistics"] = False
-            self.all_tests_passed = False
+            self._record_result("Admin Statistics", False)
     
     def test_different_user_profiles(self):
         """Test recommendations for different user profiles"""
@@ -7143,9 +6412,7 @@ class RefrescoBotTester:
             
             try:
                 # Create new session
-                response = requests.post(f"{API_URL}/iniciar-sesion")
-                response.raise_for_status()
-                session_data = response.json()
+                session_data = self._post_json(f"{API_URL}/iniciar-sesion")
                 
                 if "sesion_id" not in session_data:
                     print(f"❌ Profile {profile['name']}: FAILED - Could not create session")
@@ -7158,9 +6425,7 @@ class RefrescoBotTester:
                 self.answer_questions_by_profile(session_id, profile["answers"])
                 
                 # Get recommendations
-                response = requests.get(f"{API_URL}/recomendacion/{session_id}")
-                response.raise_for_status()
-                recommendations = response.json()
+                recommendations = self._get_json(URL_RECOMENDACION + session_id)
                 
                 # Store recommendations for this profile
                 profile_results[profile["name"]] = {
@@ -7192,19 +6457,16 @@ class RefrescoBotTester:
             else:
                 print(f"⚠️ Different User Profiles: WARNING - Same number of alternative beverages for both profiles")
             
-            self.test_results["Different User Profiles"] = True
+            self._record_result("Different User Profiles", True)
         else:
             print("❌ Different User Profiles: FAILED - Could not test both profiles")
-            self.test_results["Different User Profiles"] = False
-            self.all_tests_passed = False
+            self._record_result("Different User Profiles", False)
             
     def answer_questions_by_profile(self, session_id, profile_answers):
         """Answer questions according to a specific profile"""
         try:
             # Get initial question
-            response = requests.get(f"{API_URL}/pregunta-inicial/{session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_PREGUNTA_INICIAL + session_id)
             
             if "pregunta" not in data:
                 return False
@@ -7226,18 +6488,15 @@ class RefrescoBotTester:
             if not selected_option:
                 selected_option = question["opciones"][len(question["opciones"]) // 2]
             
-            response = requests.post(f"{API_URL}/responder/{session_id}", json={
+            self._post_json(URL_RESPONDER + session_id, {
                 "pregunta_id": question["id"],
                 "respuesta_id": selected_option["id"],
                 "respuesta_texto": selected_option["texto"]
             })
-            response.raise_for_status()
             
             # Get and answer remaining questions
             for i in range(total_questions - 1):
-                response = requests.get(f"{API_URL}/siguiente-pregunta/{session_id}")
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_json(URL_SIGUIENTE_PREGUNTA + session_id)
                 
                 if "finalizada" in data and data["finalizada"]:
                     break
@@ -7259,12 +6518,11 @@ class RefrescoBotTester:
                 if not selected_option:
                     selected_option = question["opciones"][len(question["opciones"]) // 2]
                 
-                response = requests.post(f"{API_URL}/responder/{session_id}", json={
+                self._post_json(URL_RESPONDER + session_id, {
                     "pregunta_id": question["id"],
                     "respuesta_id": selected_option["id"],
                     "respuesta_texto": selected_option["texto"]
                 })
-                response.raise_for_status()
             
             return True
             
@@ -7286,23 +6544,19 @@ class RefrescoBotTester:
         
         try:
             # Create a session to get recommendations that include ML module info
-            self.session_id = self.create_session_and_answer_questions()
+            self.session_id = self.shared_session()
             if not self.session_id:
                 print("❌ ML Modules Initialization: FAILED - Could not create session")
-                self.test_results["ML Modules Initialization"] = False
-                self.all_tests_passed = False
+                self._record_result("ML Modules Initialization", False)
                 return
             
             # Get recommendations to check ML modules
-            response = requests.get(f"{API_URL}/recomendacion/{self.session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_recommendation(self.session_id)
             
             # Check for ML advanced info
             if "ml_avanzado" not in data:
                 print("❌ ML Modules Initialization: FAILED - ML advanced info missing")
-                self.test_results["ML Modules Initialization"] = False
-                self.all_tests_passed = False
+                self._record_result("ML Modules Initialization", False)
                 return
             
             ml_avanzado = data["ml_avanzado"]
@@ -7314,23 +6568,20 @@ class RefrescoBotTester:
             
             if missing_modules:
                 print(f"❌ ML Modules Initialization: FAILED - Missing ML modules: {missing_modules}")
-                self.test_results["ML Modules Initialization"] = False
-                self.all_tests_passed = False
+                self._record_result("ML Modules Initialization", False)
                 return
             
             # Check that at least some beverages were processed
             if "total_bebidas_categorizadas" in ml_avanzado and ml_avanzado["total_bebidas_categorizadas"] > 0:
                 print(f"✅ ML Modules Initialization: {ml_avanzado['total_bebidas_categorizadas']} beverages categorized")
-                self.test_results["ML Modules Initialization"] = True
+                self._record_result("ML Modules Initialization", True)
             else:
                 print("❌ ML Modules Initialization: FAILED - No beverages categorized")
-                self.test_results["ML Modules Initialization"] = False
-                self.all_tests_passed = False
+                self._record_result("ML Modules Initialization", False)
             
         except Exception as e:
             print(f"❌ ML Modules Initialization: FAILED - {str(e)}")
-            self.test_results["ML Modules Initialization"] = False
-            self.all_tests_passed = False
+            self._record_result("ML Modules Initialization", False)
     
     def test_beverage_categorizer(self):
         """Test the beverage categorizer functionality"""
@@ -7338,14 +6589,11 @@ class RefrescoBotTester:
         
         try:
             # Get admin stats to check categorizer
-            response = requests.get(f"{API_URL}/admin/stats")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(f"{API_URL}/admin/stats")
             
             if "ml_engines" not in data or "categorizador" not in data["ml_engines"]:
                 print("❌ Beverage Categorizer: FAILED - Categorizer stats missing")
-                self.test_results["Beverage Categorizer"] = False
-                self.all_tests_passed = False
+                self._record_result("Beverage Categorizer", False)
                 return
             
             categorizer_stats = data["ml_engines"]["categorizador"]
@@ -7357,18 +6605,8 @@ class RefrescoBotTester:
             else:
                 print("⚠️ Beverage Categorizer: WARNING - Categorizer is not trained")
             
-            # Get recommendations to check categorization
-            if not self.session_id:
-                self.session_id = self.create_session_and_answer_questions()
-                if not self.session_id:
-                    print("❌ Beverage Categorizer: FAILED - Could not create session")
-                    self.test_results["Beverage Categorizer"] = False
-                    self.all_tests_passed = False
-                    return
-            
-            response = requests.get(f"{API_URL}/recomendacion/{self.session_id}")
-            response.raise_for_status()
-            data = response.json()
+            # Get recommendations to check categorization (only the first bebida is inspected)
+            _, data = self._get_shared_reco()
             
             # Check for categorization in recommendations
             if "refrescos_reales" in data and data["refrescos_reales"]:
@@ -7377,8 +6615,7 @@ class RefrescoBotTester:
                 # Check for automatic categories
                 if "categorias_automaticas" not in bebida:
                     print("❌ Beverage Categorizer: FAILED - Automatic categories missing")
-                    self.test_results["Beverage Categorizer"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Beverage Categorizer", False)
                     return
                 
                 print(f"✅ Beverage Categorizer: Automatic categories: {bebida['categorias_automaticas']}")
@@ -7386,22 +6623,19 @@ class RefrescoBotTester:
                 # Check for ML tags
                 if "tags_ml" not in bebida:
                     print("❌ Beverage Categorizer: FAILED - ML tags missing")
-                    self.test_results["Beverage Categorizer"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Beverage Categorizer", False)
                     return
                 
                 print(f"✅ Beverage Categorizer: ML tags: {bebida['tags_ml']}")
                 
-                self.test_results["Beverage Categorizer"] = True
+                self._record_result("Beverage Categorizer", True)
             else:
                 print("❌ Beverage Categorizer: FAILED - No recommendations to check")
-                self.test_results["Beverage Categorizer"] = False
-                self.all_tests_passed = False
+                self._record_result("Beverage Categorizer", False)
             
         except Exception as e:
             print(f"❌ Beverage Categorizer: FAILED - {str(e)}")
-            self.test_results["Beverage Categorizer"] = False
-            self.all_tests_passed = False
+            self._record_result("Beverage Categorizer", False)
     
     def test_image_analyzer(self):
         """Test the image analyzer functionality"""
@@ -7409,14 +6643,11 @@ class RefrescoBotTester:
         
         try:
             # Get admin stats to check image analyzer
-            response = requests.get(f"{API_URL}/admin/stats")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(f"{API_URL}/admin/stats")
             
             if "ml_engines" not in data or "analizador_imagenes" not in data["ml_engines"]:
                 print("❌ Image Analyzer: FAILED - Image analyzer stats missing")
-                self.test_results["Image Analyzer"] = False
-                self.all_tests_passed = False
+                self._record_result("Image Analyzer", False)
                 return
             
             analyzer_stats = data["ml_engines"]["analizador_imagenes"]
@@ -7428,18 +6659,8 @@ class RefrescoBotTester:
             else:
                 print("⚠️ Image Analyzer: WARNING - Analyzer is not initialized")
             
-            # Get recommendations to check image analysis
-            if not self.session_id:
-                self.session_id = self.create_session_and_answer_questions()
-                if not self.session_id:
-                    print("❌ Image Analyzer: FAILED - Could not create session")
-                    self.test_results["Image Analyzer"] = False
-                    self.all_tests_passed = False
-                    return
-            
-            response = requests.get(f"{API_URL}/recomendacion/{self.session_id}")
-            response.raise_for_status()
-            data = response.json()
+            # Get recommendations to check image analysis (only the first bebida is inspected)
+            _, data = self._get_shared_reco()
             
             # Check for image analysis in recommendations
             if "refrescos_reales" in data and data["refrescos_reales"]:
@@ -7453,16 +6674,14 @@ class RefrescoBotTester:
                     if bebida['features_imagen'] is not None:
                         print(f"✅ Image Analyzer: Image features: {bebida['features_imagen']}")
                 
-                self.test_results["Image Analyzer"] = True
+                self._record_result("Image Analyzer", True)
             else:
                 print("❌ Image Analyzer: FAILED - No recommendations to check")
-                self.test_results["Image Analyzer"] = False
-                self.all_tests_passed = False
+                self._record_result("Image Analyzer", False)
             
         except Exception as e:
             print(f"❌ Image Analyzer: FAILED - {str(e)}")
-            self.test_results["Image Analyzer"] = False
-            self.all_tests_passed = False
+            self._record_result("Image Analyzer", False)
     
     def test_presentation_rating_system(self):
         """Test the presentation rating system functionality"""
@@ -7470,31 +6689,25 @@ class RefrescoBotTester:
         
         try:
             # Get admin stats to check presentation rating system
-            response = requests.get(f"{API_URL}/admin/stats")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(f"{API_URL}/admin/stats")
             
             if "ml_engines" not in data or "sistema_presentaciones" not in data["ml_engines"]:
                 print("❌ Presentation Rating System: FAILED - Presentation rating system stats missing")
-                self.test_results["Presentation Rating System"] = False
-                self.all_tests_passed = False
+                self._record_result("Presentation Rating System", False)
                 return
             
             system_stats = data["ml_engines"]["sistema_presentaciones"]
             print(f"✅ Presentation Rating System: Stats: {system_stats}")
             
-            # Get recommendations to check presentation ratings
-            if not self.session_id:
-                self.session_id = self.create_session_and_answer_questions()
-                if not self.session_id:
-                    print("❌ Presentation Rating System: FAILED - Could not create session")
-                    self.test_results["Presentation Rating System"] = False
-                    self.all_tests_passed = False
-                    return
+            # Rating retrains the presentation model for the session, so use one no other test reuses
+            session_id = self.create_session_and_answer_questions()
+            if not session_id:
+                print("❌ Presentation Rating System: FAILED - Could not create session")
+                self._record_result("Presentation Rating System", False)
+                return
             
-            response = requests.get(f"{API_URL}/recomendacion/{self.session_id}")
-            response.raise_for_status()
-            data = response.json()
+            # Only the first real soda is inspected, so skip serializing the rest
+            data = self._get_json(URL_RECOMENDACION + session_id + "?limit=1")
             
             # Check for presentation ratings in recommendations
             if "refrescos_reales" in data and data["refrescos_reales"]:
@@ -7503,8 +6716,7 @@ class RefrescoBotTester:
                 # Check for mejor_presentacion_para_usuario
                 if "mejor_presentacion_para_usuario" not in bebida:
                     print("❌ Presentation Rating System: FAILED - Best presentation for user missing")
-                    self.test_results["Presentation Rating System"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Presentation Rating System", False)
                     return
                 
                 mejor_presentacion = bebida["mejor_presentacion_para_usuario"]
@@ -7513,46 +6725,41 @@ class RefrescoBotTester:
                 # Check for presentation_id
                 if "presentation_id" not in mejor_presentacion:
                     print("❌ Presentation Rating System: FAILED - Presentation ID missing")
-                    self.test_results["Presentation Rating System"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Presentation Rating System", False)
                     return
                 
                 # Check for prediction
                 if "prediccion" not in mejor_presentacion:
                     print("❌ Presentation Rating System: FAILED - Prediction missing")
-                    self.test_results["Presentation Rating System"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Presentation Rating System", False)
                     return
                 
                 print(f"✅ Presentation Rating System: Prediction: {mejor_presentacion['prediccion']}")
                 
                 # Test rating a presentation
-                self.test_rate_presentation(bebida, mejor_presentacion)
+                self.test_rate_presentation(session_id, mejor_presentacion)
                 
-                self.test_results["Presentation Rating System"] = True
+                self._record_result("Presentation Rating System", True)
             else:
                 print("❌ Presentation Rating System: FAILED - No recommendations to check")
-                self.test_results["Presentation Rating System"] = False
-                self.all_tests_passed = False
+                self._record_result("Presentation Rating System", False)
             
         except Exception as e:
             print(f"❌ Presentation Rating System: FAILED - {str(e)}")
-            self.test_results["Presentation Rating System"] = False
-            self.all_tests_passed = False
+            self._record_result("Presentation Rating System", False)
     
-    def test_rate_presentation(self, bebida, presentacion):
-        """Test rating a specific presentation"""
+    def test_rate_presentation(self, session_id, presentacion):
+        """Test rating a specific presentation on the given session"""
         try:
             presentation_id = presentacion["presentation_id"]
             
             # Rate the presentation
-            response = requests.post(f"{API_URL}/puntuar-presentacion/{self.session_id}", json={
+            data = self._post_json(URL_PUNTUAR_PRESENTACION + session_id, {
                 "presentation_id": presentation_id,
                 "puntuacion": 5,
                 "comentario": "Excelente presentación, me encantó"
             })
-            response.raise_for_status()
-            data = response.json()
+            self._recommendations.pop(session_id, None)
             
             print(f"✅ Rate Presentation: Rated presentation {presentation_id} with 5 stars")
             
@@ -7584,22 +6791,18 @@ class RefrescoBotTester:
         try:
             # Test /api/mejores-presentaciones endpoint
             if not self.session_id:
-                self.session_id = self.create_session_and_answer_questions()
+                self.session_id = self.shared_session()
                 if not self.session_id:
                     print("❌ New ML Endpoints: FAILED - Could not create session")
-                    self.test_results["New ML Endpoints"] = False
-                    self.all_tests_passed = False
+                    self._record_result("New ML Endpoints", False)
                     return
             
             # Test mejores-presentaciones endpoint
-            response = requests.get(f"{API_URL}/mejores-presentaciones/{self.session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(URL_MEJORES_PRESENTACIONES + self.session_id)
             
             if "mejores_presentaciones" not in data:
                 print("❌ New ML Endpoints: FAILED - mejores_presentaciones missing")
-                self.test_results["New ML Endpoints"] = False
-                self.all_tests_passed = False
+                self._record_result("New ML Endpoints", False)
                 return
             
             mejores_presentaciones = data["mejores_presentaciones"]
@@ -7613,18 +6816,16 @@ class RefrescoBotTester:
                 
                 if missing_fields:
                     print(f"❌ New ML Endpoints: FAILED - Missing fields in best presentation: {missing_fields}")
-                    self.test_results["New ML Endpoints"] = False
-                    self.all_tests_passed = False
+                    self._record_result("New ML Endpoints", False)
                     return
                 
                 print(f"✅ New ML Endpoints: Best presentation structure is valid")
             
-            self.test_results["New ML Endpoints"] = True
+            self._record_result("New ML Endpoints", True)
             
         except Exception as e:
             print(f"❌ New ML Endpoints: FAILED - {str(e)}")
-            self.test_results["New ML Endpoints"] = False
-            self.all_tests_passed = False
+            self._record_result("New ML Endpoints", False)
     
     def test_admin_reprocess_beverages(self):
         """Test the admin/reprocess-beverages endpoint"""
@@ -7632,14 +6833,11 @@ class RefrescoBotTester:
         
         try:
             # Call the reprocess endpoint
-            response = requests.post(f"{API_URL}/admin/reprocess-beverages")
-            response.raise_for_status()
-            data = response.json()
+            data = self._post_json(f"{API_URL}/admin/reprocess-beverages")
             
             if "mensaje" not in data or "stats" not in data:
                 print("❌ Admin Reprocess Beverages: FAILED - Invalid response format")
-                self.test_results["Admin Reprocess Beverages"] = False
-                self.all_tests_passed = False
+                self._record_result("Admin Reprocess Beverages", False)
                 return
             
             print(f"✅ Admin Reprocess Beverages: Message: {data['mensaje']}")
@@ -7648,19 +6846,17 @@ class RefrescoBotTester:
             stats = data["stats"]
             if "categorizador" not in stats or "analizador_imagenes" not in stats:
                 print("❌ Admin Reprocess Beverages: FAILED - Missing stats")
-                self.test_results["Admin Reprocess Beverages"] = False
-                self.all_tests_passed = False
+                self._record_result("Admin Reprocess Beverages", False)
                 return
             
             print(f"✅ Admin Reprocess Beverages: Categorizer stats: {stats['categorizador']}")
             print(f"✅ Admin Reprocess Beverages: Image analyzer stats: {stats['analizador_imagenes']}")
             
-            self.test_results["Admin Reprocess Beverages"] = True
+            self._record_result("Admin Reprocess Beverages", True)
             
         except Exception as e:
             print(f"❌ Admin Reprocess Beverages: FAILED - {str(e)}")
-            self.test_results["Admin Reprocess Beverages"] = False
-            self.all_tests_passed = False
+            self._record_result("Admin Reprocess Beverages", False)
     
     def test_presentation_analytics(self):
         """Test the admin/presentation-analytics endpoint"""
@@ -7669,60 +6865,53 @@ class RefrescoBotTester:
         try:
             # Need a session with some presentation ratings
             if not self.session_id:
-                self.session_id = self.create_session_and_answer_questions()
+                self.session_id = self.shared_session()
                 if not self.session_id:
                     print("❌ Presentation Analytics: FAILED - Could not create session")
-                    self.test_results["Presentation Analytics"] = False
-                    self.all_tests_passed = False
+                    self._record_result("Presentation Analytics", False)
                     return
             
             # Get recommendations
-            response = requests.get(f"{API_URL}/recomendacion/{self.session_id}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_recommendation(self.session_id)
             
-            # Rate a presentation if we have recommendations
+            # Rate a presentation if we have recommendations; the analytics come back with the rating
+            analytics = None
             if "refrescos_reales" in data and data["refrescos_reales"]:
                 bebida = data["refrescos_reales"][0]
                 if "mejor_presentacion_para_usuario" in bebida:
                     presentation_id = bebida["mejor_presentacion_para_usuario"]["presentation_id"]
                     
                     # Rate the presentation
-                    response = requests.post(f"{API_URL}/puntuar-presentacion/{self.session_id}", json={
+                    _, _, analytics = self._rate_and_fetch(self.session_id, {
                         "presentation_id": presentation_id,
                         "puntuacion": 5,
                         "comentario": "Excelente presentación para analytics"
                     })
-                    response.raise_for_status()
+                    self._recommendations.pop(self.session_id, None)
                     print(f"✅ Presentation Analytics: Rated presentation {presentation_id} for analytics")
             
-            # Call the analytics endpoint
-            response = requests.get(f"{API_URL}/admin/presentation-analytics/{self.session_id}")
-            response.raise_for_status()
-            data = response.json()
+            # Call the analytics endpoint unless the rating already returned them
+            data = analytics if analytics is not None else self._get_json(URL_PRESENTATION_ANALYTICS + self.session_id)
             
             if "size_preferences" not in data:
                 print("❌ Presentation Analytics: FAILED - size_preferences missing")
-                self.test_results["Presentation Analytics"] = False
-                self.all_tests_passed = False
+                self._record_result("Presentation Analytics", False)
                 return
             
             print(f"✅ Presentation Analytics: Size preferences: {data['size_preferences']}")
             
             if "puntuaciones_dadas" not in data:
                 print("❌ Presentation Analytics: FAILED - puntuaciones_dadas missing")
-                self.test_results["Presentation Analytics"] = False
-                self.all_tests_passed = False
+                self._record_result("Presentation Analytics", False)
                 return
             
             print(f"✅ Presentation Analytics: Ratings given: {data['puntuaciones_dadas']}")
             
-            self.test_results["Presentation Analytics"] = True
+            self._record_result("Presentation Analytics", True)
             
         except Exception as e:
             print(f"❌ Presentation Analytics: FAILED - {str(e)}")
-            self.test_results["Presentation Analytics"] = False
-            self.all_tests_passed = False
+            self._record_result("Presentation Analytics", False)
     
     def test_ml_modules_initialization(self):
         """Test ML modules initialization"""
@@ -7730,9 +6919,7 @@ class RefrescoBotTester:
         
         try:
             # Test system status to check ML modules
-            response = requests.get(f"{API_URL}/status")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(f"{API_URL}/status")
             
             if "status" in data and data["status"] == "healthy":
                 print("✅ ML Modules: System is healthy")
@@ -7741,20 +6928,17 @@ class RefrescoBotTester:
                 if "ml_engine" in data:
                     ml_stats = data["ml_engine"]
                     print(f"✅ ML Modules: ML Engine initialized with stats: {ml_stats}")
-                    self.test_results["ML Modules Initialization"] = True
+                    self._record_result("ML Modules Initialization", True)
                 else:
                     print("❌ ML Modules: FAILED - ML Engine not found in status")
-                    self.test_results["ML Modules Initialization"] = False
-                    self.all_tests_passed = False
+                    self._record_result("ML Modules Initialization", False)
             else:
                 print(f"❌ ML Modules: FAILED - System not healthy: {data}")
-                self.test_results["ML Modules Initialization"] = False
-                self.all_tests_passed = False
+                self._record_result("ML Modules Initialization", False)
                 
         except Exception as e:
             print(f"❌ ML Modules: FAILED - {str(e)}")
-            self.test_results["ML Modules Initialization"] = False
-            self.all_tests_passed = False
+            self._record_result("ML Modules Initialization", False)
     
     def test_new_ml_endpoints(self):
         """Test new ML endpoints"""
@@ -7762,43 +6946,37 @@ class RefrescoBotTester:
         
         try:
             # Create a session for testing
-            session_id = self.create_session_and_answer_questions()
+            session_id = self.shared_session()
             if not session_id:
                 print("❌ New ML Endpoints: FAILED - Could not create session")
-                self.test_results["New ML Endpoints"] = False
-                self.all_tests_passed = False
+                self._record_result("New ML Endpoints", False)
                 return
             
             # Test /api/mejores-presentaciones/{sesion_id}
-            response = requests.get(f"{API_URL}/mejores-presentaciones/{session_id}")
+            response = self.http.get(URL_MEJORES_PRESENTACIONES + session_id)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 if "mejores_presentaciones" in data:
                     print(f"✅ New ML Endpoints: /api/mejores-presentaciones works - got {len(data['mejores_presentaciones'])} presentations")
                 else:
                     print("❌ New ML Endpoints: FAILED - No mejores_presentaciones in response")
-                    self.test_results["New ML Endpoints"] = False
-                    self.all_tests_passed = False
+                    self._record_result("New ML Endpoints", False)
                     return
             else:
                 print(f"❌ New ML Endpoints: FAILED - /api/mejores-presentaciones returned {response.status_code}")
-                self.test_results["New ML Endpoints"] = False
-                self.all_tests_passed = False
+                self._record_result("New ML Endpoints", False)
                 return
             
-            self.test_results["New ML Endpoints"] = True
+            self._record_result("New ML Endpoints", True)
             
         except Exception as e:
             print(f"❌ New ML Endpoints: FAILED - {str(e)}")
-            self.test_results["New ML Endpoints"] = False
-            self.all_tests_passed = False
+            self._record_result("New ML Endpoints", False)
 
     def print_summary(self):
         """Print a summary of all test results"""
-        print("\n" + "="*80)
-        print("📊 TEST RESULTS SUMMARY")
-        print("="*80)
+        lines = ["", "="*80, "📊 TEST RESULTS SUMMARY", "="*80]
         
         passed_tests = []
         failed_tests = []
@@ -7806,26 +6984,35 @@ class RefrescoBotTester:
         for test_name, result in self.test_results.items():
             if result:
                 passed_tests.append(test_name)
-                print(f"✅ {test_name}")
+                lines.append(f"✅ {test_name}")
             else:
                 failed_tests.append(test_name)
-                print(f"❌ {test_name}")
+                lines.append(f"❌ {test_name}")
         
-        print("\n" + "="*80)
-        print(f"📈 OVERALL RESULTS: {len(passed_tests)} PASSED, {len(failed_tests)} FAILED")
-        print("="*80)
+        lines += ["", "="*80, f"📈 OVERALL RESULTS: {len(passed_tests)} PASSED, {len(failed_tests)} FAILED", "="*80]
         
         if self.all_tests_passed:
-            print("🎉 ALL TESTS PASSED! RefrescoBot ML is working correctly.")
+            lines.append("🎉 ALL TESTS PASSED! RefrescoBot ML is working correctly.")
         else:
-            print("⚠️ SOME TESTS FAILED. Please check the issues above.")
+            lines.append("⚠️ SOME TESTS FAILED. Please check the issues above.")
             if failed_tests:
-                print(f"Failed tests: {', '.join(failed_tests)}")
+                lines.append(f"Failed tests: {', '.join(failed_tests)}")
+        
+        # One write for the whole summary instead of a print per test
+        sys.stdout.write("\n".join(lines) + "\n")
         
         return self.all_tests_passed
 
 
 if __name__ == "__main__":
     tester = RefrescoBotTester()
-    success = tester.run_all_tests()
+    runners = {"all": tester.run_all_tests, "parallel": tester.run_parallel_tests, "ml": tester.run_ml_component_tests}
+    if TEST_SUITE not in runners:
+        sys.exit(f"Unknown TEST_SUITE {TEST_SUITE!r}; expected one of: {', '.join(runners)}")
+    try:
+        success = runners[TEST_SUITE]()
+    finally:
+        if HTTP_CASSETTE:
+            tester.http.get_adapter(API_URL).save()
+        tester.http.close()
     sys.exit(0 if success else 1)
\ No newline at end of file